@@ -65,6 +65,7 @@ db_connections = {}
 active_paths = None
 
 item_data = {}
+dir_snapshots = {}
 watchers = {}
 
 viewer_widgets = {}
@@ -115,6 +116,7 @@ __initial_values__ = {
 # Make submodules available from this top module
 from .core import *
 from .active import *
+from .cache import *
 from .clipboard import *
 from .color import *
 from .data import *
@@ -123,6 +125,7 @@ from .env import *
 from .filter import *
 from .font import *
 from .hash import *
+from .listing import *
 from .monitor import *
 from .parser import *
 from .seqshot import *
@@ -311,6 +311,10 @@ def set_active(seg, v, mode=None, force=False):
         if force and common.active_paths[ActiveMode.Explicit][seg]:
             common.active_paths[ActiveMode.Explicit][seg] = None
 
+    # Cached path values belong to the previous job or bookmark item
+    if seg in ('server', 'job', 'root') and common.active_paths[mode][seg] != v:
+        common.clear_caches()
+
     common.active_paths[mode][seg] = v
     verify_path(mode)
 
@@ -0,0 +1,250 @@
+"""Memory-budgeted function caches.
+
+Frequently called helpers, like :func:`~bookmarks.common.core.normalize_path` or
+:func:`~bookmarks.common.hash.get_hash`, cache their return values using
+:func:`bounded_cache`. Unlike :func:`functools.lru_cache`, the caches don't have
+individual size limits. Instead, all registered caches share a single byte budget,
+and when the total estimated size exceeds it, the least recently used values of
+the largest caches are evicted.
+
+.. code-block:: python
+
+    from bookmarks import common
+
+    @common.bounded_cache
+    def get_value(path):
+        ...
+
+    common.cache_stats()  # Hit, miss and size statistics of each cache
+
+The budget is read from the ``settings/cache_budget`` user setting (in megabytes),
+see :func:`get_cache_budget`. The caches are cleared when the active bookmark item or
+job changes, see :func:`clear_caches`.
+
+"""
+import collections
+import functools
+import sys
+import threading
+import types
+
+from .. import common
+
+__all__ = [
+    'DEFAULT_CACHE_BUDGET',
+    'CacheInfo',
+    'BoundedCache',
+    'bounded_cache',
+    'get_cache_budget',
+    'set_cache_budget',
+    'cache_stats',
+    'clear_caches',
+]
+
+#: The default memory budget of the function caches in bytes.
+DEFAULT_CACHE_BUDGET = 256 * 1024 * 1024
+
+#: The estimated memory overhead of a cache entry in bytes.
+ENTRY_OVERHEAD = 104
+
+#: Statistics of a function cache.
+CacheInfo = collections.namedtuple(
+    'CacheInfo',
+    ('hits', 'misses', 'maxsize', 'currsize', 'nbytes')
+)
+
+_lock = threading.Lock()
+_caches = []
+_budget = DEFAULT_CACHE_BUDGET
+_nbytes = 0
+
+_KWARGS_MARK = object()
+
+
+def _sizeof(v):
+    """Returns the estimated size of the given value in bytes.
+
+    Items of tuples and lists are counted, but nested values are not.
+
+    """
+    n = sys.getsizeof(v)
+    if isinstance(v, (tuple, list)):
+        for _v in v:
+            n += sys.getsizeof(_v)
+    return n
+
+
+def _evict():
+    """Evicts the least recently used values until the caches fit the budget.
+
+    The caller must hold the lock.
+
+    """
+    global _nbytes
+
+    while _nbytes > _budget:
+        cache = max(_caches, key=lambda c: c._nbytes)
+        if not cache._data:
+            break
+        _, (_, n) = cache._data.popitem(last=False)
+        cache._nbytes -= n
+        _nbytes -= n
+
+
+class BoundedCache:
+    """A least recently used function cache sharing the global memory budget.
+
+    Use :func:`bounded_cache` to decorate functions. The decorated function's
+    arguments must be hashable.
+
+    """
+
+    def __init__(self, func):
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._data = collections.OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+        with _lock:
+            _caches.append(self)
+
+    def __repr__(self):
+        return f'<BoundedCache {self.name}>'
+
+    def __get__(self, instance, owner=None):
+        # Support decorating methods
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    @property
+    def name(self):
+        """The name of the cached function.
+
+        """
+        return f'{self._func.__module__}.{self._func.__qualname__}'
+
+    def __call__(self, *args, **kwargs):
+        global _nbytes
+
+        k = args
+        if kwargs:
+            k += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+        with _lock:
+            if k in self._data:
+                self._data.move_to_end(k)
+                self._hits += 1
+                return self._data[k][0]
+            self._misses += 1
+
+        # The value is computed outside the lock, like functools.lru_cache
+        v = self._func(*args, **kwargs)
+        n = _sizeof(k) + _sizeof(v) + ENTRY_OVERHEAD
+
+        with _lock:
+            if k in self._data:
+                return v
+            self._data[k] = (v, n)
+            self._nbytes += n
+            _nbytes += n
+            if _nbytes > _budget:
+                _evict()
+        return v
+
+    def cache_info(self):
+        """Returns the statistics of the cache.
+
+        Returns:
+            CacheInfo: The number of hits, misses, cached values and the estimated
+                size of the cached values.
+
+        """
+        with _lock:
+            return CacheInfo(self._hits, self._misses, None, len(self._data), self._nbytes)
+
+    def cache_clear(self):
+        """Clears the cached values and statistics.
+
+        """
+        global _nbytes
+
+        with _lock:
+            _nbytes -= self._nbytes
+            self._data.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+
+def bounded_cache(func):
+    """Decorator used to cache the return values of a function.
+
+    Args:
+        func (callable): The function to cache.
+
+    Returns:
+        BoundedCache: The cached function.
+
+    """
+    return BoundedCache(func)
+
+
+def get_cache_budget():
+    """Returns the memory budget of the function caches.
+
+    The value is read from the ``settings/cache_budget`` user setting.
+
+    Returns:
+        int: The budget in bytes.
+
+    """
+    if not hasattr(common.settings, 'value'):
+        return DEFAULT_CACHE_BUDGET
+
+    v = common.settings.value('settings/cache_budget')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return DEFAULT_CACHE_BUDGET
+    return max(1, v) * 1024 * 1024
+
+
+def set_cache_budget(v):
+    """Sets the memory budget of the function caches.
+
+    Cached values are evicted straight away if they exceed the new budget.
+
+    Args:
+        v (int): The budget in bytes.
+
+    """
+    global _budget
+
+    with _lock:
+        _budget = max(0, int(v))
+        _evict()
+
+
+def cache_stats():
+    """Returns the statistics of all function caches.
+
+    Returns:
+        dict: Cached function names mapped to :class:`CacheInfo` instances.
+
+    """
+    return {cache.name: cache.cache_info() for cache in list(_caches)}
+
+
+def clear_caches():
+    """Clears all function caches and re-reads the memory budget.
+
+    This is called when the active bookmark item or job changes, as most cached
+    values are derived from the paths of the previously active items.
+
+    """
+    for cache in list(_caches):
+        cache.cache_clear()
+    set_cache_budget(get_cache_budget())
@@ -11,10 +11,12 @@ References:
 import enum
 import functools
 import inspect
+import itertools
 import logging
 import os
 import re
 import sys
+import threading
 import time
 import traceback
 import uuid
@@ -22,6 +24,7 @@ import uuid
 from PySide2 import QtCore, QtWidgets, QtGui
 
 from .. import common
+from .cache import bounded_cache
 
 #: The app's official url
 documentation_url = 'https://bookmarks-vfx.com'
@@ -500,6 +503,27 @@ def temp_path():
     return f'{a}/{b}/temp'
 
 
+_thread_local = threading.local()
+_thread_tokens = itertools.count(1)
+
+
+def get_thread_token():
+    """Returns a token identifying the current thread.
+
+    Unlike thread idents, which Python reuses after a thread exits, a token is
+    never handed out twice, so a new thread can't pick up the values cached for
+    an exited thread.
+
+    Returns:
+        int: The current thread's token.
+    """
+    token = getattr(_thread_local, 'token', None)
+    if token is None:
+        token = next(_thread_tokens)
+        _thread_local.token = token
+    return token
+
+
 def get_thread_key(*args):
     """Returns a unique key based on given args and the current thread.
 
@@ -509,11 +533,10 @@ def get_thread_key(*args):
     Returns:
         str: The concatenated key.
     """
-    t = repr(QtCore.QThread.currentThread())
-    return '/'.join(args) + t
+    return '/'.join(args) + f'@{get_thread_token()}'
 
 
-@functools.lru_cache(maxsize=1048576)
+@bounded_cache
 def sort_words(s):
     """Sorts words found in the string and returns them as a comma-separated list.
 
@@ -526,7 +549,7 @@ def sort_words(s):
     return ', '.join(sorted(re.findall(r"[\w']+", s)))
 
 
-@functools.lru_cache(maxsize=1048576)
+@bounded_cache
 def is_dir(path):
     """Check if the given path is a directory (cached).
 
@@ -539,7 +562,7 @@ def is_dir(path):
     return QtCore.QFileInfo(path).isDir()
 
 
-@functools.lru_cache(maxsize=1048576)
+@bounded_cache
 def normalize_path(path):
     """Normalize and standardize the given path to forward slashes.
 
@@ -2,17 +2,57 @@
 
 All data loaded by the item models are stored in :attr:`~bookmarks.common.item_data`.
 The module provides methods for the models to access, load and reset the cached data.
+
+Item lookups by path, see :func:`get_data_from_value`, use a path index kept by each
+data dictionary. The index is built by :func:`set_data`, and rebuilt on lookup when
+the data set was sorted, the number of items changed or the data was cleared. Item
+paths are changed using :func:`set_item_path`, which updates the index.
+
+:func:`sort_data` adds the sorted items to a new data dictionary that replaces the
+data set, so readers never see a half-sorted data set. The sort permutation of each
+sort role is cached once the data set is loaded, so reversing the sort order or
+switching back to a previous sort role doesn't rebuild the sort keys. Numeric sort
+keys are sorted as flat :class:`numpy.ndarray` arrays.
+
+The global :attr:`lock` guards the cache. Read-only helpers take it for reading and
+only lock for writing when a data set has to be created. Sorting and replacing items
+hold the write lock only while swapping or filling the data set, see
+:func:`sort_data` and :func:`replace_items`, so data sets have no locks of their own.
+
+Data sets are kept in memory until their total estimated size exceeds the
+``settings/data_budget`` user setting. :func:`evict_data` then removes the least recently
+used data sets that aren't shown by any of the item tabs.
 """
 
+import collections
+import collections.abc
+import itertools
+import sys
+import threading
 import weakref
-from typing import Tuple, Optional, Any, List, Union
+from typing import Tuple, Optional, Any, List, Union, Dict, Iterator
 
+import numpy as np
 from PySide2 import QtCore
 
 from . import common
 
+#: Lock guarding the structure of :attr:`~bookmarks.common.item_data`
 lock = QtCore.QReadWriteLock()
 
+#: The default memory budget of the item data in bytes, see :func:`evict_data`
+DEFAULT_DATA_BUDGET = 1024 * 1024 * 1024
+
+#: The number of items sampled to estimate the size of a data set
+SIZE_SAMPLE_COUNT = 32
+
+#: The estimated size of a listing snapshot entry in bytes
+SNAPSHOT_ENTRY_SIZE = 320
+
+#: The (parent path, task) keys of the data sets in least recently used order
+_recency = collections.OrderedDict()
+_recency_lock = threading.Lock()
+
 
 class DataDict(dict):
     """Custom dictionary class used to store model item data.
@@ -20,6 +60,17 @@ class DataDict(dict):
     This class adds compatibility for :class:`weakref.ref` referencing
     and custom attributes for storing data states.
     """
+    #: Item path to item id mapping, see :func:`_index_data_no_lock`
+    _path_index = None
+    #: The number of items when the path index was built
+    _path_index_len = -1
+    #: The items in the order of the cached sort permutations, see :func:`sort_data`
+    _sort_items = None
+    #: Sort role to cached sort permutation mapping
+    _sort_cache = None
+    #: Database rows prefetched by the info worker, see
+    #: :meth:`~bookmarks.threads.workers.InfoWorker.prefetch_rows`
+    db_rows = None
 
     def __str__(self) -> str:
         return (
@@ -35,6 +86,18 @@ class DataDict(dict):
         self._refresh_needed = False
         self._data_type = None
 
+    def clear(self) -> None:
+        super().clear()
+        self._path_index = None
+        self._path_index_len = -1
+        self.reset_sort_cache()
+        self.db_rows = None
+
+    def reset_sort_cache(self) -> None:
+        """Drops the cached sort permutations, for example, after sort keys changed."""
+        self._sort_items = None
+        self._sort_cache = None
+
     @property
     def loaded(self) -> bool:
         return self._loaded
@@ -114,6 +177,213 @@ class DataDict(dict):
         return list(unique_types)
 
 
+#: Marks an unset value in an :class:`ItemRecord`
+_UNSET = object()
+
+#: The roles stored by :class:`ItemRecord` instances
+RECORD_ROLES = (
+    QtCore.Qt.DisplayRole,
+    QtCore.Qt.EditRole,
+    QtCore.Qt.StatusTipRole,
+    QtCore.Qt.AccessibleDescriptionRole,
+    QtCore.Qt.WhatsThisRole,
+    QtCore.Qt.ToolTipRole,
+    common.FilterTextRole,
+    common.PathRole,
+    common.ParentPathRole,
+    common.DataTypeRole,
+    common.DataDictRole,
+    common.EntryRole,
+    common.FlagsRole,
+    common.SequenceRole,
+    common.FramesRole,
+    common.StartPathRole,
+    common.EndPathRole,
+    common.DescriptionRole,
+    common.NoteCountRole,
+    common.FileDetailsRole,
+    common.FileInfoLoaded,
+    common.ThumbnailLoaded,
+    common.SortByNameRole,
+    common.SortByLastModifiedRole,
+    common.SortBySizeRole,
+    common.SortByTypeRole,
+    common.IdRole,
+    common.SGLinkedRole,
+)
+
+_RECORD_INDEX = {role: n for n, role in enumerate(RECORD_ROLES)}
+
+#: Changing these roles resets the memoized values of an :class:`ItemRecord`
+RECORD_SOURCE_ROLES = frozenset((
+    QtCore.Qt.DisplayRole,
+    QtCore.Qt.EditRole,
+    common.PathRole,
+    common.DataTypeRole,
+))
+
+
+class DerivedValue:
+    """A default value of an :class:`ItemRecord` computed from the record's
+    other values when it is first read.
+
+    Args:
+        func (callable): Function called with the record, returning the value.
+        memoize (bool): If `True`, the value is stored on the record once computed.
+            Memoized values are reset when one of :attr:`RECORD_SOURCE_ROLES` changes.
+
+    """
+    __slots__ = ('func', 'memoize')
+
+    def __init__(self, func, memoize=True):
+        self.func = func
+        self.memoize = memoize
+
+
+class ItemRecord(collections.abc.MutableMapping):
+    """A compact alternative to :class:`DataDict` used to store the data of a
+    single file or sequence item.
+
+    The values of :attr:`RECORD_ROLES` are stored in a fixed-size list instead of a
+    hash table. Values shared by all items of a data set, for example, the item's
+    queues or size hint, are looked up from a `defaults` dictionary shared by
+    all records. Setting a value always sets it on the record.
+
+    Defaults can be :class:`DerivedValue` instances. These are computed from the
+    record's other values on first access, so values that aren't read, for
+    example, the tooltips of off-screen items, are never built.
+
+    Records implement the mapping interface, so they can be used anywhere a row
+    :class:`DataDict` is expected.
+
+    Args:
+        values (dict): Role and value mapping.
+        defaults (dict): Role and value mapping shared between records.
+
+    """
+    __slots__ = ('_values', '_defaults', '_extra', '_memo', '__weakref__')
+
+    #: Row records are never data type containers
+    data_type = None
+
+    # Records are compared by identity, like the weakrefs pointing to them
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __init__(self, values: Optional[Dict] = None, defaults: Optional[Dict] = None):
+        self._values = [_UNSET] * len(RECORD_ROLES)
+        self._defaults = defaults if defaults is not None else {}
+        self._extra = None
+        self._memo = 0
+        if values:
+            for k, v in values.items():
+                self[k] = v
+
+    def __repr__(self) -> str:
+        return f'<ItemRecord ({self.get(common.PathRole)})>'
+
+    def __getitem__(self, role: int) -> Any:
+        n = _RECORD_INDEX.get(role)
+        if n is not None:
+            v = self._values[n]
+            if v is not _UNSET:
+                return v
+        elif self._extra is not None and role in self._extra:
+            return self._extra[role]
+
+        v = self._defaults[role]
+        if v.__class__ is not DerivedValue:
+            return v
+
+        value = v.func(self)
+        if v.memoize and n is not None:
+            self._values[n] = value
+            self._memo |= 1 << n
+        return value
+
+    def __setitem__(self, role: int, v: Any) -> None:
+        n = _RECORD_INDEX.get(role)
+        if n is not None:
+            if self._memo:
+                if role in RECORD_SOURCE_ROLES:
+                    self._reset_memo()
+                self._memo &= ~(1 << n)
+            self._values[n] = v
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[role] = v
+
+    def peek(self, role: int) -> Any:
+        """Returns the value of `role` without memoizing derived values.
+
+        Used to compute values read for every item, like sort and filter keys,
+        without materializing the derived roles they depend on.
+
+        """
+        n = _RECORD_INDEX.get(role)
+        if n is not None:
+            v = self._values[n]
+            if v is not _UNSET:
+                return v
+        elif self._extra is not None and role in self._extra:
+            return self._extra[role]
+
+        v = self._defaults[role]
+        if v.__class__ is not DerivedValue:
+            return v
+        return v.func(self)
+
+    def _reset_memo(self) -> None:
+        for n in range(len(RECORD_ROLES)):
+            if self._memo & (1 << n):
+                self._values[n] = _UNSET
+        self._memo = 0
+
+    def __delitem__(self, role: int) -> None:
+        n = _RECORD_INDEX.get(role)
+        if n is not None and self._values[n] is not _UNSET:
+            self._values[n] = _UNSET
+            self._memo &= ~(1 << n)
+            return
+        if n is None and self._extra is not None and role in self._extra:
+            del self._extra[role]
+            return
+        raise KeyError(role)
+
+    def __contains__(self, role: object) -> bool:
+        n = _RECORD_INDEX.get(role)
+        if n is not None and self._values[n] is not _UNSET:
+            return True
+        if n is None and self._extra is not None and role in self._extra:
+            return True
+        return role in self._defaults
+
+    def __iter__(self) -> Iterator[int]:
+        seen = set()
+        for role, v in zip(RECORD_ROLES, self._values):
+            if v is _UNSET:
+                continue
+            seen.add(role)
+            yield role
+        if self._extra is not None:
+            for role in list(self._extra):
+                seen.add(role)
+                yield role
+        for role in list(self._defaults):
+            if role not in seen:
+                yield role
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, role: int, default: Any = None) -> Any:
+        try:
+            return self[role]
+        except KeyError:
+            return default
+
+
 # ---------------------- Internal Helper Functions (No Locking) ----------------------
 
 def _reset_data_no_lock(key: Tuple[str, ...], task: str) -> None:
@@ -136,6 +406,43 @@ def _ensure_data_exists_no_lock(key: Tuple[str, ...], task: str, data_type: int)
         _reset_data_no_lock(key, task)
 
 
+def _find_data_no_lock(key: Tuple[str, ...], task: str, data_type: Optional[int] = None) -> Optional[DataDict]:
+    """Returns the data set if it exists without creating it."""
+    tasks_dict = common.item_data.get(key)
+    if tasks_dict is None:
+        return None
+    types_dict = tasks_dict.get(task)
+    if types_dict is None or data_type is None:
+        return types_dict
+    return types_dict.get(data_type)
+
+
+def _get_or_create_data(key: Tuple[str, ...], task: str, data_type: Optional[int] = None) -> DataDict:
+    """Returns the data set, or the task's data when `data_type` is `None`.
+
+    The read lock is enough when the data set exists. The write lock is only taken
+    when the data set has to be created.
+
+    """
+    _touch_data(key, task)
+
+    lock.lockForRead()
+    try:
+        d = _find_data_no_lock(key, task, data_type)
+    finally:
+        lock.unlock()
+    if d is not None:
+        return d
+
+    lock.lockForWrite()
+    try:
+        if data_type is None:
+            return _get_task_data_no_lock(key, task)
+        return _get_data_no_lock(key, task, data_type)
+    finally:
+        lock.unlock()
+
+
 def _get_data_no_lock(key: Tuple[str, ...], task: str, data_type: int) -> DataDict:
     _ensure_data_exists_no_lock(key, task, data_type)
     return common.item_data[key][task][data_type]
@@ -149,8 +456,80 @@ def _get_task_data_no_lock(key: Tuple[str, ...], task: str) -> DataDict:
     return common.item_data[key][task]
 
 
+def _index_data_no_lock(data: DataDict, data_type: int) -> Dict[str, Any]:
+    """Builds the path index of the given data dictionary.
+
+    Sequence items are also indexed by their proxy path, as their path changes
+    from the proxy path to the collapsed path when the item's file info is loaded.
+
+    """
+    index = {}
+    for idx, item in data.items():
+        path = item.get(common.PathRole)
+        if isinstance(path, str):
+            index.setdefault(path, idx)
+
+    # Paths take precedence over proxy paths
+    if data_type == common.SequenceItem:
+        for path, idx in list(index.items()):
+            index.setdefault(common.proxy_path(path), idx)
+
+    data._path_index = index
+    data._path_index_len = len(data)
+    return index
+
+
+def _find_path_no_lock(data: DataDict, data_type: int, value: str, keys: Tuple[str, ...]) -> Optional[Any]:
+    """Returns the item of `data` whose path is `value` using the path index."""
+    for _ in range(2):
+        index = data._path_index
+        if index is None or data._path_index_len != len(data):
+            index = _index_data_no_lock(data, data_type)
+
+        stale = False
+        for k in keys:
+            idx = index.get(k)
+            if idx is None:
+                continue
+            item = data.get(idx)
+            path = item.get(common.PathRole) if item is not None else None
+            if path == value:
+                return item
+            if not isinstance(path, str):
+                stale = True
+            elif path != k and (data_type != common.SequenceItem or common.proxy_path(path) != k):
+                stale = True
+
+        if not stale:
+            return None
+        # An indexed item was replaced or its path changed
+        data._path_index = None
+
+    # The index couldn't resolve the value, for example, because multiple items
+    # share the same proxy path
+    for item in data.values():
+        if item.get(common.PathRole) == value:
+            return item
+    return None
+
+
 def _get_data_from_value_no_lock(value: Any, data_type: int, role: int, get_container: bool) -> Optional[
     Union[DataDict, dict]]:
+    if role == common.PathRole and isinstance(value, str):
+        keys = (value,)
+        if data_type == common.SequenceItem:
+            keys += (common.proxy_path(value),)
+
+        for key, tasks_dict in common.item_data.items():
+            for task, types_dict in tasks_dict.items():
+                data = types_dict.get(data_type)
+                if data is None:
+                    continue
+                item = _find_path_no_lock(data, data_type, value, keys)
+                if item is not None:
+                    return data if get_container else item
+        return None
+
     for key, tasks_dict in common.item_data.items():
         for task, types_dict in tasks_dict.items():
             data = types_dict.get(data_type)
@@ -169,52 +548,252 @@ def _get_data_from_value_no_lock(value: Any, data_type: int, role: int, get_cont
 def _set_data_no_lock(key: Tuple[str, ...], task: str, data_type: int, data: DataDict) -> DataDict:
     _ensure_data_exists_no_lock(key, task, data_type)
     common.item_data[key][task][data_type] = data
+    _index_data_no_lock(data, data_type)
     return common.item_data[key][task][data_type]
 
 
 # ---------------------- Public API Functions (With Locking) ----------------------
 
+def _get_sort_keys(items: List[dict], sort_by: int) -> Union[np.ndarray, List[Any]]:
+    """Returns the sort keys of the given items.
+
+    Numeric keys, like sizes and modification times, are returned as a flat
+    :class:`numpy.ndarray`, other keys as a list.
+
+    """
+    keys = [item[sort_by] for item in items]
+    if keys and all(isinstance(k, (int, float)) and not isinstance(k, bool) for k in keys):
+        arr = np.asarray(keys)
+        if arr.dtype.kind in 'iuf':
+            return arr
+    return keys
+
+
+def _argsort(keys: Union[np.ndarray, List[Any]]) -> np.ndarray:
+    """Returns the stable ascending permutation of the given sort keys."""
+    if isinstance(keys, np.ndarray):
+        return np.argsort(keys, kind='stable')
+    return np.fromiter(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.intp, count=len(keys))
+
+
+def _get_run_starts(keys: Union[np.ndarray, List[Any]], perm: np.ndarray) -> np.ndarray:
+    """Marks the items of the ascending permutation starting a run of equal sort keys."""
+    n = len(perm)
+    starts = np.empty(n, dtype=bool)
+    if not n:
+        return starts
+
+    starts[0] = True
+    if isinstance(keys, np.ndarray):
+        k = keys[perm]
+        starts[1:] = k[1:] != k[:-1]
+    else:
+        k = [keys[idx] for idx in perm]
+        starts[1:] = [k[idx] != k[idx - 1] for idx in range(1, n)]
+    return starts
+
+
+def _reverse_stable(perm: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Returns the stable descending permutation from the stable ascending one.
+
+    Only the runs of equal sort keys are reversed, so items with equal keys keep
+    their order, and the sort keys aren't needed.
+
+    """
+    if not len(perm):
+        return perm
+    run = np.cumsum(starts) - 1
+    return perm[np.argsort(-run, kind='stable')]
+
+
+def _get_sort_permutation_no_lock(data: DataDict, sort_by: int, sort_order: bool) -> Tuple[List[dict], np.ndarray]:
+    """Returns the items of `data` and the permutation that sorts them by `sort_by`
+    and `sort_order`.
+
+    Once the data set is loaded, its items are kept in a fixed order, and the
+    ascending permutation of each sort role is cached with the runs of equal sort
+    keys. Sorting by a cached role again, for example, when reversing the sort order
+    or switching back to a previous sort role, reuses the cached permutation instead
+    of rebuilding the sort keys. Permutations aren't cached while the data set is
+    loading, as the workers are still setting the sort keys.
+
+    """
+    items = data._sort_items
+    cache = data._sort_cache
+    if items is None or cache is None or len(items) != len(data) or not data.loaded:
+        items = [data[idx] for idx in sorted(data)]
+        cache = {}
+
+    cached = cache.get(sort_by)
+    if cached is None:
+        keys = _get_sort_keys(items, sort_by)
+        perm = _argsort(keys)
+        cached = (perm, _get_run_starts(keys, perm))
+
+    if data.loaded:
+        cache[sort_by] = cached
+        data._sort_items = items
+        data._sort_cache = cache
+
+    perm, starts = cached
+    return items, _reverse_stable(perm, starts) if sort_order else perm
+
+
+def _find_data_key_no_lock(data: DataDict) -> Optional[Tuple[Tuple[str, ...], str, int]]:
+    """Returns the key, task and data type of the given data set in the cache."""
+    for key, tasks_dict in common.item_data.items():
+        for task, types_dict in tasks_dict.items():
+            for data_type, d in types_dict.items():
+                if d is data:
+                    return key, task, data_type
+    return None
+
+
+def _sorted_data(data: DataDict, items: List[dict], perm: np.ndarray) -> DataDict:
+    """Returns a new data dictionary with the given items in permutation order."""
+    d = DataDict()
+    d.loaded = data.loaded
+    d.refresh_needed = data.refresh_needed
+    d.data_type = data.data_type
+    d.db_rows = data.db_rows
+    d._sort_items = data._sort_items
+    d._sort_cache = data._sort_cache
+
+    ref = weakref.ref(d)
+    for n, idx in enumerate(perm.tolist()):
+        item = items[idx]
+        item[common.IdRole] = n
+        item[common.DataDictRole] = ref
+        d[n] = item
+    return d
+
+
 def sort_data(ref: weakref.ref, sort_by: int, sort_order: bool) -> DataDict:
-    """Sort the given data using `sort_by` and `sort_order`."""
+    """Sort the given data using `sort_by` and `sort_order`.
+
+    The items are added in sort order to a new data dictionary, which replaces the
+    data set in :attr:`~bookmarks.common.item_data`. Threads reading the data set
+    therefore see either the old or the sorted data set, never a half-sorted one.
+    The sort permutations are cached, see :func:`_get_sort_permutation_no_lock`.
+
+    The permutation is computed holding the global read lock, and the data set is
+    replaced holding the write lock.
+
+    Returns:
+        DataDict: The sorted data. Data sets that aren't in the cache, or were reset
+            while sorting, aren't replaced.
+
+    """
+    data = ref()
+    if data is None:
+        raise RuntimeError('Data reference is no longer valid.')
+
     lock.lockForRead()
     try:
-        data = ref()
-        if data is None:
-            raise RuntimeError('Data reference is no longer valid.')
-
-        def sort_key(_idx: Any) -> Any:
-            item = data.get(_idx)
-            if item is None:
-                return None
-            return item[sort_by]
-
-        sorted_idxs = sorted(data.keys(), key=sort_key, reverse=sort_order)
-
-        d = DataDict()
-        d.loaded = data.loaded
-        d.data_type = data.data_type
-        d.refresh_needed = data.refresh_needed
-
-        for n, idx in enumerate(sorted_idxs):
-            current_data = ref()
-            if current_data is None:
-                raise RuntimeError('Data mutated or destroyed during sorting.')
-            d[n] = current_data[idx]
-            d[n][common.IdRole] = n
+        items, perm = _get_sort_permutation_no_lock(data, sort_by, sort_order)
+    finally:
+        lock.unlock()
 
+    lock.lockForWrite()
+    try:
+        if len(items) != len(data):
+            # Items were added while sorting
+            items, perm = _get_sort_permutation_no_lock(data, sort_by, sort_order)
+        d = _sorted_data(data, items, perm)
+
+        k = _find_data_key_no_lock(data)
+        if k is not None:
+            key, task, data_type = k
+            common.item_data[key][task][data_type] = d
         return d
     finally:
         lock.unlock()
 
 
-def get_data(key: Tuple[str, ...], task: str, data_type: int) -> DataDict:
+def _update_items(key: Tuple[str, ...], task: str, data_type: int, items: List[dict], clear: bool) -> DataDict:
+    _touch_data(key, task)
+    # The data set is looked up holding the lock, as sorting replaces it
     lock.lockForWrite()
     try:
-        return _get_data_no_lock(key, task, data_type)
+        data = _get_data_no_lock(key, task, data_type)
+        if clear:
+            data.clear()
+        ref = weakref.ref(data)
+        for idx, item in enumerate(items, len(data)):
+            item[common.IdRole] = idx
+            item[common.DataDictRole] = ref
+            data[idx] = item
+        return data
     finally:
         lock.unlock()
 
 
+def replace_items(key: Tuple[str, ...], task: str, data_type: int, items: List[dict]) -> DataDict:
+    """Replaces the items of a data set in place.
+
+    The items are given contiguous ids and a reference to the data set. The global
+    write lock is held while the items are replaced, so other threads never see a
+    half-filled data set.
+
+    Returns:
+        DataDict: The updated data set.
+
+    """
+    return _update_items(key, task, data_type, items, True)
+
+
+def add_items(key: Tuple[str, ...], task: str, data_type: int, items: List[dict]) -> DataDict:
+    """Adds `items` to the end of a data set.
+
+    See :func:`replace_items`.
+
+    """
+    return _update_items(key, task, data_type, items, False)
+
+
+def set_item_path(item: dict, path: str) -> None:
+    """Sets the path of an item and updates the path index of its data set.
+
+    Lookups by path use the path index, see :func:`get_data_from_value`, so items
+    whose :attr:`~bookmarks.common.PathRole` is set directly can't be found by
+    their new path.
+
+    """
+    old = item.get(common.PathRole)
+    item[common.PathRole] = path
+    if old == path:
+        return
+
+    ref = item.get(common.DataDictRole)
+    data = ref() if ref else None
+    if data is None:
+        return
+
+    lock.lockForWrite()
+    try:
+        index = data._path_index
+        if index is None:
+            return
+        idx = item.get(common.IdRole)
+        if data.get(idx) is not item:
+            data._path_index = None
+            return
+
+        # Sequences are also indexed by their proxy path
+        is_sequence = data.data_type == common.SequenceItem
+        if index.get(old) == idx and not (is_sequence and common.proxy_path(path) == old):
+            del index[old]
+        index[path] = idx
+        if is_sequence:
+            index.setdefault(common.proxy_path(path), idx)
+    finally:
+        lock.unlock()
+
+
+def get_data(key: Tuple[str, ...], task: str, data_type: int) -> DataDict:
+    return _get_or_create_data(key, task, data_type)
+
+
 def get_data_from_value(value: Any, data_type: int, role: int = common.PathRole, get_container: bool = True) -> \
         Optional[Union[DataDict, dict]]:
     lock.lockForRead()
@@ -225,40 +804,22 @@ def get_data_from_value(value: Any, data_type: int, role: int = common.PathRole,
 
 
 def get_task_data(key: Tuple[str, ...], task: str) -> DataDict:
-    lock.lockForWrite()
-    try:
-        return _get_task_data_no_lock(key, task)
-    finally:
-        lock.unlock()
+    return _get_or_create_data(key, task)
 
 
 def data_count(key: Tuple[str, ...], task: str, data_type: int) -> int:
-    lock.lockForWrite()
-    try:
-        d = _get_data_no_lock(key, task, data_type)
-        return len(d)
-    finally:
-        lock.unlock()
+    return len(_get_or_create_data(key, task, data_type))
 
 
 def is_data_loaded(key: Tuple[str, ...], task: str, data_type: int) -> bool:
-    lock.lockForWrite()
-    try:
-        d = _get_data_no_lock(key, task, data_type)
-        return bool(d and d.loaded)
-    finally:
-        lock.unlock()
+    d = _get_or_create_data(key, task, data_type)
+    return bool(d and d.loaded)
 
 
 def get_data_ref(key: Tuple[str, ...], task: str, data_type: int) -> Optional[weakref.ref]:
-    lock.lockForWrite()
-    try:
-        if not key or not task:
-            return None
-        d = _get_data_no_lock(key, task, data_type)
-        return weakref.ref(d)
-    finally:
-        lock.unlock()
+    if not key or not task:
+        return None
+    return weakref.ref(_get_or_create_data(key, task, data_type))
 
 
 def get_ref_from_source_index(index) -> Optional[weakref.ref]:
@@ -282,6 +843,7 @@ def get_ref_from_source_index(index) -> Optional[weakref.ref]:
 
 
 def reset_data(key: Tuple[str, ...], task: str) -> None:
+    _touch_data(key, task)
     lock.lockForWrite()
     try:
         _reset_data_no_lock(key, task)
@@ -290,8 +852,163 @@ def reset_data(key: Tuple[str, ...], task: str) -> None:
 
 
 def set_data(key: Tuple[str, ...], task: str, data_type: int, data: DataDict) -> DataDict:
+    _touch_data(key, task)
     lock.lockForWrite()
     try:
         return _set_data_no_lock(key, task, data_type, data)
     finally:
         lock.unlock()
+
+
+# ---------------------- Eviction ----------------------
+
+def _touch_data(key: Tuple[str, ...], task: str) -> None:
+    """Marks the data set as the most recently used one."""
+    k = (tuple(key), task)
+    with _recency_lock:
+        _recency[k] = None
+        _recency.move_to_end(k)
+
+
+def _sizeof_item(item: Any) -> int:
+    """Returns the estimated size of an item in bytes.
+
+    Only the item and its values are counted, nested values are not.
+
+    """
+    if isinstance(item, ItemRecord):
+        n = sys.getsizeof(item) + sys.getsizeof(item._values)
+        values = [v for v in item._values if v is not _UNSET]
+        if item._extra is not None:
+            n += sys.getsizeof(item._extra)
+            values += list(item._extra.values())
+    else:
+        n = sys.getsizeof(item)
+        values = list(item.values())
+    return n + sum(sys.getsizeof(v) for v in values)
+
+
+def _estimate_size_no_lock(key: Tuple[str, ...], task: str) -> int:
+    """Returns the estimated size of a task's data sets and its listing snapshot.
+
+    The size of the items is estimated from a sample of :attr:`SIZE_SAMPLE_COUNT`
+    items of each data set.
+
+    """
+    n = 0
+    for data in common.item_data[key][task].values():
+        if not data:
+            continue
+        sample = [data[idx] for idx in itertools.islice(data, SIZE_SAMPLE_COUNT)]
+        n += sys.getsizeof(data) + sum(_sizeof_item(item) for item in sample) * len(data) // len(sample)
+
+    snapshot = common.dir_snapshots.get((tuple(key), task))
+    if snapshot is not None:
+        n += len(snapshot) * SNAPSHOT_ENTRY_SIZE
+    return n
+
+
+def _spill_snapshot(key: Tuple[str, ...], task: str) -> None:
+    """Removes the listing snapshot of an evicted data set from memory.
+
+    The snapshot is queued to be saved to the listing cache, so the file model
+    can load the task folder from disk the next time it's shown.
+
+    """
+    snapshot = common.dir_snapshots.pop((tuple(key), task), None)
+    if snapshot is None or common.init_mode is None:
+        return
+
+    from ..threads import threads
+    if not threads.get_thread(threads.QueuedListingCache).isRunning():
+        return
+    threads.queue_listing_cache(common.get_cache_path(key, task), snapshot)
+
+
+def get_data_budget() -> int:
+    """Returns the memory budget of the item data.
+
+    The value is read from the ``settings/data_budget`` user setting.
+
+    Returns:
+        int: The budget in bytes.
+
+    """
+    if not hasattr(common.settings, 'value'):
+        return DEFAULT_DATA_BUDGET
+
+    v = common.settings.value('settings/data_budget')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return DEFAULT_DATA_BUDGET
+    return max(1, v) * 1024 * 1024
+
+
+def evict_data(pinned: Optional[List[Tuple[Tuple[str, ...], str]]] = None, budget: Optional[int] = None) -> List[
+    Tuple[Tuple[str, ...], str]]:
+    """Evicts the least recently used data sets until the item data fits the budget.
+
+    Pinned data sets, for example, the ones shown by the item tabs, are never
+    evicted. The listing snapshots of evicted task folders are spilled to the
+    listing cache, see :func:`_spill_snapshot`.
+
+    Args:
+        pinned (list): (parent path, task) tuples of the data sets to keep.
+        budget (int): The budget in bytes. Defaults to :func:`get_data_budget`.
+
+    Returns:
+        list: (parent path, task) tuples of the evicted data sets.
+
+    """
+    if budget is None:
+        budget = get_data_budget()
+    pinned = {(tuple(key), task) for key, task in (pinned or ())}
+
+    lock.lockForRead()
+    try:
+        sizes = {}
+        for key, tasks_dict in common.item_data.items():
+            for task in tasks_dict:
+                sizes[(tuple(key), task)] = _estimate_size_no_lock(key, task)
+    finally:
+        lock.unlock()
+
+    total = sum(sizes.values())
+    if total <= budget:
+        return []
+
+    # Data sets that were never touched are the least recently used
+    with _recency_lock:
+        for k in list(_recency):
+            if k not in sizes:
+                del _recency[k]
+        order = [k for k in sizes if k not in _recency] + list(_recency)
+
+    evicted = []
+    lock.lockForWrite()
+    try:
+        for key, task in order:
+            if total <= budget:
+                break
+            if (key, task) in pinned:
+                continue
+            tasks_dict = common.item_data.get(key)
+            if tasks_dict is None or task not in tasks_dict:
+                continue
+
+            del tasks_dict[task]
+            if not tasks_dict:
+                del common.item_data[key]
+            total -= sizes[(key, task)]
+            evicted.append((key, task))
+    finally:
+        lock.unlock()
+
+    with _recency_lock:
+        for k in evicted:
+            _recency.pop(k, None)
+
+    for key, task in evicted:
+        _spill_snapshot(key, task)
+    return evicted
@@ -1,4 +1,3 @@
-import functools
 import re
 import shlex
 from types import NoneType
@@ -9,6 +8,8 @@ __all__ = [
 
 from PySide2 import QtGui
 
+from .. import common
+
 
 class SyntaxFilter:
     _syntax_markers = (
@@ -55,7 +56,7 @@ class SyntaxFilter:
         return self._filter_string
 
     @staticmethod
-    @functools.lru_cache(maxsize=4194304)
+    @common.bounded_cache
     def parse_filter_string(filter_string, case_sensitive):
         """
         Parses the filter string into positive and negative patterns and terms.
@@ -122,7 +123,7 @@ class SyntaxFilter:
             invalid_regex_patterns
         )
 
-    @functools.lru_cache(maxsize=4194304)
+    @common.bounded_cache
     def _match_string(self, _, full_path):
         """
         Determines if a given full path matches the filter criteria.
@@ -1,10 +1,9 @@
-import functools
 import hashlib
 
 from .. import common
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_hash(key):
     """Calculates the md5 hash of a string.
 
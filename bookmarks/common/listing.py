@@ -0,0 +1,727 @@
+"""Directory snapshots used to incrementally update task folder listings.
+
+:class:`~bookmarks.items.files.FileItemModel` loads every file found inside a task
+folder. Walking large render or cache folders is expensive, so while walking, the model
+records the modification time and the immediate children of every directory it visits
+in a :class:`TaskSnapshot`. When the model is refreshed, only the directories whose
+modification time has changed are scanned again:
+
+.. code-block:: python
+    :linenos:
+
+    snapshot = common.TaskSnapshot('//server/job/root/asset/render')
+    files = list(snapshot.walk())
+
+    # ...later
+    added, removed = snapshot.update()
+
+.. note::
+
+    Directory modification times only change when an entry is added, removed, or
+    renamed. Files modified in place are not reported by :meth:`TaskSnapshot.update`.
+
+Listing directories on network shares is mostly spent waiting on round trips to the
+server. When :attr:`TaskSnapshot.max_workers` is greater than one, sibling directories
+are scanned concurrently by a pool of threads. The number of threads can be set by the
+``settings/scan_threads`` user setting, see :func:`get_scan_threads`.
+
+When :attr:`TaskSnapshot.stat_files` is set, the size and modification time of files
+are read while walking, and files are recorded as :class:`CachedEntry` instances so
+the values are available without further file system calls. On Windows, the values
+are part of the directory listing; elsewhere, large directories are stat-ed in
+batches by a pool of threads.
+
+Snapshots are stored in :attr:`bookmarks.common.dir_snapshots` keyed by the
+model's parent path and task folder. They're also saved to disk by :func:`save_cache`,
+so the next time a task folder is opened, the files can be listed from the cache
+using :func:`load_cache` while the snapshot is validated in the background.
+Cached files are represented by :class:`CachedEntry` instances that store the size
+and modification time of the file. Old cache files are removed by :func:`prune_cache`.
+
+"""
+import collections
+import concurrent.futures
+import gzip
+import json
+import os
+import time
+import uuid
+
+from .. import common
+
+__all__ = [
+    'DirSnapshot',
+    'TaskSnapshot',
+    'CachedStat',
+    'CachedEntry',
+    'get_snapshot',
+    'set_snapshot',
+    'remove_snapshot',
+    'get_cache_path',
+    'save_cache',
+    'load_cache',
+    'prune_cache',
+    'get_scan_threads',
+    'DEFAULT_SCAN_THREADS',
+]
+
+#: The default number of threads used to scan task folders
+DEFAULT_SCAN_THREADS = 8
+
+#: The version of the listing cache format
+CACHE_VERSION = 1
+
+#: Cache files not saved for this many seconds are removed, see :func:`prune_cache`
+CACHE_MAX_AGE = 60 * 60 * 24 * 30
+
+#: The maximum total size of the cache files of a bookmark item in bytes
+CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+#: The number of files stat-ed by a thread in one go
+STAT_BATCH_SIZE = 64
+
+
+class CachedStat:
+    """The cached ``stat()`` result of a file.
+
+    """
+    __slots__ = ('st_size', 'st_mtime')
+
+    def __init__(self, st_size, st_mtime):
+        self.st_size = st_size
+        self.st_mtime = st_mtime
+
+
+class CachedEntry:
+    """A file loaded from the listing cache.
+
+    The class implements the parts of the ``DirEntry`` interface used by the item
+    models and the thread workers.
+
+    Args:
+        path (str): The path of the file.
+        size (int): The cached size of the file, or -1 if unknown.
+        mtime (float): The cached modification time of the file, or -1 if unknown.
+
+    """
+    __slots__ = ('path', 'name', '_size', '_mtime')
+
+    def __init__(self, path, size=-1, mtime=-1):
+        self.path = path
+        self.name = path.rsplit('/', 1)[-1]
+        self._size = size
+        self._mtime = mtime
+
+    def __repr__(self):
+        return f'<CachedEntry {self.name}>'
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Returns a cached entry of the given ``DirEntry``.
+
+        Args:
+            entry (DirEntry): A file entry.
+
+        Returns:
+            CachedEntry: The cached entry. The size and modification time are
+            unknown if the file can't be accessed.
+
+        """
+        path = entry.path.replace('\\', '/')
+        try:
+            st = entry.stat()
+        except OSError:
+            return cls(path)
+        return cls(path, st.st_size, st.st_mtime)
+
+    @property
+    def has_stat(self):
+        """`True` if the size and modification time of the file are known.
+
+        """
+        return self._size >= 0 and self._mtime >= 0
+
+    def __fspath__(self):
+        return self.path
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+    def is_dir(self, follow_symlinks=True):
+        return False
+
+    def stat(self, follow_symlinks=True):
+        """Returns the cached stat values of the file.
+
+        Raises:
+            OSError: If the values are not cached and the file can't be accessed.
+
+        """
+        if self._size < 0 or self._mtime < 0:
+            st = os.stat(self.path)
+            self._size = st.st_size
+            self._mtime = st.st_mtime
+        return CachedStat(self._size, self._mtime)
+
+
+class DirSnapshot:
+    """The recorded state of a single directory.
+
+    Attributes:
+        mtime (int): The directory's modification time in nanoseconds.
+        files (frozenset): The names of the files found in the directory.
+        dirs (tuple): The normalized paths of the subdirectories.
+        entries (tuple): The file entries found in the directory.
+
+    """
+    __slots__ = ('mtime', 'files', 'dirs', 'entries')
+
+    def __init__(self, mtime, files, dirs, entries=()):
+        self.mtime = mtime
+        self.files = files
+        self.dirs = dirs
+        self.entries = entries
+
+    def __repr__(self):
+        return f'<DirSnapshot (files={len(self.files)}, dirs={len(self.dirs)})>'
+
+
+class TaskSnapshot:
+    """The recorded state of all directories found in a task folder.
+
+    Args:
+        root (str): Path to the task folder.
+        max_workers (int): The number of directories to scan concurrently.
+        stat_files (bool): Whether to read the size and modification time of files.
+
+    Attributes:
+        root (str): The normalized path of the task folder.
+        dirs (dict): Directory path to :class:`DirSnapshot` mapping.
+        max_workers (int): The number of directories to scan concurrently.
+        stat_files (bool): Whether to read the size and modification time of files
+            while scanning. Files are recorded as :class:`CachedEntry` instances.
+
+    """
+
+    def __init__(self, root, max_workers=1, stat_files=False):
+        self.root = root.replace('\\', '/').rstrip('/')
+        self.dirs = {}
+        self.max_workers = max(1, int(max_workers))
+        self.stat_files = stat_files
+
+    def __repr__(self):
+        return f'<TaskSnapshot ({self.root}, dirs={len(self.dirs)})>'
+
+    def __len__(self):
+        return len(self.dirs)
+
+    def copy(self):
+        """Returns a copy of the snapshot.
+
+        The recorded directories are shared, as updating the copy replaces them
+        instead of changing them.
+
+        Returns:
+            TaskSnapshot: The copy.
+
+        """
+        snapshot = TaskSnapshot(self.root, max_workers=self.max_workers, stat_files=self.stat_files)
+        snapshot.dirs = dict(self.dirs)
+        return snapshot
+
+    def scan_dir(self, path, parallel=True):
+        """Lists and records the contents of a single directory.
+
+        Args:
+            path (str): The normalized path of a directory.
+            parallel (bool): Whether large directories are stat-ed by a pool of
+                threads, see :meth:`stat_entries`. `False` when the directories are
+                already scanned in parallel.
+
+        Returns:
+            tuple: A list of file ``DirEntry`` instances, and a list of subdirectory paths.
+
+        Raises:
+            OSError: If the directory cannot be read.
+
+        """
+        # The modification time is read before listing so changes made while we're
+        # scanning are picked up by the next update
+        mtime = os.stat(path).st_mtime_ns
+
+        files = []
+        dirs = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        files.append(entry)
+                    elif entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path.replace('\\', '/'))
+                except OSError:
+                    continue
+
+        if self.stat_files:
+            files = self.stat_entries(files, parallel=parallel)
+
+        self.dirs[path] = DirSnapshot(
+            mtime,
+            frozenset(entry.name for entry in files),
+            tuple(dirs),
+            tuple(files)
+        )
+        return files, dirs
+
+    def stat_entries(self, entries, parallel=True):
+        """Reads the size and modification time of the given files.
+
+        On Windows, ``DirEntry`` instances already carry the values read when
+        listing the directory. Elsewhere, every file has to be stat-ed, so large
+        directories are split into batches stat-ed by a pool of threads.
+
+        Args:
+            entries (list): A list of ``DirEntry`` instances.
+            parallel (bool): Whether to use a pool of threads for large directories.
+
+        Returns:
+            list: A list of :class:`CachedEntry` instances.
+
+        """
+        if (
+                os.name == 'nt' or
+                not parallel or
+                self.max_workers == 1 or
+                len(entries) <= STAT_BATCH_SIZE
+        ):
+            return [CachedEntry.from_entry(entry) for entry in entries]
+
+        def _stat(batch):
+            return [CachedEntry.from_entry(entry) for entry in batch]
+
+        batches = [
+            entries[idx:idx + STAT_BATCH_SIZE] for idx in
+            range(0, len(entries), STAT_BATCH_SIZE)
+        ]
+
+        v = []
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(batches)),
+                thread_name_prefix='TaskSnapshot'
+        ) as executor:
+            for batch in executor.map(_stat, batches):
+                v.extend(batch)
+        return v
+
+    def entries(self):
+        """Yields the entries of all files recorded in the snapshot.
+
+        Yields:
+            DirEntry: A file entry.
+
+        """
+        for v in list(self.dirs.values()):
+            yield from v.entries
+
+    def walk(self, path=None, interrupt=None):
+        """Recursively yields the files found under the given directory.
+
+        Every visited directory is recorded in the snapshot. When :attr:`max_workers`
+        is greater than one, directories are scanned in parallel and files are yielded
+        in no particular order.
+
+        Args:
+            path (str): The directory to walk. Defaults to :attr:`root`.
+            interrupt (callable): Optional function returning `True` when the walk
+                should stop.
+
+        Yields:
+            DirEntry: A file entry.
+
+        """
+        path = path if path else self.root
+        if self.max_workers > 1:
+            yield from self._walk_parallel(path, interrupt)
+            return
+
+        stack = [path]
+        while stack:
+            if interrupt and interrupt():
+                return
+
+            _path = stack.pop()
+            try:
+                files, dirs = self.scan_dir(_path)
+            except OSError as e:
+                from .. import log
+                log.error(__name__, f'Error scanning {_path}: {e}')
+                continue
+
+            yield from files
+            stack.extend(reversed(dirs))
+
+    def _walk_parallel(self, path, interrupt):
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='TaskSnapshot'
+        )
+
+        queued = collections.deque([path])
+        pending = {}
+
+        try:
+            while queued or pending:
+                if interrupt and interrupt():
+                    return
+
+                # Keep all threads busy without flooding the executor's queue, so
+                # an interrupt doesn't have to wait for the queued directories
+                while queued and len(pending) < self.max_workers * 2:
+                    _path = queued.popleft()
+                    # The directories are already scanned in parallel, so the
+                    # files are stat-ed by the thread scanning the directory
+                    pending[executor.submit(self.scan_dir, _path, parallel=False)] = _path
+
+                # The timeout makes sure we check for interrupts even when a
+                # directory is slow to list
+                done, _ = concurrent.futures.wait(
+                    pending,
+                    timeout=0.1,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    _path = pending.pop(future)
+                    try:
+                        files, dirs = future.result()
+                    except OSError as e:
+                        from .. import log
+                        log.error(__name__, f'Error scanning {_path}: {e}')
+                        continue
+
+                    yield from files
+                    queued.extend(dirs)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_mtimes(self, paths):
+        """Returns the modification times of the given directories.
+
+        Args:
+            paths (list): A list of normalized directory paths.
+
+        Returns:
+            dict: Directory path to modification time mapping. The value is `None`
+            if the directory can't be accessed.
+
+        """
+
+        def _mtime(path):
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+
+        if self.max_workers == 1 or len(paths) < 2:
+            return {f: _mtime(f) for f in paths}
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='TaskSnapshot'
+        ) as executor:
+            return dict(zip(paths, executor.map(_mtime, paths)))
+
+    def forget(self, path):
+        """Removes a directory and all its subdirectories from the snapshot.
+
+        Args:
+            path (str): The normalized path of a directory.
+
+        Returns:
+            set: The paths of the files the removed directories contained.
+
+        """
+        removed = set()
+        prefix = f'{path}/'
+        for k in [f for f in self.dirs if f == path or f.startswith(prefix)]:
+            removed.update(f'{k}/{name}' for name in self.dirs[k].files)
+            del self.dirs[k]
+        return removed
+
+    def update(self, interrupt=None):
+        """Re-scans the directories whose modification time has changed.
+
+        Args:
+            interrupt (callable): Optional function returning `True` when the update
+                should stop.
+
+        Returns:
+            tuple: A list of ``DirEntry`` instances of the added files, and a set of
+            the paths of the removed files.
+
+        """
+        added = []
+        removed = set()
+
+        paths = list(self.dirs)
+        mtimes = self._get_mtimes(paths)
+
+        for path in paths:
+            if interrupt and interrupt():
+                break
+
+            # The directory might have been removed as part of a parent directory
+            if path not in self.dirs:
+                continue
+
+            previous = self.dirs[path]
+            mtime = mtimes[path]
+            if mtime is None:
+                removed.update(self.forget(path))
+                continue
+
+            if mtime == previous.mtime:
+                continue
+
+            try:
+                files, dirs = self.scan_dir(path)
+            except OSError as e:
+                from .. import log
+                log.error(__name__, f'Error scanning {path}: {e}')
+                removed.update(self.forget(path))
+                continue
+
+            names = self.dirs[path].files
+            removed.update(f'{path}/{name}' for name in previous.files - names)
+            added.extend(entry for entry in files if entry.name not in previous.files)
+
+            for _path in set(previous.dirs) - set(dirs):
+                removed.update(self.forget(_path))
+            for _path in dirs:
+                if _path in self.dirs:
+                    continue
+                added.extend(self.walk(path=_path, interrupt=interrupt))
+
+        return added, removed
+
+
+def get_snapshot(key, task):
+    """Returns the cached snapshot of a task folder.
+
+    Args:
+        key (tuple): The model's parent path.
+        task (str): The task folder.
+
+    Returns:
+        TaskSnapshot: The cached snapshot, or `None` if not found.
+
+    """
+    return common.dir_snapshots.get((tuple(key), task), None)
+
+
+def set_snapshot(key, task, snapshot):
+    """Caches the snapshot of a task folder.
+
+    Args:
+        key (tuple): The model's parent path.
+        task (str): The task folder.
+        snapshot (TaskSnapshot): The snapshot to cache.
+
+    """
+    common.dir_snapshots[(tuple(key), task)] = snapshot
+
+
+def remove_snapshot(key, task):
+    """Removes the cached snapshot of a task folder.
+
+    Args:
+        key (tuple): The model's parent path.
+        task (str): The task folder.
+
+    """
+    common.dir_snapshots.pop((tuple(key), task), None)
+
+
+def get_scan_threads():
+    """Returns the number of threads used to scan task folders.
+
+    The value is read from the ``settings/scan_threads`` user setting.
+
+    Returns:
+        int: The number of threads.
+
+    """
+    if not hasattr(common.settings, 'value'):
+        return DEFAULT_SCAN_THREADS
+
+    v = common.settings.value('settings/scan_threads')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return DEFAULT_SCAN_THREADS
+    return max(1, v)
+
+
+def get_cache_path(key, task):
+    """Returns the path of the listing cache file of a task folder.
+
+    The cache files are stored in the bookmark item's data directory.
+
+    Args:
+        key (tuple): The model's parent path.
+        task (str): The task folder.
+
+    Returns:
+        str: Path to the cache file.
+
+    """
+    server, job, root = key[0:3]
+    source = '/'.join(tuple(key) + (task,))
+    name = common.get_hash(source)
+    return f'{server}/{job}/{root}/{common.bookmark_item_data_dir}/files/{name}.cache'
+
+
+def save_cache(snapshot, path):
+    """Saves the given snapshot to a listing cache file.
+
+    Directories are saved relative to the snapshot's root alongside the size and
+    modification time of each file. The file is replaced atomically, and the
+    cache directory is pruned, see :func:`prune_cache`.
+
+    Args:
+        snapshot (TaskSnapshot): The snapshot to save.
+        path (str): Path to the cache file.
+
+    """
+    prefix = f'{snapshot.root}/'
+
+    dirs = {}
+    for _path, v in list(snapshot.dirs.items()):
+        files = []
+        for entry in v.entries:
+            try:
+                st = entry.stat()
+                files.append([entry.name, st.st_size, st.st_mtime])
+            except OSError:
+                files.append([entry.name, -1, -1])
+
+        rel = '' if _path == snapshot.root else _path[len(prefix):]
+        dirs[rel] = [
+            v.mtime,
+            [f[len(prefix):] for f in v.dirs],
+            files,
+        ]
+
+    data = {
+        'version': CACHE_VERSION,
+        'dirs': dirs,
+    }
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f'{path}.{uuid.uuid1().hex}.tmp'
+    try:
+        with gzip.open(temp, 'wt', encoding='utf-8', compresslevel=1) as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+    prune_cache(os.path.dirname(path), keep=path)
+
+
+def prune_cache(cache_dir, max_age=CACHE_MAX_AGE, max_size=CACHE_MAX_SIZE, keep=None):
+    """Removes old listing cache files.
+
+    Cache files that weren't saved for `max_age` seconds are removed, as are
+    leftover temporary files. Then the least recently saved files are removed
+    until the total size of the cache files is under `max_size`.
+
+    Args:
+        cache_dir (str): The directory containing the cache files.
+        max_age (int): The maximum age of a cache file in seconds.
+        max_size (int): The maximum total size of the cache files in bytes.
+        keep (str): Optional path of a cache file that's never removed.
+
+    Returns:
+        list: The paths of the removed files.
+
+    """
+    try:
+        it = os.scandir(cache_dir)
+    except OSError:
+        return []
+
+    files = []
+    with it:
+        for entry in it:
+            if not entry.name.endswith(('.cache', '.tmp')):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, entry.path.replace('\\', '/')))
+
+    now = time.time()
+    total = sum(f[1] for f in files)
+    keep = keep.replace('\\', '/') if keep else None
+
+    removed = []
+    for mtime, size, path in sorted(files):
+        if path == keep:
+            continue
+        # Temporary files might still be written by another thread
+        if path.endswith('.tmp') and now - mtime < max_age:
+            continue
+        if now - mtime < max_age and total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def load_cache(path, root, max_workers=1):
+    """Loads a snapshot from the given listing cache file.
+
+    Args:
+        path (str): Path to the cache file.
+        root (str): Path to the task folder.
+        max_workers (int): The number of directories to scan concurrently.
+
+    Returns:
+        TaskSnapshot: The loaded snapshot, or `None` if the cache is missing or invalid.
+
+    """
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError, EOFError):
+        # An unreadable cache is a cache miss, the folder is scanned again
+        return None
+
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return None
+
+    snapshot = TaskSnapshot(root, max_workers=max_workers)
+    try:
+        for rel, (mtime, dirs, files) in data['dirs'].items():
+            _path = f'{snapshot.root}/{rel}' if rel else snapshot.root
+            snapshot.dirs[_path] = DirSnapshot(
+                mtime,
+                frozenset(f[0] for f in files),
+                tuple(f'{snapshot.root}/{f}' for f in dirs),
+                tuple(CachedEntry(f'{_path}/{f[0]}', f[1], f[2]) for f in files)
+            )
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+    if snapshot.root not in snapshot.dirs:
+        return None
+    return snapshot
@@ -91,6 +91,7 @@ class StringParser(QtCore.QObject):
 
     def _connect_signals(self):
         common.signals.databaseValueChanged.connect(self.update_env)
+        common.signals.databaseValuesChanged.connect(self.update_env)
         common.signals.bookmarkItemActivated.connect(self.update_env)
         common.signals.assetItemActivated.connect(self.update_env)
         common.signals.fileItemActivated.connect(self.update_env)
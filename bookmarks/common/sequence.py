@@ -27,10 +27,14 @@ All functions perform input validation and raise appropriate exceptions for
 invalid inputs.
 
 """
-import functools
+import bisect
+import collections
+import collections.abc
+import itertools
 import re
 import weakref
 
+import numpy as np
 from PySide2 import QtCore
 from . import common
 
@@ -40,6 +44,9 @@ __all__ = [
     'SEQPROXY',
     'is_collapsed',
     'get_sequence',
+    'SequenceGroup',
+    'group_sequences',
+    'FrameSet',
     'proxy_path',
     'get_sequence_start_path',
     'get_sequence_end_path',
@@ -80,8 +87,16 @@ GetSequenceRegex = re.compile(
     flags=re.IGNORECASE
 )
 
+#: Regular expression used to get the sequence components of newline separated
+#: file names. Matching a file name is equivalent to matching
+#: :attr:`GetSequenceRegex` against the file's path, unless the name's stem
+#: is a number, in which case the directory part of the path may also be matched.
+GetSequenceNamesRegex = re.compile(
+    r'^([^\n]*?)(\d+)([\d\\/]*|[^\d\\/\n]*(?=[^\n]+?))\.([A-Za-z][^\.\n]*)$',
+    flags=re.IGNORECASE | re.MULTILINE
+)
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def is_collapsed(s):
     """Check if the given path is a collapsed sequence.
 
@@ -107,7 +122,7 @@ def is_collapsed(s):
     return IsSequenceRegex.search(s)
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_sequence(s):
     """Check if the given path contains a sequence number component.
 
@@ -138,6 +153,346 @@ def get_sequence(s):
     return GetSequenceRegex.search(s)
 
 
+#: The files of a sequence found by :func:`group_sequences`. `frames` is an
+#: :class:`numpy.ndarray` of the frame numbers, `padding` the number of digits of
+#: the lowest frame, `first` and `last` the lowest and highest frame numbers, and
+#: `indexes` the indexes of the files in the grouped names
+SequenceGroup = collections.namedtuple(
+    'SequenceGroup', ('seq', 'frames', 'padding', 'first', 'last', 'indexes')
+)
+
+
+def group_sequences(path, names):
+    """Group the files of a directory by sequence.
+
+    The sequence components of all file names are found in a single regex pass
+    instead of calling :func:`get_sequence` on each file path. The frame numbers
+    are converted to integers, and the frame range and padding are found in the
+    same pass.
+
+    Args:
+        path (str): A normalized directory path.
+        names (list): The names of the files in the directory.
+
+    Returns:
+        dict: Sequence proxy paths mapped to :class:`SequenceGroup` instances.
+
+    """
+    groups = {}
+
+    def _add(sequence_path, seq, frame, idx):
+        n = int(frame)
+        if sequence_path not in groups:
+            # regex match, frame numbers, indexes, padding, first and last frames
+            groups[sequence_path] = [seq, [], [], len(frame), n, n]
+        group = groups[sequence_path]
+        group[1].append(n)
+        group[2].append(idx)
+        if n < group[4]:
+            group[3] = len(frame)
+            group[4] = n
+        elif n > group[5]:
+            group[5] = n
+
+    # Names that can't be matched in a single pass. Collapsed names raise errors
+    # and the sequence number of numbered files might be in the directory part
+    batch = []
+    for idx, name in enumerate(names):
+        stem = name.partition('.')[0]
+        if not stem or stem.isdigit() or SEQSTART in name or '\n' in name:
+            try:
+                seq = get_sequence(f'{path}/{name}')
+            except RuntimeError:
+                continue
+            if seq:
+                _add(
+                    f'{seq.group(1)}{SEQPROXY}{seq.group(3)}.{seq.group(4)}',
+                    seq, seq.group(2), idx
+                )
+            continue
+        batch.append(idx)
+
+    text = '\n'.join(names[idx] for idx in batch)
+    offsets = list(itertools.accumulate(len(names[idx]) + 1 for idx in batch[:-1]))
+    offsets.insert(0, 0)
+
+    for match in GetSequenceNamesRegex.finditer(text):
+        prefix, frame, suffix, ext = match.groups()
+        idx = batch[bisect.bisect_right(offsets, match.start()) - 1]
+
+        sequence_path = f'{path}/{prefix}{SEQPROXY}{suffix}.{ext}'
+        if sequence_path in groups:
+            _add(sequence_path, None, frame, idx)
+            continue
+
+        # The match object of the path is only needed once per sequence
+        seq = get_sequence(f'{path}/{names[idx]}')
+        if not seq:
+            continue
+        _add(sequence_path, seq, frame, idx)
+
+    return {
+        k: SequenceGroup(seq, _frame_array(numbers), padding, first, last, indexes)
+        for k, (seq, numbers, indexes, padding, first, last) in groups.items()
+    }
+
+
+def _frame_array(numbers):
+    try:
+        return np.array(numbers, dtype=np.int64)
+    except OverflowError:
+        # Numbers too large for 64-bit integers
+        return np.array(numbers, dtype=object)
+
+
+class FrameSet(collections.abc.Sequence):
+    """An immutable, sorted set of sequence frame numbers stored as ranges.
+
+    Instead of keeping a string for every frame, only the first and last frame
+    numbers of consecutive frame runs are stored. Items are the frame numbers
+    as padded strings, so the set can be used in place of a list of frames.
+
+    .. code-block:: python
+        :linenos:
+
+        frames = FrameSet(['0003', '0001', '0002', '0005'])
+        frames.first  # 1
+        frames.last  # 5
+        frames.range_string()  # '0001-0003,0005'
+        '0002' in frames  # True
+        list(frames)  # ['0001', '0002', '0003', '0005']
+
+    Args:
+        frames (iterable): Frame numbers as strings or integers.
+        padding (int): Optional. The number of digits of the frame numbers. By
+            default, the length of the first frame's string is used.
+
+    """
+    __slots__ = ('_starts', '_ends', '_offsets', 'padding')
+
+    def __init__(self, frames=(), padding=None):
+        if isinstance(frames, FrameSet):
+            self._starts = frames._starts
+            self._ends = frames._ends
+            self._offsets = frames._offsets
+            self.padding = frames.padding if padding is None else padding
+            return
+
+        frames = list(frames)
+        if not frames:
+            self._starts = ()
+            self._ends = ()
+            self._offsets = (0,)
+            self.padding = 1 if padding is None else padding
+            return
+
+        try:
+            numbers = np.asarray(frames, dtype=str).astype(np.int64)
+        except (ValueError, OverflowError):
+            # Non-ascii digits and numbers too large for 64-bit integers
+            numbers = np.array([int(f) for f in frames], dtype=object)
+
+        if padding is None:
+            f = frames[int(np.argmin(numbers))]
+            padding = len(f) if isinstance(f, str) else 1
+
+        self._set_numbers(numbers)
+        self.padding = padding
+
+    def _set_numbers(self, numbers):
+        # Runs of consecutive frames
+        unique = np.unique(numbers)
+        breaks = np.flatnonzero(np.diff(unique) != 1)
+        starts = np.concatenate((unique[:1], unique[breaks + 1]))
+        ends = np.concatenate((unique[breaks], unique[-1:]))
+
+        self._starts = tuple(starts.tolist())
+        self._ends = tuple(ends.tolist())
+        self._offsets = (0,) + tuple(itertools.accumulate(
+            e - s + 1 for s, e in zip(self._starts, self._ends)
+        ))
+
+    @classmethod
+    def from_array(cls, numbers, padding=1):
+        """Create a frame set from an array of integer frame numbers.
+
+        Unlike the constructor, the frame numbers aren't parsed from strings.
+
+        Args:
+            numbers (numpy.ndarray): The frame numbers, for example, the frames of a
+                :class:`SequenceGroup`.
+            padding (int): The number of digits of the frame numbers.
+
+        Returns:
+            FrameSet: A new frame set.
+
+        """
+        v = cls(padding=padding)
+        if len(numbers):
+            v._set_numbers(numbers)
+        return v
+
+    @classmethod
+    def from_ranges(cls, ranges, padding=1):
+        """Create a frame set from a list of frame ranges.
+
+        Args:
+            ranges (list): A list of `(start, end)` frame number tuples.
+            padding (int): The number of digits of the frame numbers.
+
+        Returns:
+            FrameSet: A new frame set.
+
+        """
+        starts = []
+        ends = []
+        for s, e in sorted((min(r), max(r)) for r in ranges):
+            # Merge overlapping and adjacent ranges
+            if ends and s <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], e)
+                continue
+            starts.append(s)
+            ends.append(e)
+
+        v = cls(padding=padding)
+        v._starts = tuple(starts)
+        v._ends = tuple(ends)
+        v._offsets = (0,) + tuple(itertools.accumulate(e - s + 1 for s, e in zip(starts, ends)))
+        return v
+
+    def __repr__(self):
+        return f'<FrameSet {self.range_string()}>'
+
+    def union(self, other):
+        """Returns a new frame set with the frames of both frame sets.
+
+        The padding of the frame set with the lower first frame is kept.
+
+        Args:
+            other (FrameSet): A frame set.
+
+        Returns:
+            FrameSet: A new frame set.
+
+        """
+        if not other:
+            return FrameSet(self)
+        if not self:
+            return FrameSet(other)
+        padding = self.padding if self.first <= other.first else other.padding
+        return FrameSet.from_ranges(self.ranges() + other.ranges(), padding=padding)
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        n = len(self)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError('FrameSet index out of range')
+
+        run = bisect.bisect_right(self._offsets, idx) - 1
+        return self.format(self._starts[run] + idx - self._offsets[run])
+
+    def __iter__(self):
+        for s, e in zip(self._starts, self._ends):
+            for n in range(s, e + 1):
+                yield self.format(n)
+
+    def __contains__(self, v):
+        try:
+            n = int(v)
+        except (TypeError, ValueError):
+            return False
+        run = bisect.bisect_right(self._starts, n) - 1
+        return run >= 0 and n <= self._ends[run]
+
+    def __eq__(self, other):
+        if isinstance(other, FrameSet):
+            return (
+                    self._starts == other._starts and
+                    self._ends == other._ends and
+                    self.padding == other.padding
+            )
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def first(self):
+        """The first frame number.
+
+        """
+        if not self._starts:
+            raise ValueError('FrameSet is empty')
+        return self._starts[0]
+
+    @property
+    def last(self):
+        """The last frame number.
+
+        """
+        if not self._ends:
+            raise ValueError('FrameSet is empty')
+        return self._ends[-1]
+
+    @property
+    def is_contiguous(self):
+        """`True` if the frame set has no missing frames.
+
+        """
+        return len(self._starts) <= 1
+
+    def format(self, n):
+        """Returns the given frame number as a padded string.
+
+        Args:
+            n (int): A frame number.
+
+        Returns:
+            str: The padded frame number.
+
+        """
+        return str(n).zfill(self.padding)
+
+    def numbers(self):
+        """Yields the frame numbers as integers.
+
+        """
+        for s, e in zip(self._starts, self._ends):
+            yield from range(s, e + 1)
+
+    def ranges(self):
+        """Returns the runs of consecutive frames.
+
+        Returns:
+            list: A list of `(start, end)` frame number tuples.
+
+        """
+        return list(zip(self._starts, self._ends))
+
+    def range_string(self):
+        """Returns the frame ranges as a string, for example, `'0001-0003,0005'`.
+
+        Returns:
+            str: The frame ranges.
+
+        """
+        blocks = []
+        for s, e in zip(self._starts, self._ends):
+            if s == e:
+                blocks.append(self.format(s))
+            else:
+                blocks.append(f'{self.format(s)}-{self.format(e)}')
+        return ','.join(blocks)
+
+
 def proxy_path(v):
     """Generate a proxy path to represent sequences or collapsed items consistently.
 
@@ -173,7 +528,7 @@ def proxy_path(v):
     return _proxy_path(v)
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def _proxy_path(v):
     """Internal helper for proxy_path."""
     collapsed = is_collapsed(v)
@@ -187,7 +542,7 @@ def _proxy_path(v):
     return v.replace('\\', '/')
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_sequence_start_path(path):
     """Get the first file path in a collapsed sequence.
 
@@ -213,7 +568,7 @@ def get_sequence_start_path(path):
     return path
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_sequence_end_path(path):
     """Get the last file path in a collapsed sequence.
 
@@ -267,7 +622,7 @@ def get_sequence_paths(index):
     seq = index.data(common.SequenceRole)
     frames = index.data(common.FramesRole)
 
-    if not seq or not hasattr(seq, 'group') or not frames or not isinstance(frames, list):
+    if not seq or not hasattr(seq, 'group') or not frames or not isinstance(frames, (list, FrameSet)):
         raise ValueError("Sequence or frames data is missing or invalid.")
 
     v = []
@@ -32,6 +32,13 @@ SECTIONS = {
         'settings/disable_oiio',
         'settings/hide_item_descriptions',
         'settings/default_to_scenes_folder',
+        'settings/scan_threads',
+        'settings/info_threads',
+        'settings/prefetch_rows',
+        'settings/thumbnail_processes',
+        'settings/cache_budget',
+        'settings/data_budget',
+        'settings/database_profile',
         'settings/always_always_on_top',
         'settings/bin_ffmpeg',
         'settings/bin_rv',
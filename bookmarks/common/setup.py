@@ -178,6 +178,7 @@ def initialize_func(
         common.init_signals(connect_signals=mode != common.Mode.Core)
         common.init_active_mode()
         common.init_settings()
+        common.set_cache_budget(common.get_cache_budget())
         common.init_active()
 
         from .parser import StringParser
@@ -249,6 +250,12 @@ def initialize_func(
         thread = threads.get_thread(threads.QueuedSGQuery)
         thread.start()
         _threads.append(thread)
+        thread = threads.get_thread(threads.FileScan)
+        thread.start()
+        _threads.append(thread)
+        thread = threads.get_thread(threads.QueuedListingCache)
+        thread.start()
+        _threads.append(thread)
 
         # Wait for all threads to spin up before continuing
         i = 0.01
@@ -39,6 +39,8 @@ class CoreSignals(QtCore.QObject):
 
     #: Signals a value change in the bookmark database -(db table, source path, column, new value)
     databaseValueChanged = QtCore.Signal(str, str, str, object)
+    #: Signals the value changes of a bookmark database transaction - list of (db table, source path, column, new value)
+    databaseValuesChanged = QtCore.Signal(list)
 
     #: Signal called when thumbnail generating is enabled or disabled
     generateThumbnailsChanged = QtCore.Signal(QtCore.Qt.CheckState)
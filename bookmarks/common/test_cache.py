@@ -0,0 +1,99 @@
+import unittest
+
+from . import common
+from .cache import *
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        @bounded_cache
+        def func(v, suffix=''):
+            self.calls.append(v)
+            return f'{v}{suffix}'
+
+        self.func = func
+
+    def tearDown(self):
+        set_cache_budget(DEFAULT_CACHE_BUDGET)
+        self.func.cache_clear()
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.func('a'), 'a')
+        self.assertEqual(self.func('a'), 'a')
+        self.assertEqual(self.func('b'), 'b')
+        self.assertEqual(self.calls, ['a', 'b'])
+
+        info = self.func.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 2)
+        self.assertGreater(info.nbytes, 0)
+
+    def test_keyword_arguments(self):
+        self.assertEqual(self.func('a', suffix='.ma'), 'a.ma')
+        self.assertEqual(self.func('a'), 'a')
+        self.assertEqual(self.func('a', suffix='.ma'), 'a.ma')
+        self.assertEqual(self.calls, ['a', 'a'])
+
+    def test_budget_evicts_least_recently_used(self):
+        self.func('a')
+        n = self.func.cache_info().nbytes
+        self.func.cache_clear()
+
+        set_cache_budget(n * 2)
+        self.func('a')
+        self.func('b')
+        self.func('a')  # 'b' is now the least recently used value
+        self.func('c')
+
+        info = self.func.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertLessEqual(info.nbytes, n * 2)
+
+        self.calls = []
+        self.func('a')
+        self.func('b')
+        self.assertEqual(self.calls, ['b'])
+
+    def test_cache_clear(self):
+        self.func('a')
+        self.func.cache_clear()
+        self.assertEqual(self.func.cache_info().currsize, 0)
+        self.func('a')
+        self.assertEqual(self.calls, ['a', 'a'])
+
+    def test_method(self):
+        class Item:
+            def __init__(self):
+                self.calls = 0
+
+            @bounded_cache
+            def value(self, v):
+                self.calls += 1
+                return v * 2
+
+        item = Item()
+        self.assertEqual(item.value(2), 4)
+        self.assertEqual(item.value(2), 4)
+        self.assertEqual(item.calls, 1)
+        Item.value.cache_clear()
+
+    def test_cache_stats(self):
+        self.func('a')
+        stats = cache_stats()
+        self.assertIn(self.func.name, stats)
+        self.assertEqual(stats[self.func.name].misses, 1)
+
+    def test_registered_helpers(self):
+        common.get_hash('//server/job/root/asset/file.ma')
+        self.assertIn('bookmarks.common.hash.get_hash', cache_stats())
+
+        clear_caches()
+        self.assertEqual(common.get_hash.cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
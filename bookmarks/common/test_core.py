@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import unittest
 import tempfile
 import shutil
@@ -35,6 +36,16 @@ class TestCoreFunctions(unittest.TestCase):
         self.assertIsInstance(key, str)
         self.assertIn('server/job/root', key)
 
+    def test_get_thread_key_not_reused(self):
+        keys = []
+        for _ in range(3):
+            t = threading.Thread(target=lambda: keys.append(get_thread_key('server')))
+            t.start()
+            t.join()
+        keys.append(get_thread_key('server'))
+        self.assertEqual(len(set(keys)), 4)
+        self.assertEqual(get_thread_key('server'), keys[-1])
+
     def test_sort_words(self):
         result = sort_words('banana apple cherry')
         self.assertEqual(result, 'apple, banana, cherry')
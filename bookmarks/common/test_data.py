@@ -2,6 +2,7 @@ import random
 import threading
 import time
 import unittest
+from unittest import mock
 import weakref
 
 from PySide2.QtCore import QAbstractListModel, QModelIndex, Qt, QIdentityProxyModel
@@ -106,6 +107,168 @@ class TestDataModule(unittest.TestCase):
                                                role=common.PathRole)
         self.assertIsNone(not_found)
 
+    def test_get_data_from_value_index(self):
+        key = ("some", "where")
+        task = "index_task"
+        d = create_test_data(items=5)
+        common.set_data(key, task, common.FileItem, d)
+
+        # Items added to the data after it was set
+        item = common.DataDict({common.IdRole: 5, common.PathRole: "/path/to/new.ext"})
+        d[5] = item
+        self.assertIs(common.get_data_from_value(
+            "/path/to/new.ext", common.FileItem, get_container=False
+        ), item)
+
+        # Items replaced without changing the number of items
+        d.clear()
+        for i in range(6):
+            d[i] = common.DataDict({common.IdRole: i, common.PathRole: f"/path/to/other_{i}.ext"})
+        self.assertIsNone(common.get_data_from_value("/path/to/new.ext", common.FileItem))
+        self.assertIs(common.get_data_from_value("/path/to/other_3.ext", common.FileItem), d)
+
+        # Sorted data keeps the index
+        ref = weakref.ref(d)
+        sorted_d = common.sort_data(ref, common.PathRole, sort_order=True)
+        common.set_data(key, task, common.FileItem, sorted_d)
+        item = common.get_data_from_value("/path/to/other_3.ext", common.FileItem, get_container=False)
+        self.assertEqual(item[common.IdRole], 2)
+
+    def test_get_data_from_value_sequence_path(self):
+        key = ("some", "where")
+        task = "sequence_task"
+        d = create_test_data(items=1, data_type=common.SequenceItem)
+        d[0][common.PathRole] = "/path/to/image_<<?>>.exr"
+        common.set_data(key, task, common.SequenceItem, d)
+
+        # The sequence's path is changed when the file info is loaded
+        d[0][common.PathRole] = "/path/to/image_<<0001-0010>>.exr"
+        self.assertIs(common.get_data_from_value(
+            "/path/to/image_<<0001-0010>>.exr", common.SequenceItem, get_container=False
+        ), d[0])
+        self.assertIsNone(common.get_data_from_value(
+            "/path/to/image_<<?>>.exr", common.SequenceItem
+        ))
+
+    def test_set_item_path(self):
+        key = ("some", "where")
+        task = "path_task"
+        d = create_test_data(items=3)
+        for i in range(3):
+            d[i][common.DataDictRole] = weakref.ref(d)
+        common.set_data(key, task, common.FileItem, d)
+
+        # The path index follows the item's new path
+        common.set_item_path(d[1], "/path/to/renamed.ext")
+        self.assertEqual(d[1][common.PathRole], "/path/to/renamed.ext")
+        self.assertIs(common.get_data_from_value(
+            "/path/to/renamed.ext", common.FileItem, get_container=False
+        ), d[1])
+        self.assertIsNone(common.get_data_from_value("/path/to/item_1.ext", common.FileItem))
+        self.assertIs(common.get_data_from_value(
+            "/path/to/item_2.ext", common.FileItem, get_container=False
+        ), d[2])
+
+    def test_read_helpers_use_read_lock(self):
+        key = ("read", "lock")
+        task = "task"
+        common.set_data(key, task, common.FileItem, create_test_data(items=3))
+
+        result = []
+
+        def reader():
+            result.append(common.data_count(key, task, common.FileItem))
+            result.append(common.is_data_loaded(key, task, common.FileItem))
+            result.append(common.get_data(key, task, common.FileItem))
+
+        # Existing data can be read while another thread holds the read lock
+        lock.lockForRead()
+        try:
+            t = threading.Thread(target=reader)
+            t.start()
+            t.join(5)
+        finally:
+            lock.unlock()
+        t.join()
+        self.assertEqual(result[:2], [3, True])
+
+    def test_sort_data_waits_for_lock(self):
+        key = ("sort", "lock")
+        task = "task"
+        d = create_test_data(items=5)
+        common.set_data(key, task, common.FileItem, d)
+        ref = weakref.ref(d)
+        done = threading.Event()
+
+        def sort():
+            common.sort_data(ref, common.PathRole, sort_order=True)
+            done.set()
+
+        # The data set is only replaced once the readers are done
+        lock.lockForRead()
+        try:
+            t = threading.Thread(target=sort)
+            t.start()
+            self.assertFalse(done.wait(0.2))
+            self.assertIs(common.item_data[key][task][common.FileItem], d)
+        finally:
+            lock.unlock()
+        t.join()
+        self.assertIsNot(common.get_data(key, task, common.FileItem), d)
+        self.assertEqual(d[0][common.PathRole], "/path/to/item_0.ext")
+
+    def test_replace_items(self):
+        key = ("replace", "items")
+        task = "task"
+        d = create_test_data(items=5)
+        common.set_data(key, task, common.FileItem, d)
+        items = [d[3], d[1]]
+        result = common.replace_items(key, task, common.FileItem, items)
+        self.assertIs(result, d)
+        self.assertEqual(len(d), 2)
+        self.assertEqual([d[n][common.PathRole] for n in range(2)], ["/path/to/item_3.ext", "/path/to/item_1.ext"])
+        self.assertEqual([d[n][common.IdRole] for n in range(2)], [0, 1])
+        self.assertIs(d[0][common.DataDictRole](), d)
+
+        common.add_items(key, task, common.FileItem, [{common.PathRole: "/path/to/new.ext"}])
+        self.assertEqual(d[2][common.IdRole], 2)
+        self.assertEqual(d[2][common.PathRole], "/path/to/new.ext")
+
+    def test_replace_items_after_sort(self):
+        key = ("replace", "sorted")
+        task = "task"
+        d = create_test_data(items=5)
+        common.set_data(key, task, common.FileItem, d)
+        sorted_d = common.sort_data(weakref.ref(d), common.PathRole, sort_order=True)
+
+        # Items are added to the data set replacing the sorted one
+        result = common.add_items(key, task, common.FileItem, [{common.PathRole: "/path/to/new.ext"}])
+        self.assertIs(result, sorted_d)
+        self.assertEqual(len(sorted_d), 6)
+        self.assertEqual(len(d), 5)
+
+    def test_replace_items_waits_for_lock(self):
+        key = ("replace", "lock")
+        task = "task"
+        d = create_test_data(items=5)
+        common.set_data(key, task, common.FileItem, d)
+        done = threading.Event()
+
+        def replace():
+            common.replace_items(key, task, common.FileItem, [])
+            done.set()
+
+        lock.lockForRead()
+        try:
+            t = threading.Thread(target=replace)
+            t.start()
+            self.assertFalse(done.wait(0.2))
+            self.assertEqual(len(d), 5)
+        finally:
+            lock.unlock()
+        t.join()
+        self.assertEqual(len(d), 0)
+
     def test_get_task_data(self):
         key = ("root",)
         task = "mytask"
@@ -126,6 +289,110 @@ class TestDataModule(unittest.TestCase):
         paths = [sorted_d[i][common.PathRole] for i in sorted_d]
         self.assertEqual(paths, sorted(paths))
 
+    def test_sort_data_replaces_data(self):
+        key = ("sort", "replace")
+        task = "task"
+        d = create_test_data(items=5)
+        for i in range(5):
+            d[i][common.SortBySizeRole] = (i * 7) % 5
+        common.set_data(key, task, common.FileItem, d)
+        items = [d[i] for i in range(5)]
+
+        sorted_d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=False)
+        self.assertIsNot(sorted_d, d)
+        self.assertIs(common.get_data(key, task, common.FileItem), sorted_d)
+        self.assertEqual([sorted_d[i][common.SortBySizeRole] for i in range(5)], [0, 1, 2, 3, 4])
+        self.assertEqual([sorted_d[i][common.IdRole] for i in range(5)], [0, 1, 2, 3, 4])
+        self.assertIs(sorted_d[0][common.DataDictRole](), sorted_d)
+        self.assertTrue(sorted_d.loaded)
+
+        # The old data set isn't reordered
+        self.assertEqual([d[i] for i in range(5)], items)
+
+        # The path index is built for the new data set
+        item = common.get_data_from_value("/path/to/item_0.ext", common.FileItem, get_container=False)
+        self.assertIs(item, sorted_d[0])
+
+    def test_sort_data_caches_permutations(self):
+        d = create_test_data(items=6)
+        for i in range(6):
+            d[i][common.SortBySizeRole] = (i * 5) % 6
+
+        d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=False)
+        self.assertIn(common.SortBySizeRole, d._sort_cache)
+
+        # Reversing the order reuses the cached permutation
+        with mock.patch.object(common.data, '_get_sort_keys') as m:
+            d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=True)
+            m.assert_not_called()
+        self.assertEqual([d[i][common.SortBySizeRole] for i in range(6)], [5, 4, 3, 2, 1, 0])
+
+        # Data sets still loading aren't cached
+        d = create_test_data(items=3, loaded=False)
+        d = common.sort_data(weakref.ref(d), common.PathRole, sort_order=False)
+        self.assertIsNone(d._sort_cache)
+
+    def test_sort_data_switching_roles(self):
+        d = create_test_data(items=6)
+        for i in range(6):
+            d[i][common.SortBySizeRole] = (i * 5) % 6
+
+        d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=False)
+        d = common.sort_data(weakref.ref(d), common.PathRole, sort_order=False)
+
+        # Switching back to a previous sort role and reversing the order
+        d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=True)
+        self.assertEqual([d[i][common.SortBySizeRole] for i in range(6)], [5, 4, 3, 2, 1, 0])
+        d = common.sort_data(weakref.ref(d), common.PathRole, sort_order=True)
+        paths = [d[i][common.PathRole] for i in range(6)]
+        self.assertEqual(paths, sorted(paths, reverse=True))
+
+        # Changed sort keys are re-sorted once the cache is reset
+        d[0][common.PathRole] = "/path/to/a.ext"
+        d.reset_sort_cache()
+        d = common.sort_data(weakref.ref(d), common.PathRole, sort_order=False)
+        self.assertEqual(d[0][common.PathRole], "/path/to/a.ext")
+        paths = [d[i][common.PathRole] for i in range(6)]
+        self.assertEqual(paths, sorted(paths))
+
+    def test_sort_data_descending_is_stable(self):
+        d = create_test_data(items=6)
+        for i in range(6):
+            d[i][common.SortBySizeRole] = i // 2
+        items = [d[i] for i in range(6)]
+
+        d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=True)
+        expected = sorted(items, key=lambda v: v[common.SortBySizeRole], reverse=True)
+        self.assertEqual([d[i] for i in range(6)], expected)
+
+        d = common.sort_data(weakref.ref(d), common.SortBySizeRole, sort_order=False)
+        self.assertEqual([d[i] for i in range(6)], items)
+
+    def test_evict_data(self):
+        for task in ("a", "b", "c"):
+            common.set_data(("evict", "test"), task, common.FileItem, create_test_data(items=50))
+        # "a" is now the most recently used data set
+        common.get_data(("evict", "test"), "a", common.FileItem)
+
+        # Nothing is evicted within budget
+        self.assertEqual(common.evict_data(budget=1024 * 1024 * 1024), [])
+
+        evicted = common.evict_data(pinned=[(("evict", "test"), "b")], budget=1)
+        self.assertEqual(evicted, [(("evict", "test"), "c"), (("evict", "test"), "a")])
+        self.assertEqual(list(common.item_data[("evict", "test")]), ["b"])
+
+        # Evicted data sets are recreated empty
+        self.assertEqual(common.data_count(("evict", "test"), "a", common.FileItem), 0)
+
+    def test_evict_data_removes_empty_keys(self):
+        common.set_data(("evict", "one"), "task", common.FileItem, create_test_data(items=5))
+        common.set_data(("evict", "two"), "task", common.FileItem, create_test_data(items=5))
+
+        evicted = common.evict_data(pinned=[(("evict", "two"), "task")], budget=1)
+        self.assertEqual(evicted, [(("evict", "one"), "task")])
+        self.assertNotIn(("evict", "one"), common.item_data)
+        self.assertIn(("evict", "two"), common.item_data)
+
     def test_get_data_ref(self):
         key = ("ref", "test")
         task = "ref_task"
@@ -258,5 +525,130 @@ class TestDataModule(unittest.TestCase):
     # as it is not required by the module and can cause confusion.
 
 
+class TestItemRecord(unittest.TestCase):
+    def setUp(self):
+        common.item_data = common.DataDict()
+        self.defaults = {
+            common.DescriptionRole: '',
+            common.QueueRole: ('a', 'b'),
+        }
+        self.record = common.ItemRecord({
+            common.PathRole: '/path/to/item.ext',
+            common.IdRole: 0,
+        }, defaults=self.defaults)
+
+    def test_get_and_set(self):
+        self.assertEqual(self.record[common.PathRole], '/path/to/item.ext')
+        self.assertEqual(self.record[common.DescriptionRole], '')
+        self.assertEqual(self.record.get(common.AssetCountRole, 'default'), 'default')
+        with self.assertRaises(KeyError):
+            self.record[common.AssetCountRole]
+
+        self.record[common.DescriptionRole] = 'description'
+        self.assertEqual(self.record[common.DescriptionRole], 'description')
+        self.assertEqual(self.defaults[common.DescriptionRole], '')
+
+        # Roles not stored in the value list
+        self.record[common.AssetCountRole] = 5
+        self.assertEqual(self.record[common.AssetCountRole], 5)
+
+    def test_mapping_interface(self):
+        self.assertIn(common.PathRole, self.record)
+        self.assertIn(common.QueueRole, self.record)
+        self.assertNotIn(common.EntryRole, self.record)
+        self.assertEqual(
+            set(self.record),
+            {common.PathRole, common.IdRole, common.DescriptionRole, common.QueueRole}
+        )
+        self.assertEqual(len(self.record), 4)
+
+        self.record.update({common.IdRole: 1, common.FlagsRole: 0})
+        self.assertEqual(self.record[common.IdRole], 1)
+        self.assertEqual(self.record[common.FlagsRole], 0)
+
+        del self.record[common.FlagsRole]
+        self.assertNotIn(common.FlagsRole, self.record)
+        with self.assertRaises(KeyError):
+            del self.record[common.FlagsRole]
+
+    def test_derived_values(self):
+        calls = []
+
+        def display(record):
+            calls.append(1)
+            return record[common.PathRole].rsplit('/', 1)[-1]
+
+        def tooltip(record):
+            return record[Qt.DisplayRole]
+
+        defaults = {
+            Qt.DisplayRole: common.DerivedValue(display),
+            Qt.ToolTipRole: common.DerivedValue(tooltip, memoize=False),
+        }
+        record = common.ItemRecord({common.PathRole: '/path/to/a.ext'}, defaults=defaults)
+
+        self.assertEqual(record[Qt.DisplayRole], 'a.ext')
+        self.assertEqual(record[Qt.ToolTipRole], 'a.ext')
+        self.assertEqual(record[Qt.DisplayRole], 'a.ext')
+        self.assertEqual(len(calls), 1)
+
+        # Memoized values are reset when the path changes
+        record[common.PathRole] = '/path/to/b.ext'
+        self.assertEqual(record[Qt.DisplayRole], 'b.ext')
+        self.assertEqual(len(calls), 2)
+
+        # Explicitly set values are kept
+        record[Qt.DisplayRole] = 'custom'
+        record[common.PathRole] = '/path/to/c.ext'
+        self.assertEqual(record[Qt.DisplayRole], 'custom')
+        self.assertEqual(record[Qt.ToolTipRole], 'custom')
+
+    def test_peek(self):
+        def display(record):
+            return record[common.PathRole].rsplit('/', 1)[-1]
+
+        def sort_key(record):
+            return record.peek(Qt.DisplayRole).lower()
+
+        defaults = {
+            Qt.DisplayRole: common.DerivedValue(display),
+            common.SortByNameRole: common.DerivedValue(sort_key, memoize=False),
+        }
+        record = common.ItemRecord({common.PathRole: '/path/to/A.ext'}, defaults=defaults)
+
+        # Reading the sort key doesn't materialize the display name
+        self.assertEqual(record[common.SortByNameRole], 'a.ext')
+        self.assertEqual(record.peek(Qt.DisplayRole), 'A.ext')
+        self.assertEqual(record._memo, 0)
+
+        record[Qt.DisplayRole] = 'Custom'
+        self.assertEqual(record[common.SortByNameRole], 'custom')
+
+    def test_weakref_and_identity(self):
+        ref = weakref.ref(self.record)
+        self.assertIs(ref(), self.record)
+
+        other = common.ItemRecord({
+            common.PathRole: '/path/to/item.ext',
+            common.IdRole: 0,
+        }, defaults=self.defaults)
+        self.assertNotEqual(self.record, other)
+        self.assertIsNone(self.record.data_type)
+
+    def test_sort_data(self):
+        d = common.DataDict()
+        d.data_type = common.FileItem
+        for i in range(5):
+            d[i] = common.ItemRecord({
+                common.IdRole: i,
+                common.PathRole: f'/path/to/item_{4 - i}.ext',
+            })
+        common.set_data(('a', 'b'), 'task', common.FileItem, d)
+        ref = common.get_data_ref(('a', 'b'), 'task', common.FileItem)
+        sorted_data = common.sort_data(ref, common.PathRole, False)
+        self.assertEqual(sorted_data[0][common.PathRole], '/path/to/item_0.ext')
+        self.assertEqual(sorted_data[0][common.IdRole], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,224 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from . import common
+from .listing import *
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('')
+
+
+def _bump_mtime(path):
+    # Make sure the directory modification time changes on file systems with
+    # coarse timestamps
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+
+class TestTaskSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp().replace('\\', '/')
+        self.root = f'{self.temp_dir}/task'
+        _touch(f'{self.root}/a.ma')
+        _touch(f'{self.root}/sub/b.ma')
+        _touch(f'{self.root}/sub/deep/c.ma')
+        common.dir_snapshots = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        common.dir_snapshots = {}
+
+    def test_walk_records_directories(self):
+        snapshot = TaskSnapshot(self.root)
+        names = sorted(entry.name for entry in snapshot.walk())
+        self.assertEqual(names, ['a.ma', 'b.ma', 'c.ma'])
+        self.assertEqual(len(snapshot), 3)
+        self.assertIn(f'{self.root}/sub/deep', snapshot.dirs)
+        self.assertEqual(snapshot.dirs[f'{self.root}/sub'].files, frozenset({'b.ma'}))
+
+    def test_walk_interrupt(self):
+        snapshot = TaskSnapshot(self.root)
+        self.assertEqual(list(snapshot.walk(interrupt=lambda: True)), [])
+
+    def test_update_unchanged(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+        added, removed = snapshot.update()
+        self.assertEqual(added, [])
+        self.assertEqual(removed, set())
+
+    def test_update_added_and_removed_files(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+
+        time.sleep(0.01)
+        _touch(f'{self.root}/sub/new.ma')
+        os.remove(f'{self.root}/sub/b.ma')
+        _bump_mtime(f'{self.root}/sub')
+
+        added, removed = snapshot.update()
+        self.assertEqual([entry.name for entry in added], ['new.ma'])
+        self.assertEqual(removed, {f'{self.root}/sub/b.ma'})
+
+    def test_update_added_and_removed_directories(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+
+        shutil.rmtree(f'{self.root}/sub/deep')
+        _touch(f'{self.root}/sub/other/d.ma')
+        _bump_mtime(f'{self.root}/sub')
+
+        added, removed = snapshot.update()
+        self.assertEqual([entry.name for entry in added], ['d.ma'])
+        self.assertEqual(removed, {f'{self.root}/sub/deep/c.ma'})
+        self.assertNotIn(f'{self.root}/sub/deep', snapshot.dirs)
+        self.assertIn(f'{self.root}/sub/other', snapshot.dirs)
+
+    def test_update_copy(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+        dirs = dict(snapshot.dirs)
+
+        _touch(f'{self.root}/sub/new.ma')
+        _bump_mtime(f'{self.root}/sub')
+
+        copy = snapshot.copy()
+        added, removed = copy.update()
+        self.assertEqual([entry.name for entry in added], ['new.ma'])
+        self.assertIn('new.ma', copy.dirs[f'{self.root}/sub'].files)
+        self.assertEqual(snapshot.dirs, dirs)
+        self.assertNotIn('new.ma', snapshot.dirs[f'{self.root}/sub'].files)
+
+    def test_parallel_walk(self):
+        for n in range(20):
+            _touch(f'{self.root}/sub/dir{n}/e{n}.ma')
+
+        expected = TaskSnapshot(self.root)
+        expected_names = sorted(entry.name for entry in expected.walk())
+
+        snapshot = TaskSnapshot(self.root, max_workers=4)
+        names = sorted(entry.name for entry in snapshot.walk())
+        self.assertEqual(names, expected_names)
+        self.assertEqual(set(snapshot.dirs), set(expected.dirs))
+
+    def test_parallel_walk_interrupt(self):
+        snapshot = TaskSnapshot(self.root, max_workers=4)
+        self.assertEqual(list(snapshot.walk(interrupt=lambda: True)), [])
+
+    def test_parallel_update(self):
+        snapshot = TaskSnapshot(self.root, max_workers=4)
+        list(snapshot.walk())
+
+        shutil.rmtree(f'{self.root}/sub/deep')
+        _touch(f'{self.root}/sub/other/d.ma')
+        _bump_mtime(f'{self.root}/sub')
+
+        added, removed = snapshot.update()
+        self.assertEqual([entry.name for entry in added], ['d.ma'])
+        self.assertEqual(removed, {f'{self.root}/sub/deep/c.ma'})
+
+    def test_stat_files(self):
+        with open(f'{self.root}/sub/b.ma', 'w') as f:
+            f.write('data')
+
+        snapshot = TaskSnapshot(self.root, stat_files=True)
+        entries = {entry.name: entry for entry in snapshot.walk()}
+        self.assertIsInstance(entries['b.ma'], CachedEntry)
+        self.assertTrue(entries['b.ma'].has_stat)
+        self.assertEqual(entries['b.ma'].stat().st_size, 4)
+        self.assertEqual(entries['b.ma'].path, f'{self.root}/sub/b.ma')
+
+    def test_parallel_stat_files(self):
+        for n in range(200):
+            _touch(f'{self.root}/frames/f.{n:04d}.exr')
+
+        snapshot = TaskSnapshot(self.root, max_workers=4, stat_files=True)
+        entries = [entry for entry in snapshot.walk() if entry.name.endswith('.exr')]
+        self.assertEqual(len(entries), 200)
+        self.assertTrue(all(isinstance(entry, CachedEntry) and entry.has_stat for entry in entries))
+        self.assertEqual(
+            sorted(entry.name for entry in entries),
+            sorted(entry.name for entry in snapshot.dirs[f'{self.root}/frames'].entries)
+        )
+
+    def test_save_and_load_cache(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+
+        path = f'{self.temp_dir}/cache/listing.cache'
+        save_cache(snapshot, path)
+        self.assertTrue(os.path.isfile(path))
+
+        cached = load_cache(path, self.root)
+        self.assertIsNotNone(cached)
+        self.assertEqual(set(cached.dirs), set(snapshot.dirs))
+        for k, v in snapshot.dirs.items():
+            self.assertEqual(cached.dirs[k].mtime, v.mtime)
+            self.assertEqual(cached.dirs[k].files, v.files)
+            self.assertEqual(cached.dirs[k].dirs, v.dirs)
+
+        entries = {entry.path: entry for entry in cached.entries()}
+        self.assertIn(f'{self.root}/sub/b.ma', entries)
+        entry = entries[f'{self.root}/sub/b.ma']
+        self.assertIsInstance(entry, CachedEntry)
+        self.assertEqual(entry.name, 'b.ma')
+        self.assertEqual(entry.stat().st_size, os.stat(entry.path).st_size)
+
+    def test_load_cache_then_update(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+        path = f'{self.temp_dir}/cache/listing.cache'
+        save_cache(snapshot, path)
+
+        _touch(f'{self.root}/sub/new.ma')
+        _bump_mtime(f'{self.root}/sub')
+
+        cached = load_cache(path, self.root)
+        added, removed = cached.update()
+        self.assertEqual([entry.name for entry in added], ['new.ma'])
+        self.assertEqual(removed, set())
+
+    def test_prune_cache(self):
+        snapshot = TaskSnapshot(self.root)
+        list(snapshot.walk())
+        cache_dir = f'{self.temp_dir}/cache'
+        for name in ('old', 'new', 'newest'):
+            save_cache(snapshot, f'{cache_dir}/{name}.cache')
+        old = time.time() - 60 * 60 * 24 * 365
+        os.utime(f'{cache_dir}/old.cache', (old, old))
+        os.utime(f'{cache_dir}/new.cache', (old + 1, old + 1))
+
+        # Files not saved recently are removed
+        removed = prune_cache(cache_dir, max_age=60 * 60)
+        self.assertEqual(removed, [f'{cache_dir}/old.cache', f'{cache_dir}/new.cache'])
+
+        # Saving prunes the least recently saved files over the size limit
+        save_cache(snapshot, f'{cache_dir}/other.cache')
+        removed = prune_cache(cache_dir, max_size=0, keep=f'{cache_dir}/other.cache')
+        self.assertEqual(removed, [f'{cache_dir}/newest.cache'])
+        self.assertEqual(os.listdir(cache_dir), ['other.cache'])
+
+    def test_load_invalid_cache(self):
+        path = f'{self.temp_dir}/invalid.cache'
+        self.assertIsNone(load_cache(path, self.root))
+        with open(path, 'w') as f:
+            f.write('not a cache')
+        self.assertIsNone(load_cache(path, self.root))
+
+    def test_snapshot_cache(self):
+        snapshot = TaskSnapshot(self.root)
+        set_snapshot(('server', 'job', 'root', 'asset'), 'task', snapshot)
+        self.assertIs(get_snapshot(('server', 'job', 'root', 'asset'), 'task'), snapshot)
+        remove_snapshot(('server', 'job', 'root', 'asset'), 'task')
+        self.assertIsNone(get_snapshot(('server', 'job', 'root', 'asset'), 'task'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,6 +25,7 @@ import weakref
 from queue import Queue
 from unittest.mock import MagicMock
 
+import numpy as np
 from PySide2 import QtCore
 
 from . import common
@@ -461,5 +462,127 @@ class TestSequenceUtilsConcurrent(unittest.TestCase):
                         self.assertNotIn(sequence.SEQPROXY, value)
 
 
+class TestSequenceGrouping(unittest.TestCase):
+    def test_group_sequences_matches_get_sequence(self):
+        path = '/mnt/prod/shot_010/render/v001'
+        names = [
+            'beauty_0001.exr',
+            'beauty_0002.exr',
+            'beauty_0010.exr',
+            'beauty_v002_0001.exr',
+            'beauty_v002_0002.exr',
+            'scene_v01.ma',
+            'notes.txt',
+            'archive_01.tar.gz',
+            '0001.exr',
+            '0002.exr',
+            'image_<<1-2>>.exr',
+            'ünïcode_01.png',
+        ]
+
+        expected = {}
+        for idx, name in enumerate(names):
+            try:
+                seq = sequence.get_sequence(f'{path}/{name}')
+            except RuntimeError:
+                continue
+            if not seq:
+                continue
+            k = f'{seq.group(1)}{sequence.SEQPROXY}{seq.group(3)}.{seq.group(4)}'
+            expected.setdefault(k, ([], []))
+            expected[k][0].append(seq.group(2))
+            expected[k][1].append(idx)
+
+        groups = sequence.group_sequences(path, names)
+        self.assertEqual(set(groups), set(expected))
+        for k, group in groups.items():
+            frames = expected[k][0]
+            self.assertEqual(group.frames.dtype, np.int64)
+            self.assertEqual(group.frames.tolist(), [int(f) for f in frames])
+            self.assertEqual(group.first, min(int(f) for f in frames))
+            self.assertEqual(group.last, max(int(f) for f in frames))
+            self.assertEqual(group.padding, len(min(frames, key=int)))
+            self.assertEqual(group.indexes, expected[k][1])
+            self.assertEqual(
+                f'{group.seq.group(1)}{sequence.SEQPROXY}{group.seq.group(3)}.{group.seq.group(4)}', k
+            )
+            self.assertEqual(
+                list(sequence.FrameSet.from_array(group.frames, group.padding)),
+                list(sequence.FrameSet(frames))
+            )
+
+        self.assertNotIn(f'{path}/notes.txt', groups)
+
+    def test_group_sequences_empty(self):
+        self.assertEqual(sequence.group_sequences('/mnt/prod', []), {})
+
+    def test_frame_set_union(self):
+        a = sequence.FrameSet(['0001', '0002', '0005'])
+        b = sequence.FrameSet.from_array(np.array([3, 7], dtype=np.int64), padding=4)
+        self.assertEqual(a.union(b).range_string(), '0001-0003,0005,0007')
+        self.assertEqual(sequence.FrameSet().union(b), b)
+        self.assertEqual(len(sequence.FrameSet.from_array(np.array([], dtype=np.int64))), 0)
+
+
+
+class TestFrameSet(unittest.TestCase):
+    def test_frames(self):
+        frames = sequence.FrameSet(['0010', '0002', '0001', '0003', '0005'])
+        self.assertEqual(list(frames), ['0001', '0002', '0003', '0005', '0010'])
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(frames.padding, 4)
+        self.assertEqual(frames.first, 1)
+        self.assertEqual(frames.last, 10)
+        self.assertEqual(frames[0], '0001')
+        self.assertEqual(frames[3], '0005')
+        self.assertEqual(frames[-1], '0010')
+        self.assertEqual(frames.ranges(), [(1, 3), (5, 5), (10, 10)])
+        self.assertEqual(frames.range_string(), '0001-0003,0005,0010')
+        self.assertFalse(frames.is_contiguous)
+
+    def test_membership(self):
+        frames = sequence.FrameSet(['1001', '1002', '1003', '1010'])
+        self.assertIn('1002', frames)
+        self.assertIn(1010, frames)
+        self.assertNotIn('1004', frames)
+        self.assertNotIn(1000, frames)
+        self.assertNotIn('abc', frames)
+
+    def test_from_ranges(self):
+        frames = sequence.FrameSet.from_ranges([(5, 8), (1, 3), (4, 4)], padding=3)
+        self.assertEqual(frames.ranges(), [(1, 8)])
+        self.assertEqual(len(frames), 8)
+        self.assertTrue(frames.is_contiguous)
+        self.assertEqual(frames.range_string(), '001-008')
+        self.assertEqual(frames, sequence.FrameSet(range(1, 9), padding=3))
+
+    def test_large_numbers(self):
+        frames = sequence.FrameSet(['100000000000000000000', '99999999999999999999'])
+        self.assertEqual(frames.first, 99999999999999999999)
+        self.assertEqual(frames.range_string(), '99999999999999999999-100000000000000000000')
+
+    def test_empty(self):
+        frames = sequence.FrameSet()
+        self.assertEqual(len(frames), 0)
+        self.assertEqual(list(frames), [])
+        self.assertEqual(frames.range_string(), '')
+        with self.assertRaises(ValueError):
+            _ = frames.first
+
+    def test_get_sequence_paths(self):
+        mock_index = MagicMock(spec=QtCore.QModelIndex)
+        mock_index.data.side_effect = lambda role: {
+            common.PathRole: "C:/path/image_<<010-012>>.png",
+            common.SequenceRole: sequence.GetSequenceRegex.search("C:/path/image_010.png"),
+            common.FramesRole: sequence.FrameSet(["010", "011", "012"])
+        }.get(role, None)
+        paths = sequence.get_sequence_paths(mock_index)
+        self.assertEqual(paths, [
+            "C:/path/image_010.png",
+            "C:/path/image_011.png",
+            "C:/path/image_012.png"
+        ])
+
+
 if __name__ == '__main__':
     unittest.main()
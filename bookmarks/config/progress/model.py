@@ -66,6 +66,7 @@ class BaseTasksModel(QtCore.QAbstractItemModel):
 
     def _connect_signals(self):
         common.signals.databaseValueChanged.connect(functools.partial(self.init_data, force=True))
+        common.signals.databaseValuesChanged.connect(functools.partial(self.init_data, force=True))
 
     def node_from_value(self, task_value):
         node = next((f for f in self.root_node.children if f.value == task_value), None)
@@ -18,7 +18,8 @@ Use :func:`get` to retrieve a cached, thread-specific database controller:
     db = database.get(*common.active('root', args=True))
     height = db.value(db.source(), 'height', database.BookmarkTable)
 
-You can group multiple database changes using the built-in context manager:
+You can group multiple database changes into a single transaction using
+:meth:`BookmarkDB.transaction`:
 
 .. code-block:: python
     :linenos:
@@ -26,16 +27,36 @@ You can group multiple database changes using the built-in context manager:
     from bookmarks import database
 
     db = database.get(*common.active('root', args=True))
-    with db.connection():
+    with db.transaction():
         db.set_value(source, 'description', 'New description', database.AssetTable)
         db.set_value(source, 'width', 1920, database.BookmarkTable)
         db.set_value(source, 'height', 1080, database.BookmarkTable)
 
+The changes are committed together when the block exits, and a single
+``databaseValuesChanged`` signal is emitted instead of a ``databaseValueChanged``
+signal per value. Use :meth:`BookmarkDB.set_values` to set several values of a source.
+
+By default, text and dictionaries are stored base64 encoded. Databases converted
+using :func:`convert_db` to schema version :data:`NativeSchemaVersion` store values
+natively: text as TEXT, numbers as INTEGER or REAL and dictionaries as JSON text that
+can be queried using SQLite's JSON functions. Versions of the app that predate the
+native encoding can't read converted databases, so the conversion is opt-in.
+
+The schema version is read once, when the connection is opened. Make sure no other
+clients have a bookmark database open when converting it.
+
+Connections are configured using a connection profile, see :data:`PROFILES`. The
+profile is set globally in the preferences, or per bookmark by the bookmark's
+``database_profile`` value. The default profile leaves the connection unchanged,
+:data:`AutoProfile` picks the write-ahead log journal for local databases and a
+rollback journal for databases on network shares, where WAL isn't supported.
+
 """
 
 import base64
-import functools
+import contextlib
 import json
+import os
 import sqlite3
 
 from PySide2 import QtCore
@@ -49,15 +70,29 @@ __all__ = [
     'TemplateDataTable',
     'InfoTable',
     'TABLES',
+    'INDEXES',
+    'LegacySchemaVersion',
+    'NativeSchemaVersion',
+    'SCHEMA_VERSION',
+    'DefaultProfile',
+    'AutoProfile',
+    'LocalProfile',
+    'NetworkProfile',
+    'PROFILES',
     'get',
     'remove_db',
     'remove_all_connections',
+    'remove_thread_connections',
+    'convert_db',
     'b64encode',
     'b64decode',
     'sleep',
     'set_flag',
     'load_json',
     'convert_return_values',
+    'encode_value',
+    'is_network_path',
+    'get_profile',
     'BookmarkDB',
 ]
 
@@ -118,6 +153,7 @@ TABLES = {
         'bookmark_display_token': {'sql': 'TEXT', 'type': str},
         'asset_display_token': {'sql': 'TEXT', 'type': str},
         'asset_link_presets': {'sql': 'TEXT', 'type': dict},
+        'database_profile': {'sql': 'TEXT', 'type': str},
     },
     TemplateDataTable: {
         'id': {'sql': 'TEXT PRIMARY KEY COLLATE NOCASE', 'type': str},
@@ -126,6 +162,57 @@ TABLES = {
 }
 
 
+#: Indexed columns, used to query items by flag or property, see :meth:`BookmarkDB.get_ids_with_flag`
+INDEXES = {
+    AssetTable: ('flags', 'sg_id'),
+}
+
+#: Text and dictionaries are stored base64 encoded
+LegacySchemaVersion = 0
+#: Values are stored natively, dictionaries as JSON text
+NativeSchemaVersion = 1
+#: The schema version of new databases, stored as the database's ``user_version``.
+#: Databases are converted to :data:`NativeSchemaVersion` explicitly, see :func:`convert_db`
+SCHEMA_VERSION = LegacySchemaVersion
+
+#: Leaves the connection's journal mode and pragmas unchanged
+DefaultProfile = 'default'
+#: Picks :data:`LocalProfile` or :data:`NetworkProfile` based on the database's location
+AutoProfile = 'auto'
+#: Write-ahead log journal for databases on local disks
+LocalProfile = 'local'
+#: Rollback journal for databases on network shares
+NetworkProfile = 'network'
+
+#: The pragmas set by each connection profile, in the order they're set
+PROFILES = {
+    DefaultProfile: {},
+    AutoProfile: {},
+    LocalProfile: {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 268435456,
+    },
+    NetworkProfile: {
+        'busy_timeout': 10000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+    },
+}
+
+#: The maximum number of values bound to a query, see :meth:`BookmarkDB.get_rows_by_source`
+MAX_SQL_VARIABLES = 500
+
+#: File system types of network shares, as listed in /proc/mounts
+NETWORK_FILE_SYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', 'ncpfs', '9p', 'fuse.sshfs', 'ceph', 'glusterfs'
+}
+
+
 def get(server, job, root, force=False):
     """
     Retrieve an SQLite database controller for a specific bookmark.
@@ -193,7 +280,51 @@ def remove_all_connections():
     common.db_connections = {}
 
 
-@functools.lru_cache(maxsize=4194304)
+def remove_thread_connections(token):
+    """
+    Close and delete the cached database controllers of an exited thread.
+
+    Args:
+        token (int): The thread's token, see :func:`~bookmarks.common.core.get_thread_token`.
+    """
+    suffix = f'@{token}'
+    for k in list(common.db_connections):
+        if not k.endswith(suffix):
+            continue
+
+        try:
+            common.db_connections[k].close()
+            common.db_connections[k].deleteLater()
+            del common.db_connections[k]
+        except Exception:
+            log.error(__name__, 'Error removing the database.')
+
+
+def convert_db(server, job, root):
+    """
+    Convert a bookmark database to the native column encoding.
+
+    The cached controllers of the bookmark are removed, so they reconnect using
+    the new encoding. Older versions of the app can't read converted databases, and
+    open connections don't pick up the new encoding, so make sure all clients are
+    updated and no other client has the database open before converting.
+
+    Args:
+        server (str): Server path segment.
+        job (str): Job path segment.
+        root (str): Root path segment.
+
+    Returns:
+        bool: True if the database was converted, False otherwise.
+    """
+    db = get(server, job, root)
+    if not db.convert():
+        return False
+    remove_db(server, job, root)
+    return True
+
+
+@common.bounded_cache
 def b64encode(v):
     """
     Encode a string using Base64.
@@ -207,7 +338,7 @@ def b64encode(v):
     return base64.b64encode(v.encode('utf-8')).decode('utf-8')
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def b64decode(v):
     """
     Decode a Base64-encoded string.
@@ -253,6 +384,65 @@ def set_flag(server, job, root, k, mode, flag):
     db.set_value(k, 'flags', f, AssetTable)
 
 
+def is_network_path(path):
+    """
+    Check if a path is on a network share.
+
+    Paths that can't be checked on the current platform are considered to be on a
+    network share.
+
+    Args:
+        path (str): The path to check.
+
+    Returns:
+        bool: True if the path is on a network share, False otherwise.
+    """
+    path = path.replace('\\', '/')
+    if path.startswith('//'):
+        return True
+
+    if common.get_platform() == common.PlatformWindows:
+        import ctypes
+        drive = os.path.splitdrive(path)[0]
+        if not drive:
+            return True
+        # DRIVE_REMOTE
+        return ctypes.windll.kernel32.GetDriveTypeW(f'{drive}/') == 4
+
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return True
+
+    path = os.path.abspath(path)
+    fs_type = None
+    mount_point = ''
+    for _mount_point, _fs_type in mounts:
+        _mount_point = _mount_point.replace('\\040', ' ')
+        if path != _mount_point and not path.startswith(_mount_point.rstrip('/') + '/'):
+            continue
+        if len(_mount_point) >= len(mount_point):
+            mount_point = _mount_point
+            fs_type = _fs_type
+    return fs_type is None or fs_type in NETWORK_FILE_SYSTEMS
+
+
+def get_profile():
+    """
+    Get the connection profile set in the preferences.
+
+    Returns:
+        str: One of the profiles in :data:`PROFILES`.
+    """
+    if not hasattr(common.settings, 'value'):
+        return DefaultProfile
+    v = common.settings.value('settings/database_profile')
+    if not isinstance(v, str) or v.lower() not in PROFILES:
+        return DefaultProfile
+    return v.lower()
+
+
 def _verify_args(source, key, table, value=None):
     """
     Validate arguments for database operations.
@@ -294,7 +484,7 @@ def _verify_args(source, key, table, value=None):
                 raise TypeError(f'Value "{value}" is not of type {TABLES[table][k]["type"]}.')
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def load_json(value):
     """
     Load a JSON object from a Base64-encoded string.
@@ -320,7 +510,7 @@ def load_json(value):
         return {}
 
 
-def convert_return_values(table, key, value):
+def convert_return_values(table, key, value, native=False):
     """
     Convert database return values to their proper Python types based on the table schema.
 
@@ -328,6 +518,7 @@ def convert_return_values(table, key, value):
         table (str): The name of the database table.
         key (str): The column name.
         value (object): The value retrieved from the database.
+        native (bool): True if the value is natively encoded, False if it's base64 encoded.
 
     Returns:
         object: The value converted to the appropriate Python type.
@@ -342,11 +533,16 @@ def convert_return_values(table, key, value):
 
     if _type is dict:
         try:
-            value = load_json(value)
+            if native:
+                value = json.loads(value, parse_int=int, parse_float=float, object_hook=common.int_key)
+            else:
+                value = load_json(value)
         except Exception as e:
             log.debug(__name__, e)
             value = None
     elif _type is str:
+        if native:
+            return value if isinstance(value, str) else str(value)
         try:
             value = b64decode(value.encode('utf-8'))
         except Exception:
@@ -368,6 +564,46 @@ def convert_return_values(table, key, value):
     return value
 
 
+def encode_value(table, key, value, native=False):
+    """
+    Convert a value to the representation stored in the database.
+
+    Args:
+        table (str): The name of the database table.
+        key (str): The column name.
+        value (object): The value to store.
+        native (bool): True to encode the value natively, False to base64 encode text.
+
+    Returns:
+        object: The value to store.
+
+    Raises:
+        RuntimeError: If a BLOB column is incorrectly configured.
+    """
+    if isinstance(value, dict):
+        try:
+            value = json.dumps(value, ensure_ascii=False)
+            if not native:
+                value = b64encode(value)
+        except Exception as e:
+            log.error(__name__, e)
+            value = None
+    elif isinstance(value, str):
+        if not native:
+            value = b64encode(value)
+    elif isinstance(value, (float, int)):
+        if not native:
+            try:
+                value = str(value)
+            except Exception as e:
+                log.error(__name__, e)
+                value = None
+    elif isinstance(value, bytes):
+        if TABLES[table][key]['type'] == bytes and TABLES[table][key]['sql'] != 'BLOB':
+            raise RuntimeError(f'Error in the database schema. Binary {key} should be associated with BLOB.')
+    return value
+
+
 class BookmarkDB(QtCore.QObject):
     """
     A database controller for a single bookmark, backed by an SQLite database.
@@ -399,6 +635,11 @@ class BookmarkDB(QtCore.QObject):
         self._is_memory = False
         self._connection = None
         self._version = None
+        self._profile = None
+        self._journal_mode = None
+        self._schema_version = SCHEMA_VERSION
+        self._transaction_depth = 0
+        self._changes = []
 
         self.server = server
         self.job = job
@@ -414,6 +655,7 @@ class BookmarkDB(QtCore.QObject):
             self.connect_to_db(memory=False)
 
         self.init_tables()
+        self.apply_profile()
         self._connect_signals()
 
     def _connect_signals(self):
@@ -425,9 +667,11 @@ class BookmarkDB(QtCore.QObject):
         """
 
         def _init():
+            self._init_schema_version(new=True)
             for table in TABLES:
                 self._create_table(table)
                 self._patch_table(table)
+                self._create_indexes(table)
             self._init_version()
             self._connection.commit()
 
@@ -475,6 +719,205 @@ class BookmarkDB(QtCore.QObject):
             self._is_valid = False
             self._is_memory = True
 
+    def apply_profile(self, profile=None):
+        """
+        Set the pragmas of the given connection profile.
+
+        The journal mode is stored in the database file and applies to all
+        connections, so it's only changed when no other controller has the database
+        open, see :meth:`is_shared`. Databases on network shares never use WAL, as
+        it needs shared memory, whatever the profile.
+
+        Args:
+            profile (str): One of the profiles in :data:`PROFILES`. When not set,
+                the bookmark's ``database_profile`` value is used, or when that's
+                not set either, the profile set in the preferences.
+
+        Returns:
+            str: The journal mode in use.
+        """
+        if profile is None and self.is_valid():
+            profile = self.value(self.source(), 'database_profile', BookmarkTable)
+        if not profile:
+            profile = get_profile()
+        profile = profile.lower()
+        if profile not in PROFILES:
+            log.warning(__name__, f'Unknown database profile "{profile}", using "{DefaultProfile}".')
+            profile = DefaultProfile
+
+        if profile == AutoProfile:
+            profile = NetworkProfile if is_network_path(self._database_path) else LocalProfile
+
+        if not self._is_memory:
+            pragmas = dict(PROFILES[profile])
+            current = self._get_journal_mode()
+            v = pragmas.get('journal_mode', current or '')
+            if v.lower() == 'wal' and is_network_path(self._database_path):
+                log.warning(__name__, f'{self._database_path} is on a network share, not using WAL.')
+                pragmas['journal_mode'] = 'DELETE'
+            if 'journal_mode' in pragmas and (
+                    pragmas['journal_mode'].lower() == current or self.is_shared()
+            ):
+                del pragmas['journal_mode']
+
+            for k, v in pragmas.items():
+                try:
+                    res = self._connection.execute(f'PRAGMA {k}={v};').fetchone()
+                except sqlite3.Error as e:
+                    log.warning(__name__, f'Could not set "{k}" to "{v}":\n{e}')
+                    continue
+                if k == 'journal_mode' and res and res[0].lower() != v.lower():
+                    # The journal mode can't be changed, for example, when the
+                    # file system doesn't support WAL
+                    log.warning(__name__, f'Could not set the journal mode to "{v}", using "{res[0]}".')
+
+        self._profile = profile
+        self._journal_mode = self._get_journal_mode()
+
+        log.debug(
+            __name__,
+            f'{self._database_path} uses the "{self._profile}" profile, journal mode "{self._journal_mode}"'
+        )
+        return self._journal_mode
+
+    def _get_journal_mode(self):
+        try:
+            return self._connection.execute('PRAGMA journal_mode;').fetchone()[0].lower()
+        except sqlite3.Error as e:
+            log.error(__name__, e)
+            return None
+
+    def is_shared(self):
+        """
+        Check if other controllers have the database open.
+
+        Returns:
+            bool: True if another cached controller is connected to the database.
+        """
+        key = f'{self._bookmark}@'
+        for k, db in list(common.db_connections.items()):
+            if db is self or not k.startswith(key):
+                continue
+            if db._connection is not None and not db._is_memory:
+                return True
+        return False
+
+    def profile(self):
+        """
+        Return the connection profile in use.
+
+        Returns:
+            str: One of the profiles in :data:`PROFILES`.
+        """
+        return self._profile
+
+    def journal_mode(self):
+        """
+        Return the journal mode in use, for example, ``wal`` or ``delete``.
+
+        Returns:
+            str: The journal mode.
+        """
+        return self._journal_mode
+
+    def _init_schema_version(self, new=False):
+        """
+        Read the schema version of the database.
+
+        Args:
+            new (bool): If True, and the database has no tables, sets the version to :data:`SCHEMA_VERSION`.
+        """
+        attempt = 0
+        while attempt <= self.retries:
+            try:
+                if new:
+                    res = self._connection.execute("SELECT count(*) FROM sqlite_master WHERE type='table';")
+                    if not res.fetchone()[0]:
+                        self._connection.execute(f'PRAGMA user_version={SCHEMA_VERSION};')
+                self._schema_version = self._connection.execute('PRAGMA user_version;').fetchone()[0]
+                return
+            except sqlite3.OperationalError as e:
+                if 'database is locked' not in str(e):
+                    raise
+                attempt += 1
+                log.debug(__name__, f'Database is locked during schema check, retrying {attempt}/{self.retries}...')
+                sleep(attempt=attempt)
+        raise sqlite3.OperationalError('Failed to check the schema version due to database lock.')
+
+    def _convert_return_values(self, table, key, value):
+        """
+        Convert a value read from the database using the database's encoding.
+
+        Args:
+            table (str): The name of the database table.
+            key (str): The column name.
+            value (object): The value retrieved from the database.
+
+        Returns:
+            object: The value converted to the appropriate Python type.
+        """
+        return convert_return_values(table, key, value, native=self.is_native())
+
+    def schema_version(self):
+        """
+        Return the schema version of the database.
+
+        Returns:
+            int: :data:`LegacySchemaVersion` or :data:`NativeSchemaVersion`.
+        """
+        return self._schema_version
+
+    def is_native(self):
+        """
+        Check if the database stores values natively.
+
+        Returns:
+            bool: True if values are stored natively, False if text is base64 encoded.
+        """
+        return self._schema_version >= NativeSchemaVersion
+
+    def convert(self):
+        """
+        Convert the values of a legacy database to the native encoding.
+
+        The values are converted in a single transaction, and the schema version is
+        set to :data:`NativeSchemaVersion`. See :func:`convert_db`.
+
+        Returns:
+            bool: True if the database was converted, False if it's already native or invalid.
+        """
+        if not self.is_valid() or self.is_native():
+            return False
+
+        try:
+            self._connection.execute('BEGIN IMMEDIATE;')
+            for table in TABLES:
+                columns = [k for k, v in TABLES[table].items() if k != 'id' and v['type'] is not bytes]
+                if not columns:
+                    continue
+                sql = f'UPDATE {table} SET {", ".join(f"{k}=?" for k in columns)} WHERE id=?'
+
+                rows = self._connection.execute(f'SELECT id, {", ".join(columns)} FROM {table}').fetchall()
+                for row in rows:
+                    values = []
+                    for idx, k in enumerate(columns, start=1):
+                        v = convert_return_values(table, k, row[idx], native=False)
+                        values.append(encode_value(table, k, v, native=True) if v is not None else None)
+                    self._connection.execute(sql, values + [row[0]])
+            self._connection.execute(f'PRAGMA user_version={NativeSchemaVersion};')
+            self._connection.execute('COMMIT;')
+        except sqlite3.Error as e:
+            log.error(__name__, f'Failed to convert the database:\n{e}')
+            try:
+                self._connection.execute('ROLLBACK;')
+            except sqlite3.Error:
+                pass
+            return False
+
+        self._schema_version = NativeSchemaVersion
+        log.info(__name__, f'Converted {self._database_path} to schema version {NativeSchemaVersion}')
+        return True
+
     def _init_version(self):
         """
         Retrieve the SQLite version and store it internally for later reference.
@@ -556,6 +999,23 @@ class BookmarkDB(QtCore.QObject):
         sql = f'CREATE UNIQUE INDEX IF NOT EXISTS {table}_id_idx ON {table} (id)'
         self._connection.execute(sql)
 
+    def _create_indexes(self, table):
+        """
+        Create the indexes of a table defined in :data:`INDEXES`.
+
+        Indexes that can't be created, for example, because the database is locked, are
+        created the next time the database is connected to.
+
+        Args:
+            table (str): The table name.
+        """
+        for column in INDEXES.get(table, ()):
+            sql = f'CREATE INDEX IF NOT EXISTS {table}_{column}_idx ON {table} ({column})'
+            try:
+                self._connection.execute(sql)
+            except sqlite3.OperationalError as e:
+                log.debug(__name__, f'Could not create the "{column}" index:\n{e}')
+
     def _patch_table(self, table):
         """
         Add missing columns to a database table.
@@ -626,13 +1086,93 @@ class BookmarkDB(QtCore.QObject):
         """
         Return the active database connection instance.
 
-        This can be used as a context manager for transaction handling.
+        The connection is in autocommit mode, use :meth:`transaction` to group changes.
 
         Returns:
             sqlite3.Connection: The active database connection.
         """
         return self._connection
 
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Group database changes into a single transaction.
+
+        The changes are committed when the outermost block exits, or rolled back if
+        the block raises an exception. Nested blocks are part of the outermost
+        transaction, but use a savepoint, so an exception raised in a nested block
+        only rolls back the changes made in that block.
+
+        :meth:`set_value` calls made inside the block don't emit
+        ``databaseValueChanged``. Instead, ``databaseValuesChanged`` is emitted once
+        after the commit with the list of ``(table, source, key, value)`` changes.
+
+        Yields:
+            BookmarkDB: The database controller.
+        """
+        if self._transaction_depth:
+            name = f'savepoint_{self._transaction_depth}'
+            if self._query(f'SAVEPOINT {name};') is None:
+                name = None
+            n = len(self._changes)
+
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                del self._changes[n:]
+                if name:
+                    self._rollback(name)
+                raise
+            finally:
+                self._transaction_depth -= 1
+
+            if name:
+                self._query(f'RELEASE {name};')
+            return
+
+        # Changes are written one by one if the transaction can't be started
+        if not self.is_valid() or self._query('BEGIN IMMEDIATE;') is None:
+            yield self
+            return
+
+        self._transaction_depth = 1
+        self._changes = []
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth = 0
+            self._changes = []
+            self._rollback()
+            raise
+
+        self._transaction_depth = 0
+        changes = self._changes
+        self._changes = []
+
+        if self._query('COMMIT;') is None:
+            log.error(__name__, 'Failed to commit the transaction, rolling back.')
+            self._rollback()
+            return
+
+        if not changes:
+            return
+        common.signals.databaseValuesChanged.emit(changes)
+        if any(v[0] == BookmarkTable and v[2] == 'database_profile' for v in changes):
+            self.apply_profile()
+
+    def _rollback(self, savepoint=None):
+        try:
+            if not self._connection.in_transaction:
+                return
+            if savepoint:
+                self._connection.execute(f'ROLLBACK TO {savepoint};')
+                self._connection.execute(f'RELEASE {savepoint};')
+            else:
+                self._connection.execute('ROLLBACK;')
+        except sqlite3.Error as e:
+            log.error(__name__, e)
+
     def is_valid(self):
         """
         Check if the database connection is valid.
@@ -700,7 +1240,7 @@ class BookmarkDB(QtCore.QObject):
             return
 
         for row in res:
-            yield convert_return_values(table, column, row[0])
+            yield self._convert_return_values(table, column, row[0])
 
     def get_row(self, source, table):
         """
@@ -748,7 +1288,7 @@ class BookmarkDB(QtCore.QObject):
         for idx, key in enumerate(columns):
             if key == 'id':
                 continue
-            values[key] = convert_return_values(table, key, row[idx])
+            values[key] = self._convert_return_values(table, key, row[idx])
         return values
 
     def delete_row(self, source, table):
@@ -805,9 +1345,186 @@ class BookmarkDB(QtCore.QObject):
             for idx, column in enumerate(columns):
                 if column == 'id':
                     continue
-                data[column] = convert_return_values(table, column, row[idx])
+                data[column] = self._convert_return_values(table, column, row[idx])
             yield data
 
+    def get_rows_by_source(self, sources, table):
+        """
+        Retrieve the rows of many sources at once.
+
+        The rows are fetched using as few queries as possible, see :data:`MAX_SQL_VARIABLES`.
+
+        Args:
+            sources (iterable): The source path identifiers.
+            table (str): The table name.
+
+        Returns:
+            dict: Source to row mapping. Rows are dictionaries of column-value pairs, like
+            the ones returned by :meth:`get_row`. Returns an empty dictionary if the rows
+            couldn't be retrieved.
+
+        Raises:
+            ValueError: If the table name is not defined in :data:`TABLES`.
+        """
+        if table not in TABLES:
+            raise ValueError(f'Table "{table}" not found in TABLES.')
+
+        if not self.is_valid():
+            return {}
+
+        columns = [k for k in TABLES[table] if k != 'id']
+        rows = {}
+        hashes = {}
+        for source in sources:
+            if source in rows:
+                continue
+            rows[source] = dict.fromkeys(columns)
+            # The id column is case-insensitive
+            hashes.setdefault(common.get_hash(source).lower(), []).append(source)
+
+        ids = list(hashes)
+        for idx in range(0, len(ids), MAX_SQL_VARIABLES):
+            chunk = ids[idx:idx + MAX_SQL_VARIABLES]
+            sql = f'SELECT * FROM {table} WHERE id IN ({", ".join("?" * len(chunk))})'
+
+            attempt = 0
+            while attempt <= self.retries:
+                try:
+                    res = self._connection.execute(sql, chunk)
+                    values = res.fetchall()
+                    self._is_valid = True
+                    break
+                except sqlite3.OperationalError as e:
+                    if 'database is locked' in str(e):
+                        attempt += 1
+                        log.debug(__name__, f'Database is locked, retrying {attempt}/{self.retries}...')
+                        sleep(attempt=attempt)
+                        continue
+                    self._is_valid = False
+                    log.error(__name__, e)
+                    return {}
+                except sqlite3.Error as e:
+                    self._is_valid = False
+                    log.error(__name__, e)
+                    return {}
+            else:
+                log.error(__name__, 'Failed to retrieve rows after multiple retries due to database lock.')
+                return {}
+
+            _columns = [f[0] for f in res.description]
+            for row in values:
+                data = {}
+                for _idx, column in enumerate(_columns):
+                    if column == 'id':
+                        continue
+                    data[column] = self._convert_return_values(table, column, row[_idx])
+                for source in hashes.get(row[_columns.index('id')].lower(), ()):
+                    rows[source] = dict(data)
+
+        return rows
+
+    def _query(self, sql, params=()):
+        """
+        Execute a query, retrying while the database is locked.
+
+        Args:
+            sql (str): The query.
+            params (tuple): The query parameters.
+
+        Returns:
+            list: The result rows, or None if the query failed.
+        """
+        attempt = 0
+        while attempt <= self.retries:
+            try:
+                rows = self._connection.execute(sql, params).fetchall()
+                self._is_valid = True
+                return rows
+            except sqlite3.OperationalError as e:
+                if 'database is locked' in str(e):
+                    attempt += 1
+                    log.debug(__name__, f'Database is locked, retrying {attempt}/{self.retries}...')
+                    sleep(attempt=attempt)
+                    continue
+                self._is_valid = False
+                log.error(__name__, e)
+                return None
+            except sqlite3.Error as e:
+                self._is_valid = False
+                log.error(__name__, e)
+                return None
+        log.error(__name__, 'Failed to execute the query after multiple retries due to database lock.')
+        return None
+
+    def get_flags(self, table=AssetTable):
+        """
+        Retrieve the flags of all rows that have flags set.
+
+        Args:
+            table (str): The table name.
+
+        Returns:
+            dict: Row id to flags mapping. Row ids are the hashes of the sources, see
+            :func:`~bookmarks.common.get_hash`.
+        """
+        if table not in TABLES or 'flags' not in TABLES[table]:
+            raise ValueError(f'Table "{table}" has no flags.')
+        if not self.is_valid():
+            return {}
+
+        # flags > 0 lets SQLite use the flags index and skip rows without flags
+        rows = self._query(f'SELECT id, flags FROM {table} WHERE flags > 0')
+        return {row[0]: int(row[1]) for row in rows} if rows else {}
+
+    def get_ids_with_flag(self, flag, table=AssetTable):
+        """
+        Retrieve the ids of the rows that have the given flag set.
+
+        Args:
+            flag (int): A flag, for example, ``common.MarkedAsArchived``.
+            table (str): The table name.
+
+        Returns:
+            set: Row ids. Row ids are the hashes of the sources, see
+            :func:`~bookmarks.common.get_hash`.
+        """
+        if table not in TABLES or 'flags' not in TABLES[table]:
+            raise ValueError(f'Table "{table}" has no flags.')
+        if not self.is_valid():
+            return set()
+
+        rows = self._query(f'SELECT id FROM {table} WHERE flags > 0 AND (flags & ?) != 0', (int(flag),))
+        return {row[0] for row in rows} if rows else set()
+
+    def get_ids_by_value(self, key, value, table):
+        """
+        Retrieve the ids of the rows where a column matches the given value.
+
+        Args:
+            key (str): The column name.
+            value (object): The value to match.
+            table (str): The table name.
+
+        Returns:
+            set: Row ids. Row ids are the hashes of the sources, see
+            :func:`~bookmarks.common.get_hash`.
+
+        Raises:
+            ValueError: If the table or key is invalid.
+            TypeError: If the value type does not match the schema.
+        """
+        if table not in TABLES:
+            raise ValueError(f'Table "{table}" not found in TABLES.')
+        _verify_args('', key, table, value=value)
+        if TABLES[table][key]['type'] in (dict, bytes):
+            raise TypeError(f'"{key}" values can\'t be matched.')
+        if not self.is_valid():
+            return set()
+
+        value = encode_value(table, key, value, native=self.is_native())
+        rows = self._query(f'SELECT id FROM {table} WHERE {key} = ?', (value,))
+        return {row[0] for row in rows} if rows else set()
+
     @common.debug
     def value(self, source, key, table):
         """
@@ -860,7 +1577,7 @@ class BookmarkDB(QtCore.QObject):
         else:
             log.error(__name__, 'Failed to retrieve value after multiple retries due to database lock.')
 
-        return convert_return_values(table, key, value)
+        return self._convert_return_values(table, key, value)
 
     @common.debug
     def set_value(self, source, key, value, table):
@@ -886,24 +1603,7 @@ class BookmarkDB(QtCore.QObject):
         if table not in TABLES:
             raise ValueError(f'Table "{table}" not found in TABLES.')
 
-        if isinstance(value, dict):
-            try:
-                value = json.dumps(value, ensure_ascii=False)
-                value = b64encode(value)
-            except Exception as e:
-                log.error(__name__, e)
-                value = None
-        elif isinstance(value, str):
-            value = b64encode(value)
-        elif isinstance(value, (float, int)):
-            try:
-                value = str(value)
-            except Exception as e:
-                log.error(__name__, e)
-                value = None
-        elif isinstance(value, bytes):
-            if TABLES[table][key]['type'] == bytes and TABLES[table][key]['sql'] != 'BLOB':
-                raise RuntimeError(f'Error in the database schema. Binary {key} should be associated with BLOB.')
+        value = encode_value(table, key, value, native=self.is_native())
 
         _hash = common.get_hash(source)
 
@@ -941,8 +1641,14 @@ class BookmarkDB(QtCore.QObject):
             try:
                 self._connection.execute(sql, params)
                 self._is_valid = True
+                if self._transaction_depth:
+                    _value = convert_return_values(table, key, value, native=self.is_native())
+                    self._changes.append((table, source, key, _value))
+                    break
                 _value = self.value(source, key, table=table)
                 common.signals.databaseValueChanged.emit(table, source, key, _value)
+                if key == 'database_profile' and table == BookmarkTable:
+                    self.apply_profile()
                 break
             except sqlite3.OperationalError as e:
                 if 'database is locked' in str(e):
@@ -960,3 +1666,20 @@ class BookmarkDB(QtCore.QObject):
                 break
         else:
             log.error(__name__, 'Failed to set value after multiple retries due to database lock.')
+
+    def set_values(self, source, values, table):
+        """
+        Set multiple values of a source in a single transaction.
+
+        Args:
+            source (str): The source path identifier.
+            values (dict): A dictionary of database column names and values.
+            table (str): The table name.
+
+        Raises:
+            ValueError: If the table or a key is invalid.
+            TypeError: If a value type does not match the schema.
+        """
+        with self.transaction():
+            for k, v in values.items():
+                self.set_value(source, k, v, table)
@@ -7,6 +7,7 @@ import tempfile
 import threading
 import time
 import unittest
+from unittest import mock
 from concurrent.futures import ThreadPoolExecutor
 
 from .lib import *
@@ -165,7 +166,8 @@ class TestBookmarkDB(unittest.TestCase):
         original_create_bookmark_dir = BookmarkDB._create_bookmark_dir
         BookmarkDB._create_bookmark_dir = lambda self: False
 
-        db = get(self.server, self.job, self.root)
+        # The controller cached in setUp must be replaced
+        db = get(self.server, self.job, self.root, force=True)
         self.assertFalse(db.is_valid())
 
         # Restore the original method
@@ -311,12 +313,86 @@ class TestBookmarkDB(unittest.TestCase):
         value = self.db.value(source, 'description', AssetTable)
         self.assertEqual(value, 'Within context')
 
+    def test_transaction(self):
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        batches = []
+        values = []
+        common.signals.databaseValuesChanged.connect(batches.append)
+        common.signals.databaseValueChanged.connect(lambda *args: values.append(args))
+
+        with self.db.transaction():
+            with self.db.transaction():
+                self.db.set_value(source, 'description', 'In transaction', AssetTable)
+            self.db.set_value(source, 'cut_in', 1001, AssetTable)
+            self.assertTrue(self.db.connection().in_transaction)
+            self.assertEqual(batches, [])
+
+        self.assertFalse(self.db.connection().in_transaction)
+        self.assertEqual(values, [])
+        self.assertEqual(
+            batches,
+            [[
+                (AssetTable, source, 'description', 'In transaction'),
+                (AssetTable, source, 'cut_in', 1001),
+            ]]
+        )
+
+        db = get(self.server, self.job, self.root, force=True)
+        self.assertEqual(db.value(source, 'description', AssetTable), 'In transaction')
+        self.assertEqual(db.value(source, 'cut_in', AssetTable), 1001)
+
+    def test_transaction_rollback(self):
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        self.db.set_value(source, 'description', 'Before', AssetTable)
+
+        batches = []
+        common.signals.databaseValuesChanged.connect(batches.append)
+
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.set_value(source, 'description', 'After', AssetTable)
+                raise RuntimeError('Rollback')
+
+        self.assertFalse(self.db.connection().in_transaction)
+        self.assertEqual(batches, [])
+        self.assertEqual(self.db.value(source, 'description', AssetTable), 'Before')
+
+    def test_transaction_nested_rollback(self):
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        batches = []
+        common.signals.databaseValuesChanged.connect(batches.append)
+
+        with self.db.transaction():
+            self.db.set_value(source, 'description', 'Outer', AssetTable)
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.db.set_value(source, 'cut_in', 1001, AssetTable)
+                    raise RuntimeError('Rollback')
+            self.assertTrue(self.db.connection().in_transaction)
+
+        # Only the nested block's changes are rolled back
+        self.assertEqual(batches, [[(AssetTable, source, 'description', 'Outer')]])
+        self.assertEqual(self.db.value(source, 'description', AssetTable), 'Outer')
+        self.assertIsNone(self.db.value(source, 'cut_in', AssetTable))
+
+    def test_set_values(self):
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        values = {k: n for n, k in enumerate(('cut_in', 'cut_out', 'edit_in', 'edit_out'))}
+        self.db.set_values(source, values, AssetTable)
+        for k, v in values.items():
+            self.assertEqual(self.db.value(source, k, AssetTable), v)
+
+        with self.assertRaises(ValueError):
+            self.db.set_values(source, {'cut_in': 1, 'invalid_key': 2}, AssetTable)
+        self.assertEqual(self.db.value(source, 'cut_in', AssetTable), 0)
+
     def test_database_locking(self):
         source = os.path.join(self.server, self.job, self.root, 'test_source')
 
         def lock_database():
-            # Begin an exclusive transaction to lock the database
-            cursor = self.db.connection().cursor()
+            # Controllers are cached per thread, so the thread locks the database
+            # using its own connection
+            cursor = get(self.server, self.job, self.root).connection().cursor()
             cursor.execute('BEGIN EXCLUSIVE TRANSACTION')
             time.sleep(1)  # Hold the lock for 1 second
             cursor.execute('COMMIT')
@@ -371,6 +447,181 @@ class TestBookmarkDB(unittest.TestCase):
         result = convert_return_values(BookmarkTable, 'config_tasks', invalid_encoded)
         self.assertIsNone(result)
 
+    def test_get_rows_by_source(self):
+        sources = [os.path.join(self.server, self.job, self.root, f'item_{i}') for i in range(1200)]
+        for i, source in enumerate(sources[:600]):
+            self.db.set_value(source, 'flags', i, AssetTable)
+
+        rows = self.db.get_rows_by_source(sources, AssetTable)
+        self.assertEqual(len(rows), len(sources))
+        for i, source in enumerate(sources):
+            self.assertEqual(rows[source], self.db.get_row(source, AssetTable))
+            self.assertEqual(rows[source]['flags'], i if i < 600 else None)
+
+    def test_get_ids_with_flag(self):
+        sources = [os.path.join(self.server, self.job, self.root, f'item_{i}') for i in range(4)]
+        self.db.set_value(sources[0], 'flags', common.MarkedAsArchived, AssetTable)
+        self.db.set_value(sources[1], 'flags', common.MarkedAsArchived | common.MarkedAsFavourite, AssetTable)
+        self.db.set_value(sources[2], 'flags', common.MarkedAsFavourite, AssetTable)
+        self.db.set_value(sources[3], 'description', 'No flags', AssetTable)
+
+        self.assertEqual(
+            self.db.get_ids_with_flag(common.MarkedAsArchived),
+            {common.get_hash(f) for f in sources[0:2]}
+        )
+        self.assertEqual(
+            self.db.get_flags(),
+            {
+                common.get_hash(sources[0]): common.MarkedAsArchived,
+                common.get_hash(sources[1]): common.MarkedAsArchived | common.MarkedAsFavourite,
+                common.get_hash(sources[2]): common.MarkedAsFavourite,
+            }
+        )
+
+        res = self.db.connection().execute(
+            f'EXPLAIN QUERY PLAN SELECT id FROM {AssetTable} WHERE flags > 0 AND (flags & ?) != 0',
+            (common.MarkedAsArchived,)
+        )
+        self.assertIn(f'{AssetTable}_flags_idx', ' '.join(str(f) for f in res.fetchall()))
+
+    def test_get_ids_by_value(self):
+        source1 = os.path.join(self.server, self.job, self.root, 'item_1')
+        source2 = os.path.join(self.server, self.job, self.root, 'item_2')
+        self.db.set_value(source1, 'sg_id', 123, AssetTable)
+        self.db.set_value(source1, 'sg_name', 'sh0010', AssetTable)
+        self.db.set_value(source2, 'sg_name', 'sh0020', AssetTable)
+
+        self.assertEqual(self.db.get_ids_by_value('sg_id', 123, AssetTable), {common.get_hash(source1)})
+        self.assertEqual(self.db.get_ids_by_value('sg_name', 'sh0020', AssetTable), {common.get_hash(source2)})
+        self.assertEqual(self.db.get_ids_by_value('sg_name', 'sh0030', AssetTable), set())
+        with self.assertRaises(TypeError):
+            self.db.get_ids_by_value('notes', {}, AssetTable)
+
+    def test_new_database_encoding(self):
+        # New databases use the legacy encoding until converted
+        self.assertFalse(self.db.is_native())
+        self.assertEqual(self.db.schema_version(), SCHEMA_VERSION)
+        self.assertEqual(SCHEMA_VERSION, LegacySchemaVersion)
+
+    def test_native_encoding(self):
+        self.assertTrue(convert_db(self.server, self.job, self.root))
+        self.db = get(self.server, self.job, self.root)
+        self.assertTrue(self.db.is_native())
+        self.assertEqual(self.db.schema_version(), NativeSchemaVersion)
+
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        self.db.set_value(source, 'description', 'Native description', AssetTable)
+        self.db.set_value(source, 'notes', {0: {'text': 'note'}}, AssetTable)
+        self.db.set_value(source, 'flags', 3, AssetTable)
+
+        res = self.db.connection().execute(
+            f'SELECT description, json_extract(notes, \'$."0".text\'), typeof(flags) FROM {AssetTable} WHERE id=?',
+            (common.get_hash(source),)
+        )
+        self.assertEqual(res.fetchone(), ('Native description', 'note', 'integer'))
+        self.assertEqual(self.db.value(source, 'notes', AssetTable), {0: {'text': 'note'}})
+
+    def test_convert_legacy_database(self):
+        db = self.db
+        self.assertFalse(db.is_native())
+
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        values = {
+            'description': 'Legacy description',
+            'notes': {'note1': 'This is a note'},
+            'flags': 123,
+            'asset_framerate': 24.0,
+        }
+        for k, v in values.items():
+            db.set_value(source, k, v, AssetTable)
+
+        res = db.connection().execute(f'SELECT description FROM {AssetTable} WHERE id=?', (common.get_hash(source),))
+        self.assertEqual(res.fetchone()[0], b64encode('Legacy description'))
+
+        self.assertTrue(convert_db(self.server, self.job, self.root))
+        db = get(self.server, self.job, self.root)
+        self.assertTrue(db.is_native())
+        self.assertFalse(db.convert())
+
+        for k, v in values.items():
+            self.assertEqual(db.value(source, k, AssetTable), v)
+
+        res = db.connection().execute(f'SELECT description FROM {AssetTable} WHERE id=?', (common.get_hash(source),))
+        self.assertEqual(res.fetchone()[0], 'Legacy description')
+
+    def test_schema_version_read_on_connect(self):
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        self.db.set_value(source, 'notes', {'note1': 'This is a note'}, AssetTable)
+
+        other = BookmarkDB(self.server, self.job, self.root)
+        self.assertTrue(other.convert())
+        other.close()
+
+        # Open connections keep the encoding read when they were opened
+        self.assertFalse(self.db.is_native())
+
+        db = get(self.server, self.job, self.root, force=True)
+        self.assertTrue(db.is_native())
+        self.assertEqual(db.value(source, 'notes', AssetTable), {'note1': 'This is a note'})
+
+    def test_default_profile(self):
+        self.assertEqual(self.db.profile(), DefaultProfile)
+        self.assertEqual(self.db.journal_mode(), 'delete')
+
+    def test_local_and_network_profiles(self):
+        self.assertEqual(self.db.apply_profile(LocalProfile), 'wal')
+        self.assertEqual(self.db.profile(), LocalProfile)
+
+        self.assertEqual(self.db.apply_profile(NetworkProfile), 'delete')
+        self.assertEqual(self.db.profile(), NetworkProfile)
+
+    def test_auto_profile(self):
+        self.db.apply_profile(AutoProfile)
+        if is_network_path(self.server):
+            self.assertEqual(self.db.profile(), NetworkProfile)
+        else:
+            self.assertEqual(self.db.profile(), LocalProfile)
+            self.assertEqual(self.db.journal_mode(), 'wal')
+
+    def test_bookmark_profile(self):
+        self.db.set_value(self.db.source(), 'database_profile', LocalProfile, BookmarkTable)
+        self.assertEqual(self.db.profile(), LocalProfile)
+
+        db = get(self.server, self.job, self.root, force=True)
+        self.assertEqual(db.profile(), LocalProfile)
+        self.assertEqual(db.journal_mode(), 'wal')
+
+        source = os.path.join(self.server, self.job, self.root, 'test_source')
+        db.set_value(source, 'description', 'wal description', AssetTable)
+        self.assertEqual(db.value(source, 'description', AssetTable), 'wal description')
+
+    def test_network_path_refuses_wal(self):
+        patch = mock.patch(f'{BookmarkDB.__module__}.is_network_path', return_value=True)
+
+        # WAL is switched off on network shares, whatever the profile
+        self.assertEqual(self.db.apply_profile(LocalProfile), 'wal')
+        with patch:
+            self.assertEqual(self.db.apply_profile(DefaultProfile), 'delete')
+
+        self.assertEqual(self.db.apply_profile(LocalProfile), 'wal')
+        with patch:
+            self.assertEqual(self.db.apply_profile(LocalProfile), 'delete')
+
+    def test_shared_database_keeps_journal_mode(self):
+        other = BookmarkDB(self.server, self.job, self.root)
+        try:
+            # self.db is cached, so the journal mode can't be changed
+            self.assertTrue(other.is_shared())
+            self.assertEqual(other.apply_profile(LocalProfile), 'delete')
+            self.assertEqual(other.profile(), LocalProfile)
+        finally:
+            other.close()
+        self.assertEqual(self.db.apply_profile(LocalProfile), 'wal')
+
+    def test_is_network_path(self):
+        self.assertTrue(is_network_path('//server/share/job'))
+        self.assertTrue(is_network_path('\\\\server\\share\\job'))
+
 
 class TestInvalidDatabaseHandling(unittest.TestCase):
     """
@@ -302,6 +302,7 @@ class BasePropertyEditor(QtWidgets.QDialog):
         )
 
         common.signals.databaseValueChanged.connect(self.update_changed_database_value)
+        common.signals.databaseValuesChanged.connect(self.update_changed_database_values)
 
         common.signals.bookmarkItemActivated.connect(self.close)
         common.signals.assetItemActivated.connect(self.close)
@@ -746,7 +747,7 @@ class BasePropertyEditor(QtWidgets.QDialog):
             return
 
         db = database.get(self.server, self.job, self.root)
-        with db.connection():
+        with db.transaction():
             for k, v in self.changed_data.copy().items():
                 db.set_value(
                     self.db_source(),
@@ -912,6 +913,18 @@ class BasePropertyEditor(QtWidgets.QDialog):
                 editor.setCurrentText(value)
                 editor.currentTextChanged.emit(value)
 
+    @QtCore.Slot(list)
+    def update_changed_database_values(self, changes):
+        """Slot responsible updating the widget when the values of a database
+        transaction have changed.
+
+        Args:
+            changes (list): A list of (table, source, key, value) tuples.
+
+        """
+        for args in changes:
+            self.update_changed_database_value(*args)
+
     @QtCore.Slot()
     def url1_button_clicked(self):
         """Url1 button action.
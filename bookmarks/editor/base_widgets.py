@@ -8,6 +8,7 @@ from PySide2 import QtCore, QtGui, QtWidgets
 
 from .. import common
 from .. import contextmenu
+from .. import database
 from .. import images
 from .. import log
 from .. import ui
@@ -174,6 +175,31 @@ class SGAssetTypesWidget(BaseComboBox):
             self.addItem(entity_type)
 
 
+class DatabaseProfileComboBox(QtWidgets.QComboBox):
+    """Bookmark database connection profile picker.
+
+    See :data:`bookmarks.database.PROFILES`.
+
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setView(QtWidgets.QListView())
+        self.init_items()
+
+    def init_items(self):
+        """Initialize items.
+
+        """
+        for profile in database.PROFILES:
+            self.addItem(profile)
+            self.setItemData(
+                self.count() - 1,
+                QtCore.QSize(1, HEIGHT),
+                role=QtCore.Qt.SizeHintRole
+            )
+
+
 class ThumbnailContextMenu(contextmenu.BaseContextMenu):
     """Context menu associated with the :class:`ThumbnailEditorWidget`.
 
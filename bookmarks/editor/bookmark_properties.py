@@ -157,6 +157,19 @@ class BookmarkPropertyEditor(base.BasePropertyEditor):
                         'description': 'Specify the token used to display asset items',
                     },
                 },
+                5: {
+                    0: {
+                        'name': 'Database mode',
+                        'key': 'database_profile',
+                        'validator': None,
+                        'widget': base_widgets.DatabaseProfileComboBox,
+                        'placeholder': '',
+                        'description': 'The connection profile of the bookmark\'s database. '
+                                       'When not set, the profile set in the preferences is used.\n\n'
+                                       'Use \'network\' if the bookmark is on a network share '
+                                       'that doesn\'t support a write-ahead log.',
+                    },
+                },
             }
         },
         1: {
@@ -7,9 +7,12 @@ import importlib
 from PySide2 import QtWidgets, QtCore, QtGui
 
 from . import base
+from . import base_widgets
 from .. import actions
 from .. import common
 from .. import ui
+from ..threads import threads
+from ..threads import thumbnails
 
 
 def close():
@@ -149,6 +152,88 @@ class PreferenceEditor(base.BasePropertyEditor):
                                 'contents of the scene folder (instead of the last '
                                 'selected folder) when the active asset changes.',
                     },
+                    1: {
+                        'name': 'Folder scan threads',
+                        'key': 'settings/scan_threads',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{common.DEFAULT_SCAN_THREADS}',
+                        'description': 'The number of folders to list at the same time',
+                        'help': 'Task folders on network shares load faster when '
+                                'more folders are listed at the same time. Set to 1 '
+                                'to list folders one by one.',
+                    },
+                    2: {
+                        'name': 'Item info threads',
+                        'key': 'settings/info_threads',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{threads.DEFAULT_INFO_THREADS}',
+                        'description': 'The number of items to load information for at the same time',
+                        'help': 'Descriptions, flags and file sizes load faster on network '
+                                'shares when more items are loaded at the same time. Set '
+                                'to 1 to load items one by one.',
+                    },
+                    3: {
+                        'name': 'Prefetched rows',
+                        'key': 'settings/prefetch_rows',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{threads.DEFAULT_PREFETCH_ROWS}',
+                        'description': 'The number of rows to load above and below the visible rows',
+                        'help': 'Thumbnails and information of the rows just outside '
+                                'the visible area are loaded after the visible rows, so '
+                                'they are ready when scrolling. Set to 0 to only load '
+                                'the visible rows.',
+                    },
+                    4: {
+                        'name': 'Thumbnail processes',
+                        'key': 'settings/thumbnail_processes',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{thumbnails.DEFAULT_THUMBNAIL_PROCESSES}',
+                        'description': 'The number of processes used to generate thumbnails',
+                        'help': 'Thumbnails of image files are generated in separate '
+                                'processes, so they use all processor cores and a '
+                                'broken image can\'t crash the application. Set to 0 '
+                                'to generate thumbnails in the application\'s own process.',
+                    },
+                    5: {
+                        'name': 'Cache size (MB)',
+                        'key': 'settings/cache_budget',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{common.DEFAULT_CACHE_BUDGET // 1024 // 1024}',
+                        'description': 'The memory used to cache path and database values',
+                        'help': 'Path and database values are cached to make browsing '
+                                'faster. The cache is cleared when the active bookmark '
+                                'item or job changes.',
+                    },
+                    6: {
+                        'name': 'Item data size (MB)',
+                        'key': 'settings/data_budget',
+                        'validator': base.int_validator,
+                        'widget': ui.LineEdit,
+                        'placeholder': f'{common.DEFAULT_DATA_BUDGET // 1024 // 1024}',
+                        'description': 'The memory used to keep previously visited items loaded',
+                        'help': 'Items of previously visited bookmarks, assets and task '
+                                'folders are kept in memory so they load faster when shown '
+                                'again. The least recently visited items are released when '
+                                'the limit is reached.',
+                    },
+                    7: {
+                        'name': 'Database mode',
+                        'key': 'settings/database_profile',
+                        'validator': None,
+                        'widget': base_widgets.DatabaseProfileComboBox,
+                        'placeholder': '',
+                        'description': 'The connection profile used by bookmark databases',
+                        'help': '\'auto\' uses a write-ahead log on local disks, and a '
+                                'rollback journal on network shares, so artists reading '
+                                'a bookmark aren\'t blocked by others writing to it. '
+                                '\'default\' leaves the database connections unchanged. '
+                                'Bookmarks can override this in their properties.',
+                    },
                 },
             },
         },
@@ -669,15 +669,14 @@ class FFMpegWidget(base.BasePropertyEditor):
         index = self._index
         seq = index.data(common.SequenceRole)
 
-        # The sequence element of the sequence members as padded strings
-        frames = index.data(common.FramesRole)
-        frames_it = (f for f in frames)
+        # The sequence element of the sequence members
+        frames = common.FrameSet(index.data(common.FramesRole))
 
         # The full sequence of frame numbers
-        all_frames = [str(f).zfill(len(frames[0])) for f in range(int(frames[0]), int(frames[-1]) + 1)]
+        all_frames = range(frames.first, frames.last + 1)
 
         # FFMpeg can't handle missing frames, so we'll check for them and fill in the gaps
-        has_missing_frames = len(all_frames) != len(frames)
+        has_missing_frames = not frames.is_contiguous
 
         # Set up the temp directory
         temp_dir = QtCore.QDir(f'{common.temp_path()}/ffmpeg')
@@ -715,10 +714,10 @@ class FFMpegWidget(base.BasePropertyEditor):
             return [f'{seq.group(1)}{f}{seq.group(3)}.{seq.group(4)}' for f in frames]
 
         # Otherwise, build a full sequence filling in any missing frames with the closest available frame
-        source_frame = all_frames[0]
+        source_frame = frames.format(frames.first)
         for idx, frame in enumerate(all_frames):
             if frame in frames:
-                source_frame = next(frames_it)
+                source_frame = frames.format(frame)
 
             source_path = f'{seq.group(1)}{source_frame}{seq.group(3)}.{seq.group(4)}'
             source_images.append(source_path)
@@ -744,7 +743,7 @@ class FFMpegWidget(base.BasePropertyEditor):
             QtWidgets.QApplication.instance().processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
 
             error = bookmarks_openimageio.convert_sequence(
-                f'{seq.group(1)}%0{len(frames[0])}d{seq.group(3)}.{seq.group(4)}',
+                f'{seq.group(1)}%0{frames.padding}d{seq.group(3)}.{seq.group(4)}',
                 f'{temp_dir.path()}/ffmpeg.{preconversion_format}',
                 source_color_space,
                 target_color_space,
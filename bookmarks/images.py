@@ -318,7 +318,7 @@ def create_thumbnail_from_image(server, job, root, source, image, proxy=False):
     ImageCache.flush(thumbnail_path)
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_cached_thumbnail_path(server, job, root, source, proxy=False):
     """Returns the path to a cached thumbnail file.
 
@@ -342,7 +342,7 @@ def get_cached_thumbnail_path(server, job, root, source, proxy=False):
     return f'{server}/{job}/{root}/{common.bookmark_item_data_dir}/thumbnails/{name}'
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_placeholder_path(file_path, fallback):
     """Returns an image path used to represent an item.
 
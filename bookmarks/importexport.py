@@ -311,7 +311,7 @@ def import_item_properties(index, source=None, prompt=True):
 
     db = database.get(*index.data(common.ParentPathRole)[0:3])
     source = index.data(common.PathRole)
-    with db.connection():
+    with db.transaction():
         for k, v in bookmark_table_data.items():
             db.set_value(source, k, v, database.BookmarkTable)
         for k, v in asset_table_data.items():
@@ -390,7 +390,7 @@ def import_json_asset_properties(indexes, prompt=True, path=None):
             QtWidgets.QApplication.instance().processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
 
             # Set valid database values
-            with db.connection():
+            with db.transaction():
                 for k, v in data[item].items():
                     if k not in database.TABLES[database.AssetTable]:
                         continue
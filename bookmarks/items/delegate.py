@@ -1249,7 +1249,7 @@ class BookmarkItemViewDelegate(ItemDelegate):
         # Set the database value
         db = database.get(*source_path[0:3])
         v = editor.text().strip() if editor.text() else ''
-        with db.connection():
+        with db.transaction():
             db.set_value(k, 'description', common.sanitize_hashtags(v), database.AssetTable)
             bookmark_row_data = db.get_row(db.source(), database.BookmarkTable)
 
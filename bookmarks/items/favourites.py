@@ -256,6 +256,13 @@ class FavouriteItemModel(files.FileItemModel):
 
         self.set_refresh_needed(False)
 
+    def can_scan_data(self):
+        """Favourites are not loaded from a task folder and can't be scanned in the
+        background.
+
+        """
+        return False
+
     def parent_path(self):
         """The path of the source file.
 
@@ -36,7 +36,10 @@ See the :mod:`~bookmarks.common.sequence` module for details on sequence definit
 
 """
 import functools
+import itertools
 import os
+import sys
+import uuid
 import weakref
 
 from PySide2 import QtWidgets, QtCore
@@ -80,7 +83,7 @@ def _add_path_to_mime(mime, path):
     return mime
 
 
-@functools.lru_cache(maxsize=4194304)
+@common.bounded_cache
 def get_sequence_elements(filepath):
     """Cache-backed utility function to retrieve the sequence elements from the given file path.
 
@@ -113,6 +116,33 @@ def get_sequence_elements(filepath):
     return seq, sequence_path
 
 
+def _display_name(prefix, record):
+    path = record[common.PathRole]
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return path.rsplit('/', 1)[-1]
+
+
+def _file_name(record):
+    return record[common.PathRole].rsplit('/', 1)[-1]
+
+
+# The sort and filter keys are read for every item, so they're computed from
+# the record's raw values and aren't memoized
+def _filter_text(record):
+    if record[common.DataTypeRole] == common.SequenceItem:
+        return record.peek(QtCore.Qt.DisplayRole)
+    return f'{record.peek(QtCore.Qt.DisplayRole)}\n{record.peek(QtCore.Qt.EditRole)}'
+
+
+def _sort_by_name(prefix, record):
+    return prefix + [record.peek(QtCore.Qt.DisplayRole).lower()]
+
+
+def _display_role(record):
+    return record[QtCore.Qt.DisplayRole]
+
+
 class FileItemViewContextMenu(contextmenu.BaseContextMenu):
     """Context menu associated with :class:`FileItemView`.
 
@@ -194,9 +224,19 @@ class FileItemModel(models.ItemModel):
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
+
+        self._scan_id = None
+        self._scan_context = None
+        self._scan_sequences = None
+
         self.dataTypeChanged.connect(self.set_data_type)
         self.dataTypeChanged.connect(common.signals.updateTopBarButtons)
 
+        worker = threads.get_thread(threads.FileScan).worker
+        worker.entriesReady.connect(self.scan_entries_ready, QtCore.Qt.QueuedConnection)
+        worker.scanFinished.connect(self.scan_finished, QtCore.Qt.QueuedConnection)
+        worker.snapshotUpdated.connect(self.scan_validated, QtCore.Qt.QueuedConnection)
+
     def refresh_needed(self):
         """Returns the refresh states of the current model data set.
 
@@ -232,306 +272,403 @@ class FileItemModel(models.ItemModel):
             data.refresh_needed = v
 
     def item_generator(self, path):
-        """Recursive iterator for retrieving files from all task subfolders."""
-        try:
-            with os.scandir(path) as it:
-                for entry in it:
-                    if self._interrupt_requested:
-                        return
-                    if entry.is_file():
-                        yield entry
-                    elif entry.is_dir(follow_symlinks=False):
-                        yield from self.item_generator(entry.path)
-        except OSError as e:
-            log.error(__name__, f"Error scanning {path}: {e}")
+        """Recursive iterator for retrieving files from all task subfolders.
 
-    @common.status_bar_message('Loading Files...')
-    @models.initdata
-    @common.error
-    @common.debug
-    def init_data(self):
-        """Collects file data for both individual files and sequences."""
+        Each visited directory is recorded in the task folder's
+        :class:`~bookmarks.common.listing.TaskSnapshot`, used by :meth:`update_data`
+        to re-scan only the directories that changed.
+
+        """
         p = self.parent_path()
         k = self.task()
-        t = common.FileItem
 
-        if not p or not all(p) or not k or t is None:
-            return
+        snapshot = common.TaskSnapshot(path, max_workers=common.get_scan_threads())
+        common.set_snapshot(p, k, snapshot)
 
-        # Initialize data structures
-        data = common.get_data(p, k, t)
-        sequence_data = common.DataDict()  # Temporary dictionary for sequence data
+        yield from snapshot.walk(interrupt=lambda: self._interrupt_requested)
+
+    def _get_load_context(self):
+        """Returns the values shared by all items loaded from the current task folder.
+
+        Returns:
+            dict: The load context, or `None` if the model has no valid task folder.
+
+        """
+        p = self.parent_path()
+        k = self.task()
+
+        if not p or not all(p) or not k:
+            return None
 
-        # Prepare source path as absolute and normalized path
         source_path = common.normalize_path('/'.join(p + (k,)))
         if not os.path.exists(source_path):
-            return
-
-        # Initialize variables
-        watcher = common.get_watcher(common.FileTab)
-        watcher.reset()
-        watch_paths = {source_path,}
-        favourites = common.favourites
-        disable_filter = self.disable_filter()
+            return None
 
-        # Get valid extensions
         config = tokens.get(*p[0:3])
         valid_extensions = (
             config.get_task_extensions(k) if config.check_task(k) else config.get_extensions(tokens.AllFormat)
         )
 
-        # Cache commonly used values
-        parent_path_prefix = tuple(p + (k,))
-        row_size = self.row_size
-        queues = self.queues
+        sort_prefix = [name.lower() for name in p[:8]]
+        source_prefix = f'{source_path}/'
+
+        return {
+            'p': p,
+            'k': k,
+            'source_path': source_path,
+            'source_prefix': source_prefix,
+            'parent_path_prefix': tuple(p + (k,)),
+            'parent_paths': {},
+            'favourites': common.favourites,
+            'disable_filter': self.disable_filter(),
+            'valid_extensions': valid_extensions,
+            # Values shared by all item records. The name roles are derived from
+            # the item's path when first read
+            'defaults': {
+                QtCore.Qt.DisplayRole: common.DerivedValue(
+                    functools.partial(_display_name, source_prefix)
+                ),
+                QtCore.Qt.EditRole: common.DerivedValue(_file_name),
+                common.FilterTextRole: common.DerivedValue(_filter_text, memoize=False),
+                common.SortByNameRole: common.DerivedValue(
+                    functools.partial(_sort_by_name, sort_prefix), memoize=False
+                ),
+                QtCore.Qt.StatusTipRole: common.DerivedValue(_display_role, memoize=False),
+                QtCore.Qt.AccessibleDescriptionRole: common.DerivedValue(_display_role, memoize=False),
+                QtCore.Qt.WhatsThisRole: common.DerivedValue(_display_role, memoize=False),
+                QtCore.Qt.ToolTipRole: common.DerivedValue(_display_role, memoize=False),
+                QtCore.Qt.SizeHintRole: self.row_size,
+                common.QueueRole: self.queues,
+                common.ItemTabRole: common.FileTab,
+                common.DescriptionRole: '',
+                common.NoteCountRole: 0,
+                common.FileDetailsRole: '',
+                common.SequenceRole: None,
+                common.FramesRole: (),
+                common.StartPathRole: None,
+                common.EndPathRole: None,
+                common.FileInfoLoaded: False,
+                common.ThumbnailLoaded: False,
+                common.SortByLastModifiedRole: 0,
+                common.SortBySizeRole: 0,
+                common.SGLinkedRole: False,
+            },
+        }
 
-        # Progress bar variables
-        nth = 987
-        c = 0
+    @staticmethod
+    def _relative_path(ctx, path):
+        """Returns the given path relative to the task folder.
 
-        # Iterate over files using optimized item_generator
-        for entry in self.item_generator(source_path):
-            if self._interrupt_requested:
-                break
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            path (str): A normalized path.
 
-            # Early filtering
-            if not entry.is_file():
-                continue
+        Returns:
+            str: The relative path, or `None` if the path is outside the task folder.
 
-            filename = entry.name
+        """
+        prefix = ctx['source_prefix']
+        if path.startswith(prefix):
+            return path[len(prefix):]
 
-            # Skip hidden and system files
-            if filename.startswith('.') or filename.lower() == 'thumbs.db':
-                continue
+        log.error(
+            __name__,
+            f'{path} is outside the source path {ctx["source_path"]}. Verify if this is intentional.'
+        )
+        return None
 
-            # Get file extension
-            ext = os.path.splitext(filename)[1][1:].lower()
-            if not ext:
-                continue
+    @staticmethod
+    def _parent_path(ctx, relative_path):
+        """Returns the parent path of an item.
 
-            # Filter by valid extensions
-            if not disable_filter and ext not in valid_extensions:
-                continue
+        Items in the same directory share the same parent path tuple.
+
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            relative_path (str): The item's path relative to the task folder.
+
+        Returns:
+            tuple: The parent path segments.
+
+        """
+        k = relative_path.rpartition('/')[0]
+        if k not in ctx['parent_paths']:
+            ctx['parent_paths'][k] = ctx['parent_path_prefix'] + tuple(
+                sys.intern(f) for f in (k.split('/') if k else ())
+            )
+        return ctx['parent_paths'][k]
+
+    @staticmethod
+    def _accept_entry(ctx, entry):
+        """Checks if the given file entry should be loaded by the model.
+
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            entry (DirEntry): A file entry.
+
+        Returns:
+            str: The file's extension, or `None` if the file should be skipped.
+
+        """
+        filename = entry.name
+
+        # Skip hidden and system files
+        if filename.startswith('.') or filename.lower() == 'thumbs.db':
+            return None
+
+        ext = os.path.splitext(filename)[1][1:].lower()
+        if not ext:
+            return None
 
-            # Prepare file paths
-            filepath = common.normalize_path(entry.path)
-
-            # Check if filepath is within source_path
-            try:
-                common_path = os.path.commonpath([source_path, filepath]).replace('\\', '/')
-            except ValueError:
-                # Paths are on different drives on Windows
-                common_path = None
-
-            if common_path != source_path:
-                log.error(__name__,
-                    f'File {filepath} is outside the source path {source_path}. Verify if this is intentional.')
-
-            # Compute relative path from task folder to file without relative denominators
-            relative_path = os.path.relpath(filepath, source_path).replace('\\', '/')
-            # Ensure relative_path does not contain '../' or './'
-            if '..' in relative_path or relative_path.startswith('.'):
-                # Path goes outside the source directory; use absolute path or handle accordingly
-                display_path = os.path.basename(filepath)  # Fallback to filename
+        if not ctx['disable_filter'] and ext not in ctx['valid_extensions']:
+            return None
+        return ext
+
+    @staticmethod
+    def _file_item(ctx, entry, ext, data, idx):
+        """Returns the item data of a single file.
+
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            entry (DirEntry): A file entry.
+            ext (str): The file's extension.
+            data (common.DataDict): The data dictionary the item will be added to.
+            idx (int): The item's row.
+
+        Returns:
+            common.ItemRecord: The item data.
+
+        """
+        filepath = common.normalize_path(entry.path)
+
+        # Files outside the task folder are listed using their file name
+        relative_path = FileItemModel._relative_path(ctx, filepath)
+        if relative_path is None:
+            relative_path = entry.name
+
+        flags = models.DEFAULT_ITEM_FLAGS
+        if filepath in ctx['favourites']:
+            flags |= common.MarkedAsFavourite
+
+        record = common.ItemRecord({
+            common.PathRole: filepath,
+            common.DataTypeRole: common.FileItem,
+            common.DataDictRole: weakref.ref(data),
+            common.EntryRole: [entry],
+            common.FlagsRole: flags,
+            common.ParentPathRole: FileItemModel._parent_path(ctx, relative_path),
+            common.SortByTypeRole: sys.intern(ext),
+            common.IdRole: idx,
+        }, defaults=ctx['defaults'])
+
+        # Files stat-ed by the scanner can be sorted before the file info is loaded
+        if isinstance(entry, common.CachedEntry) and entry.has_stat:
+            stat = entry.stat()
+            record[common.SortBySizeRole] = stat.st_size
+            record[common.SortByLastModifiedRole] = stat.st_mtime
+        return record
+
+    @staticmethod
+    def _add_sequence_frames(ctx, sequence_data, entries):
+        """Adds the given file entries to their sequence items in `sequence_data`.
+
+        The entries are grouped by directory, and the sequence components of each
+        directory's files are found in a single pass by :func:`common.group_sequences`.
+
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            sequence_data (common.DataDict): Sequence path to item data mapping.
+            entries (list): A list of file entry and extension pairs.
+
+        """
+        directories = {}
+        for item in entries:
+            k = os.path.dirname(item[0].path)
+            if k not in directories:
+                directories[k] = []
+            directories[k].append(item)
+
+        for path, items in directories.items():
+            path = common.normalize_path(path).rstrip('/')
+            groups = common.group_sequences(path, [entry.name for entry, _ in items])
+
+            for sequence_path, group in groups.items():
+                indexes = group.indexes
+                sequence_path = common.normalize_path(sequence_path)
+
+                if sequence_path not in sequence_data:
+                    relative_path = FileItemModel._relative_path(ctx, sequence_path)
+                    if relative_path is None:
+                        continue
+
+                    seq_flags = models.DEFAULT_ITEM_FLAGS
+                    if sequence_path in ctx['favourites']:
+                        seq_flags |= common.MarkedAsFavourite
+
+                    sequence_data[sequence_path] = common.ItemRecord({
+                        common.PathRole: sequence_path,
+                        common.DataTypeRole: common.SequenceItem,
+                        common.DataDictRole: None,  # Will be set later
+                        common.EntryRole: [],
+                        common.FlagsRole: seq_flags,
+                        common.ParentPathRole: FileItemModel._parent_path(ctx, relative_path),
+                        common.SequenceRole: group.seq,
+                        common.FramesRole: [],
+                        common.SortByTypeRole: sys.intern(items[indexes[0]][1]),
+                        common.IdRole: 0,  # Will be updated later
+                    }, defaults=ctx['defaults'])
+
+                # Add the frames and entries to the sequence data
+                frames = common.FrameSet.from_array(group.frames, padding=group.padding)
+                current = sequence_data[sequence_path][common.FramesRole]
+                if current:
+                    frames = common.FrameSet(current).union(frames)
+                sequence_data[sequence_path][common.FramesRole] = frames
+                sequence_data[sequence_path][common.EntryRole].extend(items[i][0] for i in indexes)
+
+                # The total size and last modification time of files stat-ed by
+                # the scanner
+                size = 0
+                mtime = 0
+                for i in indexes:
+                    entry = items[i][0]
+                    if not isinstance(entry, common.CachedEntry) or not entry.has_stat:
+                        continue
+                    stat = entry.stat()
+                    size += stat.st_size
+                    mtime = max(mtime, stat.st_mtime)
+                if size or mtime:
+                    seq_data = sequence_data[sequence_path]
+                    seq_data[common.SortBySizeRole] += size
+                    seq_data[common.SortByLastModifiedRole] = max(
+                        seq_data[common.SortByLastModifiedRole], mtime
+                    )
+
+    @staticmethod
+    def _finalize_sequence_item(ctx, seq_data, sequence_items, idx):
+        """Finalizes a sequence item collected by :meth:`_add_sequence_frames`.
+
+        Sequences with a single frame are converted to individual file items.
+
+        Args:
+            ctx (dict): The load context returned by :meth:`_get_load_context`.
+            seq_data (common.DataDict): The sequence's item data.
+            sequence_items (common.DataDict): The data dictionary the item will be added to.
+            idx (int): The item's row.
+
+        Returns:
+            common.ItemRecord: The item data.
+
+        """
+        frames = seq_data.get(common.FramesRole, [])
+
+        # The name roles of sequences with multiple frames are derived from the
+        # sequence's path and don't need updating
+        if len(frames) == 1:
+            # Sequence with a single frame; treat as individual file
+            _seq = seq_data[common.SequenceRole]
+            if _seq and len(_seq.groups()) >= 4:
+                frame = frames[0]
+                filepath = common.normalize_path(f"{_seq.group(1)}{frame}{_seq.group(3)}.{_seq.group(4)}")
+
+                seq_data.update({
+                    common.PathRole: filepath,
+                    common.DataTypeRole: common.FileItem,
+                    common.FlagsRole: models.DEFAULT_ITEM_FLAGS | (
+                        common.MarkedAsFavourite if filepath in ctx['favourites'] else 0
+                    ),
+                    common.SequenceRole: None,
+                    common.FramesRole: [],
+                })
             else:
-                display_path = relative_path
+                # Invalid sequence; treat as individual file
+                seq_data[common.DataTypeRole] = common.FileItem
+        elif frames:
+            seq_data[common.FramesRole] = common.FrameSet(frames)
+
+        seq_data[common.DataDictRole] = weakref.ref(sequence_items)
+        seq_data[common.IdRole] = idx
+        return seq_data
+
+    @common.status_bar_message('Loading Files...')
+    @models.initdata
+    @common.error
+    @common.debug
+    def init_data(self, snapshot=None):
+        """Collects file data for both individual files and sequences.
+
+        Args:
+            snapshot (common.TaskSnapshot): Optional snapshot of the task folder. When
+                set, the files are loaded from the snapshot instead of the file system.
+
+        """
+        ctx = self._get_load_context()
+        if not ctx:
+            return
+
+        p = ctx['p']
+        k = ctx['k']
+        source_path = ctx['source_path']
+
+        # Initialize data structures
+        data = common.get_data(p, k, common.FileItem)
+        sequence_data = common.DataDict()  # Temporary dictionary for sequence data
+
+        # Initialize variables
+        watcher = common.get_watcher(common.FileTab)
+        watcher.reset()
+        watch_paths = {source_path, }
+
+        # Progress bar variables
+        nth = 987
+        c = 0
 
-            file_root = os.path.splitext(filename)[0]
-            sort_by_name_role = [name.lower() for name in p[:8]] + [display_path.lower()]
+        if snapshot:
+            common.set_snapshot(p, k, snapshot)
+            entries = snapshot.entries()
+        else:
+            entries = self.item_generator(source_path)
+
+        # Files waiting to be added to their sequences
+        pending = []
+
+        for entry in entries:
+            if self._interrupt_requested:
+                break
+
+            ext = self._accept_entry(ctx, entry)
+            if not ext:
+                continue
 
             # Update progress bar
             c += 1
             if c % nth == 0:
+                self._add_sequence_frames(ctx, sequence_data, pending)
+                pending = []
+
                 common.signals.showStatusBarMessage.emit(f'Loading files (found {c} items)...')
                 QtWidgets.QApplication.instance().processEvents(
                     QtCore.QEventLoop.ExcludeUserInputEvents
                 )
 
-            # Set flags
-            flags = models.DEFAULT_ITEM_FLAGS
-            if filepath in favourites:
-                flags |= common.MarkedAsFavourite
-
             # Add file to data (FileItem model) regardless of sequence
             idx = len(data)
             if idx >= common.max_list_items:
                 break  # Limit the number of items loaded
 
-            file_data_dict = common.DataDict({
-                QtCore.Qt.DisplayRole: display_path,
-                common.FilterTextRole: f"{display_path}\n{filename}",
-                QtCore.Qt.EditRole: filename,
-                common.PathRole: filepath,
-                QtCore.Qt.SizeHintRole: row_size,
-                QtCore.Qt.StatusTipRole: display_path,
-                QtCore.Qt.AccessibleDescriptionRole: display_path,
-                QtCore.Qt.WhatsThisRole: display_path,
-                QtCore.Qt.ToolTipRole: display_path,
-                common.QueueRole: queues,
-                common.DataTypeRole: common.FileItem,
-                common.DataDictRole: weakref.ref(data),
-                common.ItemTabRole: common.FileTab,
-                common.EntryRole: [entry],
-                common.FlagsRole: flags,
-                common.ParentPathRole: parent_path_prefix + tuple(relative_path.split('/')[:-1]),
-                common.DescriptionRole: '',
-                common.NoteCountRole: 0,
-                common.FileDetailsRole: '',
-                common.SequenceRole: None,
-                common.FramesRole: [],
-                common.StartPathRole: None,
-                common.EndPathRole: None,
-                common.FileInfoLoaded: False,
-                common.ThumbnailLoaded: False,
-                common.SortByNameRole: sort_by_name_role,
-                common.SortByLastModifiedRole: 0,
-                common.SortBySizeRole: 0,
-                common.SortByTypeRole: ext,
-                common.IdRole: idx,
-                common.SGLinkedRole: False,
-            })
-
-            # Add file to data (FileItem model)
-            data[idx] = file_data_dict
-
-            # Get sequence information
-            seq_match = get_sequence_elements(filepath)  # Use the full filepath here
-            seq = None  # Initialize seq
-            if seq_match and len(seq_match) == 2:
-                seq, sequence_path = seq_match
-                if seq and sequence_path:
-                    # Now proceed with sequence processing
-                    sequence_path = common.normalize_path(sequence_path)
-
-                    # Check if sequence_path is within source_path
-                    try:
-                        seq_common_path = os.path.commonpath([source_path, sequence_path]).replace('\\', '/')
-                    except ValueError:
-                        seq_common_path = None
-
-                    if seq_common_path != source_path:
-                        log.error(__name__,
-                            f'Sequence {sequence_path} is outside the source path {source_path}. Verify if this is intentional.')
-                        seq = None  # Treat as an individual file
-                    else:
-                        # Compute the relative path for the sequence
-                        sequence_relative_path = os.path.relpath(sequence_path, source_path).replace('\\', '/')
-                        if '..' in sequence_relative_path or sequence_relative_path.startswith('.'):
-                            sequence_name = os.path.basename(sequence_path)
-                        else:
-                            sequence_name = sequence_relative_path
-
-                        sort_by_name_role_seq = [name.lower() for name in p[:8]] + [sequence_name.lower()]
-
-                        # Initialize sequence data if not already present
-                        if sequence_path not in sequence_data:
-                            seq_flags = models.DEFAULT_ITEM_FLAGS
-                            if sequence_path in favourites:
-                                seq_flags |= common.MarkedAsFavourite
-
-                            sequence_data[sequence_path] = common.DataDict({
-                                QtCore.Qt.DisplayRole: sequence_name,
-                                common.FilterTextRole: sequence_name,
-                                QtCore.Qt.EditRole: os.path.basename(sequence_path),
-                                common.PathRole: sequence_path,
-                                QtCore.Qt.SizeHintRole: row_size,
-                                QtCore.Qt.StatusTipRole: sequence_name,
-                                QtCore.Qt.AccessibleDescriptionRole: sequence_name,
-                                QtCore.Qt.WhatsThisRole: sequence_name,
-                                QtCore.Qt.ToolTipRole: sequence_name,
-                                common.QueueRole: queues,
-                                common.DataTypeRole: common.SequenceItem,
-                                common.DataDictRole: None,  # Will be set later
-                                common.ItemTabRole: common.FileTab,
-                                common.EntryRole: [],
-                                common.FlagsRole: seq_flags,
-                                common.ParentPathRole: parent_path_prefix + tuple(
-                                    sequence_relative_path.split('/')[:-1]),
-                                common.DescriptionRole: '',
-                                common.NoteCountRole: 0,
-                                common.FileDetailsRole: '',
-                                common.SequenceRole: seq,
-                                common.FramesRole: [],
-                                common.StartPathRole: None,
-                                common.EndPathRole: None,
-                                common.FileInfoLoaded: False,
-                                common.ThumbnailLoaded: False,
-                                common.SortByNameRole: sort_by_name_role_seq,
-                                common.SortByLastModifiedRole: 0,
-                                common.SortBySizeRole: 0,
-                                common.SortByTypeRole: ext,
-                                common.IdRole: 0,  # Will be updated later
-                                common.SGLinkedRole: False,
-                            })
-
-                        # Append frame and entry to sequence data
-                        sequence_data[sequence_path][common.FramesRole].append(seq.group(2))
-                        sequence_data[sequence_path][common.EntryRole].append(entry)
-                else:
-                    seq = None  # Treat as individual file
-            else:
-                seq = None  # Treat as individual file
+            data[idx] = self._file_item(ctx, entry, ext, data, idx)
+
+            # The file will be added to its sequence (SequenceItem model)
+            pending.append((entry, ext))
+
+        self._add_sequence_frames(ctx, sequence_data, pending)
 
         # Process sequence data
         sequence_items = common.get_data(p, k, common.SequenceItem)
-        for idx, (seq_path, seq_data) in enumerate(sequence_data.items()):
+        for idx, seq_data in enumerate(sequence_data.values()):
             if idx >= common.max_list_items:
                 break  # Limit the number of items loaded
-
-            frames = seq_data.get(common.FramesRole, [])
-            if len(frames) == 1:
-                # Sequence with a single frame; treat as individual file
-                _seq = seq_data[common.SequenceRole]
-                if _seq and len(_seq.groups()) >= 4:
-                    frame = frames[0]
-                    filepath = common.normalize_path(f"{_seq.group(1)}{frame}{_seq.group(3)}.{_seq.group(4)}")
-
-                    # Compute relative path
-                    relative_path = os.path.relpath(filepath, source_path).replace('\\', '/')
-                    if '..' in relative_path or relative_path.startswith('.'):
-                        display_path = os.path.basename(filepath)
-                    else:
-                        display_path = relative_path
-
-                    filename = os.path.basename(filepath)
-                    seq_data.update({
-                        QtCore.Qt.DisplayRole: display_path,
-                        common.FilterTextRole: f"{display_path}\n{filename}",
-                        QtCore.Qt.EditRole: filename,
-                        common.PathRole: filepath,
-                        common.DataTypeRole: common.FileItem,
-                        common.SortByLastModifiedRole: 0,
-                        common.FlagsRole: models.DEFAULT_ITEM_FLAGS | (
-                            common.MarkedAsFavourite if filepath in favourites else 0
-                        ),
-                        common.SequenceRole: None,
-                        common.FramesRole: [],
-                    })
-
-                    # Add to sequence_items (SequenceItem model)
-                    seq_data[common.DataDictRole] = weakref.ref(sequence_items)
-                    seq_data[common.IdRole] = idx
-                    sequence_items[idx] = seq_data
-                else:
-                    # Invalid sequence; treat as individual file
-                    seq_data[common.DataTypeRole] = common.FileItem
-                    seq_data[common.DataDictRole] = weakref.ref(sequence_items)
-                    seq_data[common.IdRole] = idx
-                    sequence_items[idx] = seq_data
-            else:
-                # Sequence with multiple frames
-                seq_relative_path = os.path.relpath(seq_path, source_path).replace('\\', '/')
-                if '..' in seq_relative_path or seq_relative_path.startswith('.'):
-                    seq_display_name = os.path.basename(seq_path)
-                else:
-                    seq_display_name = seq_relative_path
-
-                seq_data[QtCore.Qt.DisplayRole] = seq_display_name
-                seq_data[common.FilterTextRole] = seq_display_name
-                seq_data[common.SortByNameRole][-1] = seq_display_name.lower()
-                seq_data[common.DataDictRole] = weakref.ref(sequence_items)
-                seq_data[common.IdRole] = idx
-                sequence_items[idx] = seq_data
+            sequence_items[idx] = self._finalize_sequence_item(ctx, seq_data, sequence_items, idx)
 
         # Update file system watcher
         watcher.add_directories(sorted(watch_paths))
@@ -540,6 +677,523 @@ class FileItemModel(models.ItemModel):
         common.get_data(p, k, common.FileItem).refresh_needed = False
         common.get_data(p, k, common.SequenceItem).refresh_needed = False
 
+    def can_update_data(self):
+        """Checks if the current data set can be updated incrementally.
+
+        Returns:
+            bool: `True` if the task folder has a snapshot and loaded data.
+
+        """
+        p = self.parent_path()
+        k = self.task()
+
+        if not p or not all(p) or not k:
+            return False
+
+        snapshot = common.get_snapshot(p, k)
+        if not snapshot:
+            return False
+
+        source_path = common.normalize_path('/'.join(p + (k,)))
+        if snapshot.root != source_path:
+            return False
+
+        return bool(common.data_count(p, k, common.FileItem))
+
+    @common.status_bar_message('Updating Files...')
+    @models.initdata
+    @common.error
+    @common.debug
+    def update_data(self, changes=None):
+        """Updates the current data set in place by re-scanning only the directories
+        that changed since the data was loaded.
+
+        Unchanged items keep their loaded file information and thumbnails. Sequence
+        items with added or removed frames are rebuilt and marked for re-loading.
+
+        Args:
+            changes (tuple): Optional list of added file entries and set of removed
+                file paths. When set, the snapshot is assumed to be up-to-date
+                and won't be updated.
+
+        """
+        ctx = self._get_load_context()
+        if not ctx:
+            return
+
+        p = ctx['p']
+        k = ctx['k']
+
+        snapshot = common.get_snapshot(p, k)
+        if not snapshot:
+            return
+
+        if changes:
+            added, removed = changes
+        else:
+            added, removed = snapshot.update(interrupt=lambda: self._interrupt_requested)
+        removed = {common.normalize_path(f) for f in removed}
+
+        data = common.get_data(p, k, common.FileItem)
+        sequence_items = common.get_data(p, k, common.SequenceItem)
+
+        if not added and not removed:
+            data.refresh_needed = False
+            sequence_items.refresh_needed = False
+            return
+
+        # Files
+        rows = [v for v in data.values() if v[common.PathRole] not in removed]
+        entries = [(entry, self._accept_entry(ctx, entry)) for entry in added]
+        entries = [(entry, ext) for (entry, ext) in entries if ext]
+        for entry, ext in entries:
+            if len(rows) >= common.max_list_items:
+                break
+            rows.append(self._file_item(ctx, entry, ext, data, len(rows)))
+        data = common.replace_items(p, k, common.FileItem, rows)
+
+        # Sequences
+        # Find the sequences affected by the change and collect their current frames
+        affected = set()
+        for path in removed:
+            _, sequence_path = get_sequence_elements(path)
+            if sequence_path:
+                affected.add(common.normalize_path(sequence_path))
+        for entry, _ in entries:
+            _, sequence_path = get_sequence_elements(common.normalize_path(entry.path))
+            if sequence_path:
+                affected.add(common.normalize_path(sequence_path))
+
+        existing = {}
+        for idx, v in sequence_items.items():
+            key = common.proxy_path(v[common.PathRole])
+            if key in affected:
+                existing[key] = idx
+
+        sequence_data = common.DataDict()
+        frames = []
+        for key, idx in existing.items():
+            ext = sequence_items[idx][common.SortByTypeRole]
+            for entry in sequence_items[idx][common.EntryRole]:
+                if common.normalize_path(entry.path) in removed:
+                    continue
+                frames.append((entry, ext))
+        self._add_sequence_frames(ctx, sequence_data, frames + entries)
+
+        rows = []
+        for idx, v in sequence_items.items():
+            key = common.proxy_path(v[common.PathRole])
+            if key not in affected:
+                rows.append(v)
+                continue
+            if key not in sequence_data:
+                continue  # All frames were removed
+            seq_data = self._finalize_sequence_item(ctx, sequence_data.pop(key), sequence_items, idx)
+            # The thumbnail and the item flags remain valid
+            seq_data[common.ThumbnailLoaded] = v[common.ThumbnailLoaded]
+            seq_data[common.FlagsRole] = v[common.FlagsRole]
+            rows.append(seq_data)
+        for seq_data in sequence_data.values():
+            if len(rows) >= common.max_list_items:
+                break
+            rows.append(self._finalize_sequence_item(ctx, seq_data, sequence_items, len(rows)))
+        sequence_items = common.replace_items(p, k, common.SequenceItem, rows)
+
+        # Workers have to load the new items and sort the data
+        data.loaded = False
+        sequence_items.loaded = False
+        data.refresh_needed = False
+        sequence_items.refresh_needed = False
+
+    def can_scan_data(self):
+        """Checks if the task folder can be walked by the file scanner thread.
+
+        When the scanner thread isn't running, for example, when Bookmarks is
+        initialized in core mode, data is loaded by :meth:`init_data` instead.
+
+        """
+        return threads.get_thread(threads.FileScan).isRunning()
+
+    def _is_scan_current(self):
+        ctx = self._scan_context
+        if not ctx:
+            return False
+        return ctx['p'] == self.parent_path() and ctx['k'] == self.task()
+
+    @common.error
+    @common.debug
+    def scan_data(self, emit_active=True):
+        """Starts loading the current task folder in the file scanner thread.
+
+        Unlike :meth:`init_data`, this method returns immediately. The files found by
+        the scanner are added to the model in batches by :meth:`scan_entries_ready`,
+        and the load is completed by :meth:`scan_finished`.
+
+        Args:
+            emit_active (bool): Whether to emit the active index when the scan finishes.
+
+        """
+        common.init_active(
+            load_settings=True,
+            clear_all=False,
+            load_private=False,
+        )
+
+        p = self.parent_path()
+        k = self.task()
+
+        self.beginResetModel()
+        try:
+            self.cancel_scan()
+            self._interrupt_requested = False
+
+            common.reset_data(p, k)
+            common.remove_snapshot(p, k)
+
+            ctx = self._get_load_context()
+            if not ctx:
+                return
+
+            ctx['emit_active'] = emit_active
+            self._scan_id = uuid.uuid1().hex
+            self._scan_context = ctx
+            self._scan_sequences = common.DataDict()
+            self._load_in_progress = True
+        finally:
+            self.endResetModel()
+
+        common.get_watcher(common.FileTab).reset()
+        common.signals.showStatusBarMessage.emit('Loading Files...')
+        threads.queue_file_scan(self._scan_id, ctx['source_path'])
+
+    def cancel_scan(self):
+        """Cancels the running task folder scan and discards the partially loaded data.
+
+        """
+        if not self._scan_id:
+            return
+
+        ctx = self._scan_context
+
+        self._scan_id = None
+        self._scan_context = None
+        self._scan_sequences = None
+        self._load_in_progress = False
+
+        threads.cancel_file_scan()
+
+        # A validated snapshot is left unchanged, as the scanner updates a copy
+        if not ctx.get('validate'):
+            common.remove_snapshot(ctx['p'], ctx['k'])
+            common.reset_data(ctx['p'], ctx['k'])
+        common.signals.showStatusBarMessage.emit('')
+
+    @common.error
+    @QtCore.Slot(str, object)
+    def scan_entries_ready(self, scan_id, entries):
+        """Slot called when the file scanner thread found a batch of files.
+
+        The files are added to both the file and sequence data sets. Rows are inserted
+        using :meth:`beginInsertRows` so the view can show them straight away.
+
+        Args:
+            scan_id (str): The id of the scan.
+            entries (list): A list of ``DirEntry`` instances.
+
+        """
+        if not scan_id or scan_id != self._scan_id:
+            return
+
+        # The model was switched to another task folder while loading
+        if not self._is_scan_current():
+            self.cancel_scan()
+            return
+
+        ctx = self._scan_context
+        p = ctx['p']
+        k = ctx['k']
+
+        data = common.get_data(p, k, common.FileItem)
+        sequence_items = common.get_data(p, k, common.SequenceItem)
+        sequence_data = self._scan_sequences
+
+        file_rows = []
+        accepted = []
+        for entry in entries:
+            ext = self._accept_entry(ctx, entry)
+            if not ext:
+                continue
+            accepted.append((entry, ext))
+
+            idx = len(data) + len(file_rows)
+            if idx < common.max_list_items:
+                file_rows.append(self._file_item(ctx, entry, ext, data, idx))
+
+        n = len(sequence_data)
+        self._add_sequence_frames(ctx, sequence_data, accepted)
+
+        # New sequences are added as provisional rows finalized by scan_finished
+        sequence_rows = []
+        for sequence_path in itertools.islice(sequence_data, n, None):
+            idx = len(sequence_items) + len(sequence_rows)
+            if idx >= common.max_list_items:
+                break
+            sequence_rows.append(sequence_data[sequence_path])
+
+        t = self.data_type()
+        for _t, _data, rows in (
+                (common.FileItem, data, file_rows),
+                (common.SequenceItem, sequence_items, sequence_rows),
+        ):
+            if not rows:
+                continue
+            if t == _t:
+                self.beginInsertRows(QtCore.QModelIndex(), len(_data), len(_data) + len(rows) - 1)
+            common.add_items(p, k, _t, rows)
+            if t == _t:
+                self.endInsertRows()
+
+        common.signals.showStatusBarMessage.emit(f'Loading files (found {len(data)} items)...')
+
+    @common.error
+    @QtCore.Slot(str, object)
+    def scan_finished(self, scan_id, snapshot):
+        """Slot called when the file scanner thread finished walking the task folder.
+
+        Args:
+            scan_id (str): The id of the scan.
+            snapshot (common.TaskSnapshot): The snapshot of the task folder.
+
+        """
+        if not scan_id or scan_id != self._scan_id:
+            return
+
+        if not self._is_scan_current():
+            self.cancel_scan()
+            return
+
+        self._finish_scan(snapshot)
+
+    def _finish_scan(self, snapshot):
+        """Finalizes the sequence items and signals that the core data has been loaded.
+
+        Args:
+            snapshot (common.TaskSnapshot): The snapshot of the task folder, or `None`
+                if the scan was interrupted.
+
+        """
+        ctx = self._scan_context
+        p = ctx['p']
+        k = ctx['k']
+
+        self._scan_id = None
+        self._scan_context = None
+        self._scan_sequences = None
+
+        if snapshot:
+            common.set_snapshot(p, k, snapshot)
+            self.save_listing_cache()
+
+        data = common.get_data(p, k, common.FileItem)
+        sequence_items = common.get_data(p, k, common.SequenceItem)
+        for idx, seq_data in list(sequence_items.items()):
+            self._finalize_sequence_item(ctx, seq_data, sequence_items, idx)
+
+        if self.data_type() == common.SequenceItem and sequence_items:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(sequence_items) - 1, self.columnCount() - 1)
+            )
+
+        common.get_watcher(common.FileTab).add_directories([ctx['source_path'], ])
+
+        data.refresh_needed = False
+        sequence_items.refresh_needed = False
+
+        self._interrupt_requested = False
+        self._load_in_progress = False
+        common.signals.showStatusBarMessage.emit('')
+
+        t1 = self.data_type()
+        t2 = common.FileItem if t1 == common.SequenceItem else common.SequenceItem
+        self.coreDataLoaded.emit(
+            common.get_data_ref(p, k, t1),
+            common.get_data_ref(p, k, t2),
+        )
+
+        if not ctx['emit_active']:
+            return
+        index = self.active_index()
+        if index.isValid():
+            self.set_active(index)
+
+    def load_listing_cache(self):
+        """Loads the current task folder from its listing cache.
+
+        Returns:
+            bool: `True` if files were loaded from the cache.
+
+        """
+        ctx = self._get_load_context()
+        if not ctx:
+            return False
+
+        p = ctx['p']
+        k = ctx['k']
+
+        path = common.get_cache_path(p, k)
+        snapshot = common.load_cache(
+            path, ctx['source_path'], max_workers=common.get_scan_threads()
+        )
+        if not snapshot:
+            return False
+
+        self.init_data(snapshot=snapshot)
+        return bool(common.data_count(p, k, common.FileItem))
+
+    def save_listing_cache(self):
+        """Queues the current task folder's snapshot to be saved to the listing cache.
+
+        """
+        if not threads.get_thread(threads.QueuedListingCache).isRunning():
+            return
+
+        p = self.parent_path()
+        k = self.task()
+        if not p or not all(p) or not k:
+            return
+
+        snapshot = common.get_snapshot(p, k)
+        if not snapshot:
+            return
+
+        threads.queue_listing_cache(common.get_cache_path(p, k), snapshot)
+
+    def validate_data(self):
+        """Checks the current data set for changes in the file scanner thread.
+
+        Used after the data was loaded from the listing cache, or when the data is
+        refreshed, the changed directories are scanned in the background, and the
+        changes are applied by :meth:`scan_validated`.
+
+        """
+        ctx = self._get_load_context()
+        if not ctx:
+            return
+
+        snapshot = common.get_snapshot(ctx['p'], ctx['k'])
+        if not snapshot:
+            return
+
+        ctx['validate'] = True
+        ctx['emit_active'] = False
+        self._scan_id = uuid.uuid1().hex
+        self._scan_context = ctx
+        threads.queue_file_scan(self._scan_id, ctx['source_path'], snapshot)
+
+    @common.error
+    @QtCore.Slot(str, object, object, object)
+    def scan_validated(self, scan_id, added, removed, snapshot):
+        """Slot called when the file scanner thread finished validating the snapshot.
+
+        The updated snapshot replaces the task folder's cached snapshot.
+
+        Args:
+            scan_id (str): The id of the scan.
+            added (list): The file entries added since the snapshot was taken.
+            removed (set): The paths of the files removed since the snapshot was taken.
+            snapshot (common.TaskSnapshot): The updated copy of the snapshot.
+
+        """
+        if not scan_id or scan_id != self._scan_id:
+            return
+
+        if not self._is_scan_current():
+            self.cancel_scan()
+            return
+
+        ctx = self._scan_context
+        self._scan_id = None
+        self._scan_context = None
+
+        common.set_snapshot(ctx['p'], ctx['k'], snapshot)
+        if not added and not removed:
+            common.get_data(ctx['p'], ctx['k'], common.FileItem).refresh_needed = False
+            common.get_data(ctx['p'], ctx['k'], common.SequenceItem).refresh_needed = False
+            return
+
+        self.coreDataReset.emit()
+        self.update_data(changes=(added, removed))
+        self.save_listing_cache()
+
+    @QtCore.Slot()
+    def set_interrupt_requested(self):
+        """Load interrupt requested by user.
+
+        A running task folder scan is stopped and the files found so far are kept.
+
+        """
+        super().set_interrupt_requested()
+        if not self._scan_id:
+            return
+        if not self._is_scan_current() or self._scan_context.get('validate'):
+            self.cancel_scan()
+            return
+        threads.cancel_file_scan()
+        self._finish_scan(None)
+
+    @common.error
+    @common.debug
+    @QtCore.Slot()
+    def reset_data(self, *args, force=False, emit_active=True):
+        """Resets the model's internal data.
+
+        When `force` is set and the task folder was loaded before, only the changed
+        directories are re-scanned, in the file scanner thread if it's running. See
+        :meth:`validate_data` and :meth:`update_data`.
+
+        Otherwise, if the file scanner thread is running, the task folder is loaded
+        from the listing cache and validated in the background, or if there's no
+        cache, scanned in the background. See :meth:`load_listing_cache` and
+        :meth:`scan_data`.
+
+        """
+        if self._scan_id and (force or not self._is_scan_current()):
+            self.cancel_scan()
+
+        if force and self.can_update_data():
+            if self.can_scan_data():
+                # The changed directories are re-scanned in the file scanner thread
+                self.validate_data()
+                return
+            self.coreDataReset.emit()
+            self.update_data()
+            self.save_listing_cache()
+            return
+
+        p = self.parent_path()
+        k = self.task()
+        if p and all(p) and k and self.can_scan_data():
+            if self._scan_id:
+                return
+            if force:
+                self.coreDataReset.emit()
+                self.scan_data(emit_active=emit_active)
+                return
+            if not common.data_count(p, k, common.FileItem):
+                self.coreDataReset.emit()
+                if not self.load_listing_cache():
+                    self.scan_data(emit_active=emit_active)
+                    return
+
+                self.validate_data()
+                index = self.active_index()
+                if emit_active and index.isValid():
+                    self.set_active(index)
+                return
+
+        super().reset_data(*args, force=force, emit_active=emit_active)
+
     def disable_filter(self):
         """Overrides the token config and disables file filters."""
         return False
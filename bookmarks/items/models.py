@@ -33,6 +33,7 @@ import weakref
 from PySide2 import QtWidgets, QtCore
 
 from .. import common
+from .. import database
 from .. import images
 from .. import importexport
 from .. import log
@@ -88,6 +89,10 @@ def initdata(func):
         t1 = self.data_type()
         t2 = common.FileItem if t1 == common.SequenceItem else common.SequenceItem
 
+        # Drop the data sets of previously visited items if over budget. The model's
+        # own data set is always kept, as the item tabs might not be available
+        common.evict_data(pinned=get_pinned_data_keys(model=self))
+
         if all((p, k)):
             self.coreDataLoaded.emit(
                 common.get_data_ref(p, k, t1),
@@ -97,6 +102,38 @@ def initdata(func):
     return func_wrapper
 
 
+def get_pinned_data_keys(model=None):
+    """Returns the data set keys shown by the item tabs.
+
+    These data sets are never evicted by :func:`~bookmarks.common.data.evict_data`.
+
+    Args:
+        model (ItemModel): An optional model whose data set is also pinned.
+
+    Returns:
+        list: (parent path, task) tuples.
+
+    """
+    models = []
+    for idx in (common.BookmarkTab, common.AssetTab, common.FileTab, common.FavouriteTab):
+        try:
+            models.append(common.source_model(idx))
+        except RuntimeError:
+            continue
+    if model is not None:
+        models.append(model)
+
+    keys = []
+    for model in models:
+        if not hasattr(model, 'parent_path'):
+            continue
+        p = model.parent_path()
+        k = model.task()
+        if p and all(p) and k:
+            keys.append((p, k))
+    return keys
+
+
 class ItemModel(QtCore.QAbstractTableModel):
     """The base model used for interacting with all bookmark, asset and file items.
 
@@ -546,8 +583,7 @@ class ItemModel(QtCore.QAbstractTableModel):
                 ref = common.get_data_ref(p, k, t)
                 if not ref():
                     continue
-                d = common.sort_data(ref, sort_by, sort_order)
-                common.set_data(p, k, t, d)
+                common.sort_data(ref, sort_by, sort_order)
         except:
             log.error(__name__, 'Sorting error')
         finally:
@@ -770,6 +806,8 @@ class FilterProxyModel(QtCore.QSortFilterProxyModel):
         self.queued_invalidate_timer.setInterval(100)
 
         self._filter = common.SyntaxFilter('')
+        self._archived_ids = None
+        self._archived_rows = None
         self._filter_flags = {
             common.MarkedAsActive: None,
             common.MarkedAsArchived: None,
@@ -780,8 +818,14 @@ class FilterProxyModel(QtCore.QSortFilterProxyModel):
         self.filterFlagChanged.connect(self.invalidateFilter)
 
         self.modelAboutToBeReset.connect(self.verify_items.stop)
+        self.modelAboutToBeReset.connect(self.clear_archived_ids)
+        # Sorting changes the ids of the items
+        self.layoutAboutToBeChanged.connect(self.clear_archived_rows)
+        common.signals.databaseValueChanged.connect(self.database_value_changed)
         self.modelReset.connect(self.verify_items.start)
         common.signals.databaseValueChanged.connect(self.verify_items.start)
+        common.signals.databaseValuesChanged.connect(self.database_values_changed)
+        common.signals.databaseValuesChanged.connect(self.verify_items.start)
         self.modelReset.connect(self.invalidateFilter)
 
         self.filterTextChanged.connect(self.verify_items.start)
@@ -825,6 +869,103 @@ class FilterProxyModel(QtCore.QSortFilterProxyModel):
 
         self.verify_items.stop()
 
+    @QtCore.Slot()
+    def clear_archived_ids(self):
+        """Clears the cached ids of the archived items, see :meth:`get_archived_ids`.
+
+        """
+        self._archived_ids = None
+        self._archived_rows = None
+
+    @QtCore.Slot()
+    def clear_archived_rows(self):
+        """Clears the cached ids of the archived items of the current data set, see
+        :meth:`get_archived_rows`.
+
+        """
+        self._archived_rows = None
+
+    @QtCore.Slot(str, str, str, object)
+    def database_value_changed(self, table, source, key, value):
+        """Slot called when a database value changes.
+
+        """
+        if key == 'flags':
+            self.clear_archived_ids()
+
+    @QtCore.Slot(list)
+    def database_values_changed(self, changes):
+        """Slot called when the values of a database transaction change.
+
+        """
+        for args in changes:
+            self.database_value_changed(*args)
+
+    def get_archived_ids(self):
+        """Returns the database ids of the archived items of the source model's bookmark.
+
+        The ids are read using a single query and used to hide archived items before
+        their flags are loaded by the info workers.
+
+        Returns:
+            frozenset: Database row ids.
+
+        """
+        if self._archived_ids is not None:
+            return self._archived_ids
+
+        self._archived_ids = frozenset()
+
+        p = self.sourceModel().parent_path()
+        # Bookmark and favourite items don't share a bookmark database
+        if not p or len(p) < 3 or not all(p[0:3]):
+            return self._archived_ids
+
+        db = database.get(*p[0:3])
+        self._archived_ids = frozenset(db.get_ids_with_flag(common.MarkedAsArchived, database.AssetTable))
+        return self._archived_ids
+
+    def get_archived_rows(self, data):
+        """Returns the ids of the items of a data set archived in the bookmark database.
+
+        Each item's path is hashed once and compared with :meth:`get_archived_ids`.
+        When the data set grows, for example, while the files of a task folder are
+        loading, only the added items are checked.
+
+        Args:
+            data (DataDict): The data set.
+
+        Returns:
+            set: The ids of the archived items.
+
+        """
+        ids = self.get_archived_ids()
+        if not ids:
+            return ids
+
+        if self._archived_rows is None or self._archived_rows[0]() is not data:
+            self._archived_rows = [weakref.ref(data), 0, set()]
+
+        n = len(data)
+        if self._archived_rows[1] == n:
+            return self._archived_rows[2]
+
+        rows = self._archived_rows[2]
+        for idx in range(self._archived_rows[1], n):
+            item = data.get(idx)
+            if item is None:
+                continue
+            path = item[common.PathRole]
+            if common.get_hash(path) in ids:
+                rows.add(idx)
+                continue
+            pp = item[common.ParentPathRole]
+            if pp and len(pp) > 4 and common.get_sequence(path):
+                if common.get_hash(common.proxy_path(path)) in ids:
+                    rows.add(idx)
+        self._archived_rows[1] = n
+        return rows
+
     def invalidateFilter(self, *args, **kwargs):
         """Instead of calling invalidate directly, we'll pool consequent calls
         together.
@@ -967,6 +1108,13 @@ class FilterProxyModel(QtCore.QSortFilterProxyModel):
         if not isinstance(flags, QtCore.Qt.ItemFlags):
             return False
         archived = flags & common.MarkedAsArchived
+        # The flags aren't loaded yet, query the database instead
+        if (
+                not archived and
+                not self.filter_flag(common.MarkedAsArchived) and
+                not ref()[idx][common.FileInfoLoaded]
+        ):
+            archived = idx in self.get_archived_rows(ref())
         favourite = flags & common.MarkedAsFavourite
         active = flags & common.MarkedAsActive
 
@@ -10,7 +10,6 @@ The view uses :class:`~bookmarks.items.models.ItemModel` for getting the item da
 and :class:`.ThreadedItemView` that implement threading related functionality.
 
 """
-import collections
 import functools
 import os
 import re
@@ -2424,7 +2423,7 @@ class ThreadedItemView(ClickableFilterView):
 
     """
     workerInitialized = QtCore.Signal(str)
-    refUpdated = QtCore.Signal(weakref.ref)
+    refsUpdated = QtCore.Signal(list)
     queueItems = QtCore.Signal(list)
 
     queues = ()
@@ -2436,7 +2435,7 @@ class ThreadedItemView(ClickableFilterView):
 
         super().__init__(icon=icon, parent=parent)
 
-        self.update_queue = collections.deque([], common.max_list_items)
+        self.update_queue = set()
         self.update_queue_timer = common.Timer(parent=self)
         self.update_queue_timer.setSingleShot(True)
         self.update_queue_timer.setInterval(20)
@@ -2468,13 +2467,15 @@ class ThreadedItemView(ClickableFilterView):
 
         """
         super().init_model(*args, **kwargs)
-        self.refUpdated.connect(self.update_row)
+        self.refsUpdated.connect(self.update_rows)
 
         self.delayed_queue_timer.timeout.connect(self.save_visible_rows)
         self.delayed_queue_timer.timeout.connect(self.queue_visible_indexes)
 
         self.model().invalidated.connect(self.start_delayed_queue_timer)
         self.model().sourceModel().modelReset.connect(self.start_delayed_queue_timer)
+        self.model().sourceModel().rowsInserted.connect(self.start_delayed_queue_timer)
+        self.model().sourceModel().coreDataLoaded.connect(self.delay_restore_selection)
 
         self.verticalScrollBar().valueChanged.connect(self.start_delayed_queue_timer)
         self.verticalScrollBar().sliderReleased.connect(self.start_delayed_queue_timer)
@@ -2492,12 +2493,41 @@ class ThreadedItemView(ClickableFilterView):
         """
         self.delayed_queue_timer.start(self.delayed_queue_timer.interval())
 
+    def get_queued_rows(self):
+        """Returns the source rows to queue for processing in order of priority.
+
+        The visible rows come first, followed by the rows above and below the
+        viewport, nearest first. See :func:`~bookmarks.threads.threads.get_prefetch_rows`.
+
+        Returns:
+            list: A list of source rows.
+
+        """
+        rows = list(self.visible_rows['source_rows'])
+        proxy_rows = self.visible_rows['proxy_rows']
+        n = threads.get_prefetch_rows()
+        if not proxy_rows or not n:
+            return rows
+
+        proxy = self.model()
+        first = min(proxy_rows)
+        last = max(proxy_rows)
+        count = proxy.rowCount()
+        for d in range(1, n + 1):
+            for row in (last + d, first - d):
+                if 0 <= row < count:
+                    rows.append(proxy.mapToSource(proxy.index(row, 0)).row())
+        return rows
+
     @common.status_bar_message('Updating items...')
     @common.debug
     def queue_visible_indexes(self, *args, **kwargs):
-        """Send all currently visible items to the worker
+        """Send the currently visible items and the items around them to the worker
         threads for processing.
 
+        The items are prioritized by their distance from the viewport, and replace
+        the previously queued items that scrolled out of view.
+
         """
         proxy = self.model()
         if not proxy:
@@ -2509,6 +2539,8 @@ class ThreadedItemView(ClickableFilterView):
         data = model.model_data()
 
         show_archived = proxy.filter_flag(common.MarkedAsArchived)
+        rows = self.get_queued_rows()
+        visible_count = len(self.visible_rows['source_rows'])
 
         try:
             for q in self.queues:
@@ -2519,7 +2551,7 @@ class ThreadedItemView(ClickableFilterView):
                     continue
 
                 refs = []
-                for idx in self.visible_rows['source_rows']:
+                for n, idx in enumerate(rows):
 
                     # Item is already loaded, skip
                     if data[idx][role]:
@@ -2528,7 +2560,7 @@ class ThreadedItemView(ClickableFilterView):
                     # Check if any of the current items are archived and invalidate
                     # the filter if it is meant to be hidden
                     is_archived = data[idx][common.FlagsRole] & common.MarkedAsArchived
-                    if show_archived is False and is_archived:
+                    if n < visible_count and show_archived is False and is_archived:
                         proxy.invalidateFilter()
                         return
 
@@ -2539,31 +2571,35 @@ class ThreadedItemView(ClickableFilterView):
         except:
             raise
 
-    @QtCore.Slot(weakref.ref)
-    def update_row(self, ref):
-        """Queues an update request by the threads for later processing."""
-        if not ref():
-            return
-        if ref not in self.update_queue.copy():
-            self.update_queue.append(ref)
+    @QtCore.Slot(list)
+    def update_rows(self, refs):
+        """Queues the items updated by the threads for a later repaint.
+
+        Args:
+            refs (list): The weakrefs of the updated items.
+
+        """
+        for ref in refs:
+            if ref():
+                self.update_queue.add(ref()[common.PathRole])
+        if self.update_queue and not self.update_queue_timer.isActive():
             self.update_queue_timer.start(self.update_queue_timer.interval())
 
     def queued_row_repaint(self):
-        """Process a repaint request."""
-        try:
-            ref = self.update_queue.popleft()
-        except IndexError:
-            return
-        if not ref():
+        """Repaints the visible rows of the queued items in a single update."""
+        paths = self.update_queue
+        self.update_queue = set()
+        if not paths:
             return
 
+        region = QtGui.QRegion()
         for row in self.visible_rows['proxy_rows']:
             index = self.model().index(row, 0)
-            if index.data(common.PathRole) == ref()[common.PathRole]:
-                super().update(index)
-                break
+            if index.data(common.PathRole) in paths:
+                region += self.visualRect(index)
 
-        self.update_queue_timer.start(self.update_queue_timer.interval())
+        if not region.isEmpty():
+            self.viewport().update(region)
 
     @QtCore.Slot()
     def delayed_save_visible_rows(self):
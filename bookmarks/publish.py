@@ -94,17 +94,33 @@ def get_payload(kwargs, destination):
         destination.pop(-1)
         destination = '.'.join(destination)
 
-        for entry in kwargs['entries']:
-            path = entry.path.replace('\\', '/')
-            seq = common.get_sequence(path)
-
+        frames = kwargs.get('frames')
+        if frames:
+            # The file paths are built from the frame set without parsing
+            # each file path
+            frames = common.FrameSet(frames)
+            seq = common.get_sequence(common.get_sequence_start_path(kwargs['source']))
             if not seq:
                 raise ValueError('Error occurred when extracting sequence.')
 
-            if not QtCore.QFileInfo(path).exists():
-                raise RuntimeError('A sequence item does not exist.')
+            for n in frames.numbers():
+                path = f'{seq.group(1)}{frames.format(n)}{seq.group(3)}.{seq.group(4)}'
+                if not QtCore.QFileInfo(path).exists():
+                    raise RuntimeError('A sequence item does not exist.')
+                v['files'][path] = f'{destination}.{n}.{kwargs["ext"]}'
+
+        else:
+            for entry in kwargs['entries']:
+                path = entry.path.replace('\\', '/')
+                seq = common.get_sequence(path)
+
+                if not seq:
+                    raise ValueError('Error occurred when extracting sequence.')
+
+                if not QtCore.QFileInfo(path).exists():
+                    raise RuntimeError('A sequence item does not exist.')
 
-            v['files'][path] = f'{destination}.{int(seq.group(2))}.{kwargs["ext"]}'
+                v['files'][path] = f'{destination}.{int(seq.group(2))}.{kwargs["ext"]}'
 
     elif len(kwargs['entries']) == 1:
         v['type'] = common.FileItem
@@ -465,6 +481,7 @@ class PublishWidget(base.BasePropertyEditor):
         kwargs['source'] = self._index.data(common.PathRole)
         kwargs['type'] = self._index.data(common.DataTypeRole)
         kwargs['entries'] = self._index.data(common.EntryRole)
+        kwargs['frames'] = self._index.data(common.FramesRole)
         kwargs['is_collapsed'] = common.is_collapsed(kwargs['source'])
         kwargs['ext'] = QtCore.QFileInfo(kwargs['source']).suffix()
 
@@ -235,7 +235,7 @@ def save_entity_data_to_db(server, job, root, source, table, entity, value_map):
     s = source
     t = table
     db = database.get(server, job, root)
-    with db.connection():
+    with db.transaction():
 
         # Let's iterate over the value map dictionary to extract data from the
         # entity and save it into our bookmark database
@@ -2,11 +2,14 @@
 
 """
 import collections
+import threading
 import time
 import uuid
+import weakref
 
 from PySide2 import QtCore, QtGui, QtWidgets
 
+from . import thumbnails
 from . import workers
 from .. import common
 
@@ -22,6 +25,200 @@ class DataType(object):
         self.data_type = t
 
 
+class CancelToken:
+    """A cooperative cancellation token of a :class:`WorkQueue` generation.
+
+    The token is cancelled when the queue's generation changes, for example, when
+    the model associated with the queue is reset. Long-running operations should
+    check :attr:`cancelled` and stop early.
+
+    Args:
+        queue (WorkQueue): The queue the token belongs to.
+
+    """
+    __slots__ = ('_queue', 'generation')
+
+    def __init__(self, queue):
+        self._queue = queue
+        self.generation = queue.generation
+
+    def __repr__(self):
+        return f'<CancelToken (generation={self.generation}, cancelled={self.cancelled})>'
+
+    @property
+    def cancelled(self):
+        return self._queue.generation != self.generation
+
+
+def _queue_key(v):
+    """Returns a hashable key used to find the given item in a :class:`WorkQueue`.
+
+    Weakrefs are keyed by identity, as the referenced data items aren't hashable.
+    Calling ``weakref.ref`` returns the same ref for the same object, so the same
+    item is found whichever ref was queued.
+
+    """
+    if isinstance(v, weakref.ref):
+        return id(v)
+    try:
+        hash(v)
+        return v
+    except TypeError:
+        pass
+
+    if isinstance(v, (tuple, list)):
+        return type(v).__name__, tuple(_queue_key(f) for f in v)
+    if isinstance(v, dict):
+        return 'dict', frozenset((k, _queue_key(f)) for k, f in v.items())
+    return id(v)
+
+
+class WorkQueue:
+    """The work queue of a worker thread.
+
+    Like :class:`collections.deque`, items are added using :meth:`append` and
+    :meth:`appendleft`, and :meth:`pop` takes them from the right. Items passed to
+    :meth:`prioritize`, for example, the rows around the viewport of a view, are
+    taken before these, in the order given. Each call to :meth:`prioritize`
+    replaces the previously prioritized items, so items that scrolled out of view
+    are dropped.
+
+    The queue is backed by ordered dictionaries, so adding, finding and removing
+    items take constant time. An item is only queued once: adding an item
+    already in the queue keeps it in its current position.
+
+    :meth:`cancel` discards the queued items and starts a new generation.
+    Producers can pass the :class:`CancelToken` they started with, so items they
+    queue after the queue was cancelled are discarded.
+
+    Args:
+        maxlen (int): The maximum number of items in the queue.
+
+    """
+
+    def __init__(self, maxlen=None):
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self._prioritized = collections.OrderedDict()
+        self.maxlen = maxlen
+        self.generation = 0
+
+    def __repr__(self):
+        return (
+            f'<WorkQueue ({len(self._prioritized)} prioritized, {len(self._items)} items, '
+            f'generation={self.generation})>'
+        )
+
+    def __len__(self):
+        return len(self._prioritized) + len(self._items)
+
+    def __bool__(self):
+        return bool(self._prioritized or self._items)
+
+    def __iter__(self):
+        with self._lock:
+            items = list(self._prioritized.values()) + list(reversed(self._items.values()))
+        return iter(items)
+
+    def __contains__(self, v):
+        k = _queue_key(v)
+        with self._lock:
+            return k in self._prioritized or k in self._items
+
+    def _is_current(self, token):
+        return token is None or token.generation == self.generation
+
+    def _add(self, v, token, last):
+        k = _queue_key(v)
+        with self._lock:
+            if not self._is_current(token) or k in self._items:
+                return
+            self._items[k] = v
+            if not last:
+                self._items.move_to_end(k, last=False)
+            if self.maxlen is not None and len(self._items) > self.maxlen:
+                # Like a full deque, drop the item at the opposite end
+                self._items.popitem(last=not last)
+
+    def token(self):
+        """Returns a cancellation token of the current generation.
+
+        Returns:
+            CancelToken: A new token.
+
+        """
+        return CancelToken(self)
+
+    def cancel(self):
+        """Starts a new generation and discards the queued items.
+
+        Cancels the tokens of the previous generation. Safe to call from any thread.
+
+        """
+        with self._lock:
+            self.generation += 1
+            self._prioritized.clear()
+            self._items.clear()
+
+    def append(self, v, token=None):
+        self._add(v, token, True)
+
+    def appendleft(self, v, token=None):
+        self._add(v, token, False)
+
+    def remove(self, v):
+        k = _queue_key(v)
+        with self._lock:
+            a = self._prioritized.pop(k, None)
+            b = self._items.pop(k, None)
+        if a is None and b is None:
+            raise ValueError(f'{v} is not in the queue')
+
+    def pop(self):
+        """Removes and returns the next item.
+
+        Raises:
+            IndexError: If the queue is empty.
+
+        """
+        with self._lock:
+            if self._prioritized:
+                k, v = self._prioritized.popitem(last=False)
+                # The item won't be taken twice
+                self._items.pop(k, None)
+                return v
+            if self._items:
+                return self._items.popitem(last=True)[1]
+        raise IndexError('pop from an empty queue')
+
+    def prioritize(self, items, token=None):
+        """Sets the items to take before all other items.
+
+        Args:
+            items (list): The items in order of priority.
+            token (CancelToken): The token of the generation the items belong to.
+
+        """
+        items = list(items)
+        if self.maxlen is not None:
+            # Items beyond the limit have the lowest priority
+            items = items[:self.maxlen]
+
+        prioritized = collections.OrderedDict()
+        for v in items:
+            prioritized.setdefault(_queue_key(v), v)
+
+        with self._lock:
+            if not self._is_current(token):
+                return
+            self._prioritized = prioritized
+
+    def clear(self):
+        with self._lock:
+            self._prioritized.clear()
+            self._items.clear()
+
+
 FileThumbnail = 'FileThumbnail'
 FavouriteThumbnail = 'FavouriteThumbnail'
 AssetThumbnail = 'AssetThumbnail'
@@ -32,13 +229,23 @@ AssetInfo = 'AssetInfo'
 BookmarkInfo = 'BookmarkInfo'
 QueuedDatabaseTransaction = 'QueuedDatabaseTransaction'
 QueuedSGQuery = 'QueuedSGQuery'
+FileScan = 'FileScan'
+QueuedListingCache = 'QueuedListingCache'
 
 controllers = {}
 
+#: The default number of rows queued above and below the visible rows of a view,
+#: see :func:`get_prefetch_rows`
+DEFAULT_PREFETCH_ROWS = 20
+
+#: The default number of threads used to process the items of the info queues,
+#: see :func:`get_max_workers`
+DEFAULT_INFO_THREADS = 4
+
 # Main thread definitions
 THREADS = {
     BookmarkInfo: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': True,
         'data_types': {
             common.FileItem: DataType(BookmarkInfo, common.FileItem),
@@ -46,9 +253,10 @@ THREADS = {
         'worker': workers.InfoWorker,
         'role': common.FileInfoLoaded,
         'tab': common.BookmarkTab,
+        'max_workers': DEFAULT_INFO_THREADS,
     },
     BookmarkThumbnail: {
-        'queue': collections.deque([], 99),
+        'queue': WorkQueue(99),
         'preload': False,
         'data_types': {
             common.FileItem: DataType(BookmarkThumbnail, common.FileItem),
@@ -56,9 +264,10 @@ THREADS = {
         'worker': workers.ThumbnailWorker,
         'role': common.ThumbnailLoaded,
         'tab': common.BookmarkTab,
+        'max_workers': thumbnails.DEFAULT_THUMBNAIL_PROCESSES,
     },
     AssetInfo: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': True,
         'data_types': {
             common.FileItem: DataType(AssetInfo, common.FileItem),
@@ -66,9 +275,10 @@ THREADS = {
         'worker': workers.InfoWorker,
         'role': common.FileInfoLoaded,
         'tab': common.AssetTab,
+        'max_workers': DEFAULT_INFO_THREADS,
     },
     AssetThumbnail: {
-        'queue': collections.deque([], 99),
+        'queue': WorkQueue(99),
         'preload': False,
         'data_types': {
             common.FileItem: DataType(AssetThumbnail, common.FileItem),
@@ -76,9 +286,10 @@ THREADS = {
         'worker': workers.ThumbnailWorker,
         'role': common.ThumbnailLoaded,
         'tab': common.AssetTab,
+        'max_workers': thumbnails.DEFAULT_THUMBNAIL_PROCESSES,
     },
     FileInfo: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': True,
         'data_types': {
             common.FileItem: DataType(FileInfo, common.FileItem),
@@ -87,9 +298,10 @@ THREADS = {
         'worker': workers.InfoWorker,
         'role': common.FileInfoLoaded,
         'tab': common.FileTab,
+        'max_workers': DEFAULT_INFO_THREADS,
     },
     FileThumbnail: {
-        'queue': collections.deque([], 99),
+        'queue': WorkQueue(99),
         'preload': False,
         'data_types': {
             common.FileItem: DataType(FileThumbnail, common.FileItem),
@@ -98,9 +310,10 @@ THREADS = {
         'worker': workers.ThumbnailWorker,
         'role': common.ThumbnailLoaded,
         'tab': common.FileTab,
+        'max_workers': thumbnails.DEFAULT_THUMBNAIL_PROCESSES,
     },
     FavouriteInfo: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': True,
         'data_types': {
             common.FileItem: DataType(FavouriteInfo, common.FileItem),
@@ -109,9 +322,10 @@ THREADS = {
         'worker': workers.InfoWorker,
         'role': common.FileInfoLoaded,
         'tab': common.FavouriteTab,
+        'max_workers': DEFAULT_INFO_THREADS,
     },
     FavouriteThumbnail: {
-        'queue': collections.deque([], 99),
+        'queue': WorkQueue(99),
         'preload': False,
         'data_types': {
             common.FileItem: DataType(FavouriteThumbnail, common.FileItem),
@@ -120,22 +334,43 @@ THREADS = {
         'worker': workers.ThumbnailWorker,
         'role': common.ThumbnailLoaded,
         'tab': common.FavouriteTab,
+        'max_workers': thumbnails.DEFAULT_THUMBNAIL_PROCESSES,
     },
     QueuedDatabaseTransaction: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': False,
         'data_types': {},
         'worker': workers.TransactionsWorker,
         'role': None,
         'tab': -1,
+        'max_workers': 1,
     },
     QueuedSGQuery: {
-        'queue': collections.deque([], common.max_list_items),
+        'queue': WorkQueue(common.max_list_items),
         'preload': False,
         'data_types': {},
         'worker': workers.SGWorker,
         'role': None,
         'tab': -1,
+        'max_workers': 1,
+    },
+    FileScan: {
+        'queue': WorkQueue(common.max_list_items),
+        'preload': False,
+        'data_types': {},
+        'worker': workers.ScanWorker,
+        'role': None,
+        'tab': -1,
+        'max_workers': 1,
+    },
+    QueuedListingCache: {
+        'queue': WorkQueue(common.max_list_items),
+        'preload': False,
+        'data_types': {},
+        'worker': workers.ListingCacheWorker,
+        'role': None,
+        'tab': -1,
+        'max_workers': 1,
     },
 }
 
@@ -144,19 +379,59 @@ def queue_database_transaction(*args):
     """A utility method used to execute a delayed database transaction.
 
     """
-    if args not in queue(QueuedDatabaseTransaction):
-        queue(QueuedDatabaseTransaction).append(args)
+    queue(QueuedDatabaseTransaction).append(args)
     get_thread(QueuedDatabaseTransaction).startTimer.emit()
 
 
 def queue_sg_query(*args):
-    if args not in queue(QueuedSGQuery):
-        queue(QueuedSGQuery).append(args)
+    queue(QueuedSGQuery).append(args)
     get_thread(QueuedSGQuery).startTimer.emit()
 
 
+def queue_file_scan(scan_id, path, snapshot=None):
+    """Queues a task folder to be walked by the file scanner thread.
+
+    Only the last queued scan is kept, any pending or running scans are cancelled.
+
+    Args:
+        scan_id (str): A unique id used to identify the scan's results.
+        path (str): Path to the task folder.
+        snapshot (common.TaskSnapshot): Optional snapshot of the task folder. When
+            set, only the directories that changed since the snapshot was taken are
+            scanned.
+
+    """
+    queue(FileScan).clear()
+    queue(FileScan).append((scan_id, path, snapshot))
+    get_thread(FileScan).startTimer.emit()
+
+
+def queue_listing_cache(path, snapshot):
+    """Queues a task folder snapshot to be saved to the listing cache.
+
+    Args:
+        path (str): Path to the cache file.
+        snapshot (common.TaskSnapshot): The snapshot to save.
+
+    """
+    q = queue(QueuedListingCache)
+    for args in [f for f in q if f[0] == path]:
+        q.remove(args)
+    q.append((path, snapshot))
+    get_thread(QueuedListingCache).startTimer.emit()
+
+
+def cancel_file_scan():
+    """Cancels all pending and running file scans.
+
+    """
+    queue(FileScan).clear()
+    get_thread(FileScan).worker.interrupt = True
+
+
 def quit_threads():
     """Terminate all running threads."""
+    thumbnails.shutdown()
 
     # First, attempt to quit all threads
     for k in THREADS:
@@ -201,6 +476,56 @@ def get_thread(k):
     return controllers[k]
 
 
+def get_max_workers(k):
+    """Returns the number of threads used to process the items of a queue.
+
+    Queues with a ``max_workers`` value greater than one are processed in parallel
+    by a thread pool. The number of threads of the info queues can be overridden
+    by the ``settings/info_threads`` user setting. The thumbnail queues use a
+    thread for each thumbnail process, see
+    :func:`~bookmarks.threads.thumbnails.get_max_processes`.
+
+    Args:
+        k (str): The name of the queue, for example, ``threads.FileInfo``.
+
+    Returns:
+        int: The number of threads.
+
+    """
+    n = THREADS[k]['max_workers']
+    if n <= 1 or not hasattr(common.settings, 'value'):
+        return n
+    if THREADS[k]['worker'] is workers.ThumbnailWorker:
+        return max(1, thumbnails.get_max_processes())
+
+    v = common.settings.value('settings/info_threads')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return n
+    return max(1, v)
+
+
+def get_prefetch_rows():
+    """Returns the number of rows queued above and below the visible rows of a view.
+
+    The value is read from the ``settings/prefetch_rows`` user setting.
+
+    Returns:
+        int: The number of rows.
+
+    """
+    if not hasattr(common.settings, 'value'):
+        return DEFAULT_PREFETCH_ROWS
+
+    v = common.settings.value('settings/prefetch_rows')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return DEFAULT_PREFETCH_ROWS
+    return max(0, v)
+
+
 def queue(k):
     """Returns a queue associated with a thread."""
     if k not in THREADS:
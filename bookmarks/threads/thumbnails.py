@@ -0,0 +1,275 @@
+"""Process pool used by the thumbnail workers to generate thumbnails.
+
+Converting images with OpenImageIO holds the GIL and a bad source file can crash
+the process converting it. :func:`convert_image` runs the conversions in worker
+processes instead, so thumbnails are generated on all cores and a crash only takes
+down the worker process.
+
+The worker processes are started using a Python interpreter, see
+:func:`get_python_executable`. When embedded, :data:`sys.executable` is the host
+application, for example, the Bookmarks launcher or Maya, and starting it would
+start a new application instance instead of a worker process.
+
+The module is imported by the worker processes, so it mustn't import Qt or
+:mod:`bookmarks.common` at module level.
+
+"""
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+#: The default number of thumbnail processes
+DEFAULT_THUMBNAIL_PROCESSES = os.cpu_count() or 1
+
+#: The pool is disabled after breaking this many times without a successful conversion
+MAX_POOL_FAILURES = 3
+
+#: The time in seconds the pool stays disabled, see :func:`is_disabled`
+POOL_COOLDOWN = 60
+
+#: A source isn't converted again after breaking the pool this many times
+MAX_SOURCE_FAILURES = 2
+
+#: Interpreter names looked up when the running executable isn't a Python interpreter
+PYTHON_EXECUTABLE_NAMES = ('python', 'python3', 'mayapy')
+
+#: Interval in seconds to check the cancellation token of a running conversion
+CANCEL_POLL_INTERVAL = 0.05
+
+_lock = threading.Lock()
+_executor = None
+_executor_processes = 0
+_failures = 0
+_disabled_until = 0.0
+_source_failures = {}
+
+
+def _convert_image(source, destination, size):
+    """Converts the source image in a worker process."""
+    import bookmarks_openimageio
+    return bookmarks_openimageio.convert_image(
+        source,
+        destination,
+        source_color_space='',
+        target_color_space='sRGB',
+        size=size,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_python_executable():
+    """Returns the Python interpreter used to start the worker processes.
+
+    The running executable is used if it's a Python interpreter. Otherwise, the
+    interpreter is looked up next to it, for example, `mayapy` inside Maya, and in
+    the Python installation's directory, for example, the `bin` directory of the
+    Bookmarks distribution.
+
+    Returns:
+        str: Path to the interpreter, or `None` if not found.
+
+    """
+    exe = sys.executable
+    if exe and os.path.basename(exe).lower().startswith('python'):
+        return exe
+
+    ext = '.exe' if sys.platform == 'win32' else ''
+    dirs = [os.path.dirname(exe)] if exe else []
+    dirs += [sys.exec_prefix, os.path.join(sys.exec_prefix, 'bin')]
+    for _dir in dirs:
+        for name in PYTHON_EXECUTABLE_NAMES:
+            path = os.path.join(_dir, f'{name}{ext}')
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def get_max_processes():
+    """Returns the number of processes used to generate thumbnails.
+
+    The value is read from the ``settings/thumbnail_processes`` user setting.
+    When 0, or when no Python interpreter is found to start the processes,
+    thumbnails are generated by the thumbnail worker threads.
+
+    Returns:
+        int: The number of processes.
+
+    """
+    from .. import common
+
+    if get_python_executable() is None:
+        return 0
+
+    if not hasattr(common.settings, 'value'):
+        return DEFAULT_THUMBNAIL_PROCESSES
+
+    v = common.settings.value('settings/thumbnail_processes')
+    try:
+        v = int(v)
+    except (TypeError, ValueError):
+        return DEFAULT_THUMBNAIL_PROCESSES
+    return max(0, v)
+
+
+def get_executor():
+    """Returns the thumbnail process pool.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The process pool, or `None` if
+            thumbnails shouldn't be generated in worker processes.
+
+    """
+    global _executor
+    global _executor_processes
+
+    n = get_max_processes()
+
+    with _lock:
+        if not n or time.monotonic() < _disabled_until:
+            return None
+        if _executor is not None and _executor_processes == n:
+            return _executor
+
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+
+        # Forking a process running Qt threads isn't safe
+        context = multiprocessing.get_context('spawn')
+        context.set_executable(get_python_executable())
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=n, mp_context=context
+        )
+        _executor_processes = n
+        return _executor
+
+
+def _reset_executor(executor, source):
+    global _executor
+    global _failures
+    global _disabled_until
+
+    with _lock:
+        # All conversions running in a broken pool fail, so each source is a suspect
+        _source_failures[source] = _source_failures.get(source, 0) + 1
+
+        if _executor is not executor:
+            return
+        _executor.shutdown(wait=False)
+        _executor = None
+        _failures += 1
+        if _failures >= MAX_POOL_FAILURES:
+            _failures = 0
+            _disabled_until = time.monotonic() + POOL_COOLDOWN
+
+
+def convert_image(source, destination, size, token=None):
+    """Converts an image to a thumbnail.
+
+    The conversion runs in the process pool if enabled, see :func:`get_executor`,
+    otherwise, in the calling thread. The pool is recreated when a worker process
+    crashes. After :data:`MAX_POOL_FAILURES` crashes the pool is disabled for
+    :data:`POOL_COOLDOWN` seconds, and the images are converted in the calling thread.
+
+    Sources converted by a crashing pool are counted, and after
+    :data:`MAX_SOURCE_FAILURES` crashes they're no longer converted. They're never
+    converted in the calling thread, instead of risking a crash of the calling
+    process.
+
+    Args:
+        source (str): Path to the source image.
+        destination (str): Path to the thumbnail.
+        size (int): The size of the thumbnail.
+        token (CancelToken): An optional cancellation token. The calling thread
+            stops waiting for the conversion when the token is cancelled.
+
+    Returns:
+        int: 1 if the conversion failed, like
+        :func:`bookmarks_openimageio.convert_image`, or `None` if it was cancelled.
+
+    """
+    global _failures
+
+    # A crashing process breaks the conversions running in the other processes
+    # too, so conversions are retried using a new pool
+    for _ in range(MAX_SOURCE_FAILURES):
+        if token is not None and token.cancelled:
+            return None
+
+        with _lock:
+            failures = _source_failures.get(source, 0)
+        if failures >= MAX_SOURCE_FAILURES:
+            return 1
+
+        executor = get_executor()
+        if executor is None:
+            if failures:
+                return 1
+            return _convert_image(source, destination, size)
+
+        try:
+            future = executor.submit(_convert_image, source, destination, size)
+            error = _wait(future, token)
+        except concurrent.futures.process.BrokenProcessPool:
+            _reset_executor(executor, source)
+            continue
+        except RuntimeError:
+            # The pool was shut down by another thread
+            continue
+
+        if error is None:
+            return None
+
+        with _lock:
+            _failures = 0
+            _source_failures.pop(source, None)
+        return error
+
+    from .. import log
+    log.error(__name__, f'Thumbnail process failed converting {source}')
+    return 1
+
+
+def is_disabled():
+    """Checks if the process pool was disabled after crashing too many times.
+
+    Returns:
+        bool: `True` if conversions run in the calling thread until the cooldown ends.
+
+    """
+    with _lock:
+        return time.monotonic() < _disabled_until
+
+
+def _wait(future, token):
+    """Waits for the result of a conversion until the token is cancelled.
+
+    A cancelled conversion that has already started runs to completion in its
+    worker process, but the calling thread doesn't wait for it.
+
+    """
+    if token is None:
+        return future.result()
+
+    while True:
+        try:
+            return future.result(timeout=CANCEL_POLL_INTERVAL)
+        except concurrent.futures.TimeoutError:
+            if token.cancelled:
+                future.cancel()
+                return None
+
+
+def shutdown():
+    """Shuts down the thumbnail process pool.
+
+    """
+    global _executor
+
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
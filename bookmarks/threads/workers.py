@@ -2,14 +2,18 @@
 class, and various other helper functions.
 
 """
+import concurrent.futures
 import functools
 import os
+import threading
+import time
 import uuid
 import weakref
 
 import bookmarks_openimageio
 from PySide2 import QtCore, QtWidgets
 
+from . import thumbnails
 from .. import common
 from .. import database
 from .. import images
@@ -55,11 +59,153 @@ def verify_thread_affinity():
         raise RuntimeError('Method cannot be called from the main gui thread')
 
 
+#: Guards the values shared by the items of a data set
+_data_set_lock = threading.Lock()
+
+#: The maximum number of queued items processed per queue timer tick
+BATCH_SIZE = 64
+
+#: The maximum time spent processing queued items per queue timer tick, in seconds
+BATCH_TIME = 0.008
+
+
+def _is_data_type_ref(ref):
+    """Checks if `ref` is the data type ref marking the end of the queued items."""
+    return ref().data_type in (common.FileItem, common.SequenceItem)
+
+
+def _process_data_type(self, ref):
+    """Marks the data type loaded and sorts it."""
+    if not ref():
+        return
+
+    # Mark the internal model loaded
+    ref().loaded = True
+    # The remaining items read the database directly
+    ref().db_rows = None
+
+    if self.cancelled:
+        return
+
+    # Sort the data
+    data = self.sort_internal_data(ref)
+
+    # Signal the world
+    common.signals.internalDataReady.emit(weakref.ref(data))
+
+
+def _should_notify(self, ref, result):
+    """Checks if the views should be notified of a processed item.
+
+    Args:
+        ref (weakref.ref): The processed data item.
+        result (bool): The return value of the worker's `process_data` method.
+
+    Returns:
+        bool: `True` if the item's row should be repainted.
+
+    """
+    from . import threads
+
+    # Let the models/views know the data has been processed ok and
+    # request a row repaint
+    if not ref() or self.cancelled or not result:
+        return False
+
+    # Let's determine if the GUI should be notified of the change
+    if threads.THREADS[self.queue]['tab'] == -1:
+        return False
+
+    if common.QueueRole not in ref():
+        return False
+    return self.queue in ref()[common.QueueRole]
+
+
+def _process_ref(self, func, ref):
+    """Processes a single queued data item.
+
+    Returns:
+        bool: `True` if the views should be notified of the change.
+
+    """
+    if not ref() or self.cancelled:
+        return False
+
+    if _is_data_type_ref(ref):
+        _process_data_type(self, ref)
+        return False
+
+    return _should_notify(self, ref, func(self, ref))
+
+
+def _process_batch(self, func, q, executor, deadline):
+    """Processes a batch of queued data items using the worker's thread pool.
+
+    The items are processed in chunks of one item per thread, and, like the items
+    processed serially, the batch ends after :attr:`BATCH_SIZE` items or when the
+    `deadline` has passed. The batch also ends at the data type ref marking the end
+    of the queued items, which is processed after the batch's items.
+
+    Returns:
+        list: The refs of the items the views should be notified of.
+
+    """
+    updated = []
+    seen = set()
+    data_type_ref = None
+    n = 0
+
+    while n < BATCH_SIZE and data_type_ref is None and not self.cancelled:
+        refs = []
+        while len(refs) < self._executor_workers and n + len(refs) < BATCH_SIZE:
+            try:
+                ref = q.pop()
+            except IndexError:
+                # Stopping the timer when reaching the end of the queue
+                self.queue_timer.stop()
+                break
+
+            if not ref():
+                continue
+            if _is_data_type_ref(ref):
+                data_type_ref = ref
+                break
+            # Items queued more than once must not be processed at the same time
+            if id(ref()) in seen:
+                continue
+            seen.add(id(ref()))
+            refs.append(ref)
+
+        if not refs:
+            break
+
+        results = executor.map(functools.partial(func, self), refs)
+        updated += [ref for ref, result in zip(refs, results) if _should_notify(self, ref, result)]
+        n += len(refs)
+
+        if time.perf_counter() >= deadline:
+            break
+
+    if data_type_ref is not None and data_type_ref() and not self.cancelled:
+        _process_data_type(self, data_type_ref)
+    return updated
+
+
 def process(func):
     """Decorator for worker `process_data` slots.
 
-    Takes and passes the next available data in the queue for processing
-    and emits the `refUpdated` signal if the data has been correctly loaded.
+    Each queue timer tick takes a batch of items from the queue and passes them to
+    `func` one by one. A batch ends after :attr:`BATCH_SIZE` items or
+    :attr:`BATCH_TIME` seconds, whichever comes first, so the worker's event loop
+    stays responsive. The items that were loaded correctly are emitted together by
+    the `refsUpdated` signal at the end of the batch.
+
+    If the queue has more than one worker thread, see
+    :func:`~bookmarks.threads.threads.get_max_workers`, the items of a batch are
+    processed in parallel by the worker's thread pool.
+
+    The batch is processed with a cancellation token of the queue's current
+    generation, see :attr:`BaseWorker.cancelled`.
 
     """
 
@@ -73,58 +219,36 @@ def process(func):
 
         from . import threads
 
-        try:
-            ref = threads.queue(self.queue).pop()
-            if not ref() or self.interrupt:
-                return
-        except IndexError:
-            # Stopping the timer when reaching the end of the queue
-            self.queue_timer.stop()
-            return
+        q = threads.queue(self.queue)
+        self.token = q.token()
+        updated = []
+        deadline = time.perf_counter() + BATCH_TIME
 
         try:
-            if not ref() or self.interrupt:
+            executor = self.get_executor()
+            if executor is not None:
+                updated = _process_batch(self, func, q, executor, deadline)
                 return
 
-            if ref().data_type in (common.FileItem, common.SequenceItem):
-                # Mark the internal model loaded
-                ref().loaded = True
-
-                if not ref() or self.interrupt:
-                    return
-
-                # Sort the data
-                data = self.sort_internal_data(ref)
+            for _ in range(BATCH_SIZE):
+                if self.cancelled:
+                    break
 
-                # Signal the world
-                common.signals.internalDataReady.emit(weakref.ref(data))
-
-                return
-
-            if not ref() or self.interrupt:
-                return
+                try:
+                    ref = q.pop()
+                except IndexError:
+                    # Stopping the timer when reaching the end of the queue
+                    self.queue_timer.stop()
+                    break
 
-            # Call process_data
-            result = func(self, ref)
+                if _process_ref(self, func, ref):
+                    updated.append(ref)
 
-            # Let the models/views know the data has been processed ok and
-            # request a row repaint
-            if not ref() or self.interrupt or not result:
-                return
-
-            # Let's determine if the GUI should be notified of the change
-            if threads.THREADS[self.queue]['tab'] == -1:
-                return
-
-            if common.QueueRole not in ref():
-                return
-            if self.queue in ref()[common.QueueRole]:
-                self.refUpdated.emit(ref)
-
-        except:
-            raise
+                if time.perf_counter() >= deadline:
+                    break
         finally:
-            self.interrupt = False
+            if updated and not self.cancelled:
+                self.refsUpdated.emit(updated)
 
     return func_wrapper
 
@@ -147,8 +271,9 @@ class BaseWorker(QtCore.QObject):
     startTimer = QtCore.Signal()
     stopTimer = QtCore.Signal()
 
-    refUpdated = QtCore.Signal(weakref.ref)
+    refsUpdated = QtCore.Signal(list)
     databaseValueChanged = QtCore.Signal(str, str, str, object)
+    databaseValuesChanged = QtCore.Signal(list)
 
     sgEntityDataReady = QtCore.Signal(str, list)
 
@@ -160,9 +285,14 @@ class BaseWorker(QtCore.QObject):
         self.setObjectName(f'{queue}Worker_{uuid.uuid1().hex}')
 
         self.interrupt = False
+        self.token = None
         self.queue_timer = None
         self.queue = queue
 
+        self._executor = None
+        self._executor_workers = 1
+        self._executor_tokens = []
+
         self.initWorker.connect(self.init_worker)
 
     @common.error
@@ -192,7 +322,10 @@ class BaseWorker(QtCore.QObject):
 
         self.queue_timer.timeout.connect(self.process_data, cnx)
 
+        QtCore.QThread.currentThread().finished.connect(self.shutdown_executor, cnx)
+
         self.databaseValueChanged.connect(self.update_changed_database_value, cnx)
+        self.databaseValuesChanged.connect(self.update_changed_database_values, cnx)
 
         q = self.queue
         cnx = QtCore.Qt.QueuedConnection
@@ -208,7 +341,9 @@ class BaseWorker(QtCore.QObject):
         if widget:
             widget.queueItems.connect(self.queueItems, cnx)
             model.coreDataReset.connect(self.coreDataReset, cnx)
-            self.refUpdated.connect(widget.refUpdated, cnx)
+            # Cancel the running and queued work straight away from the gui thread
+            model.coreDataReset.connect(threads.queue(q).cancel, QtCore.Qt.DirectConnection)
+            self.refsUpdated.connect(widget.refsUpdated, cnx)
 
         if threads.THREADS[q]['preload'] and model and widget:
             model.coreDataLoaded.connect(self.coreDataLoaded, cnx)
@@ -217,9 +352,66 @@ class BaseWorker(QtCore.QObject):
             self.dataTypeSorted.connect(model.internal_data_sorted, cnx)
 
             common.signals.databaseValueChanged.connect(self.databaseValueChanged, cnx)
+            common.signals.databaseValuesChanged.connect(self.databaseValuesChanged, cnx)
 
         self.sgEntityDataReady.connect(common.signals.sgEntityDataReady, cnx)
 
+    @property
+    def cancelled(self):
+        """Checks if the worker's current work was interrupted or cancelled.
+
+        Work is cancelled when the worker's queue is cancelled, for example, when
+        the associated model is reset. See
+        :meth:`~bookmarks.threads.threads.WorkQueue.cancel`.
+
+        """
+        return self.interrupt or (self.token is not None and self.token.cancelled)
+
+    def get_executor(self):
+        """Returns the thread pool used to process the queued items.
+
+        The pool is created when the queue has more than one worker thread, see
+        :func:`~bookmarks.threads.threads.get_max_workers`, and is recreated when
+        the number of threads changes.
+
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: The thread pool, or `None` if
+                the items are processed by the worker's own thread.
+
+        """
+        from . import threads
+
+        n = threads.get_max_workers(self.queue)
+        if n == self._executor_workers:
+            return self._executor
+
+        self.shutdown_executor()
+        if n > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=n, thread_name_prefix=f'{self.queue}Worker',
+                initializer=self._register_pool_thread
+            )
+        self._executor_workers = n
+        return self._executor
+
+    def _register_pool_thread(self):
+        self._executor_tokens.append(common.get_thread_token())
+
+    @QtCore.Slot()
+    def shutdown_executor(self):
+        """Shuts down the worker's thread pool and removes the database
+        controllers cached by the pool's threads.
+
+        """
+        if self._executor is not None:
+            # The batches are processed synchronously, so there's no work left to wait for
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._executor_workers = 1
+
+        while self._executor_tokens:
+            database.remove_thread_connections(self._executor_tokens.pop())
+
     def update_changed_database_value(self, table, source, key, value):
         """Process changes when a database value changes.
 
@@ -247,6 +439,7 @@ class BaseWorker(QtCore.QObject):
             get_container=False
         )
         if file_item:
+            _drop_db_row(file_item, table, source)
             file_item[common.FileInfoLoaded] = False
             threads.THREADS[self.queue]['queue'].append(weakref.ref(file_item))
 
@@ -257,27 +450,39 @@ class BaseWorker(QtCore.QObject):
             get_container=False
         )
         if seq_item:
+            _drop_db_row(seq_item, table, source)
             seq_item[common.FileInfoLoaded] = False
             threads.THREADS[self.queue]['queue'].append(weakref.ref(seq_item))
 
         if any((file_item, seq_item)):
             self.queue_timer.start()
 
+    def update_changed_database_values(self, changes):
+        """Process changes when the values of a database transaction change.
+
+        Args:
+            changes (list): A list of (table, source, key, value) tuples.
+
+        """
+        for args in changes:
+            self.update_changed_database_value(*args)
+
     @common.error
     def queue_items(self, refs):
-        """Queues the given list of weakrefs to the workers' associated queue.
+        """Prioritizes the given list of weakrefs in the workers' associated queue.
+
+        The refs replace the previously prioritized items, so items no longer
+        visible aren't processed before the items of the current viewport. See
+        :meth:`bookmarks.threads.threads.WorkQueue.prioritize`.
 
         Args:
-            refs (list or tuple): A list of ``weakref.ref`` instances.
+            refs (list or tuple): A list of ``weakref.ref`` instances in order
+                of priority.
 
         """
         from . import threads
 
-        q = self.queue
-        for ref in reversed(refs):
-            if ref in threads.THREADS[q]['queue']:
-                continue
-            threads.THREADS[q]['queue'].append(ref)
+        threads.queue(self.queue).prioritize(refs)
         self.queue_timer.start()
         common.signals.threadItemsQueued.emit()
 
@@ -303,6 +508,9 @@ class BaseWorker(QtCore.QObject):
             return
 
         role = threads.THREADS[q]['role']
+        # Items queued after the model was reset are discarded
+        token = threads.queue(q).token()
+
         for ref in (data_type_ref1, data_type_ref2):
             if not ref():
                 continue
@@ -312,18 +520,18 @@ class BaseWorker(QtCore.QObject):
 
             idxs = ref().keys()
             for idx in idxs:
-                if not ref() or self.interrupt:
+                if not ref() or self.interrupt or token.cancelled:
                     return
 
                 # Skip if item is loaded already
                 if ref()[idx][role]:
                     continue
 
-                threads.THREADS[q]['queue'].appendleft(weakref.ref(ref()[idx]))
+                threads.THREADS[q]['queue'].appendleft(weakref.ref(ref()[idx]), token=token)
 
             # Adding the model's data_type ref at the end of the queue to signal
             # the end of the queue
-            threads.THREADS[q]['queue'].appendleft(ref)
+            threads.THREADS[q]['queue'].appendleft(ref, token=token)
 
         self.queue_timer.start()
 
@@ -344,22 +552,14 @@ class BaseWorker(QtCore.QObject):
         sort_by = model.sort_by()
         sort_order = model.sort_order()
 
-        p = model.parent_path()
-        k = model.task()
-        t = ref().data_type
-
         if not ref():
             return None
+        t = ref().data_type
 
         if model.data_type() == t:
             self.dataTypeAboutToBeSorted.emit(t)
 
-        d = common.sort_data(ref, sort_by, sort_order)
-
-        if not ref():
-            return None
-
-        data = common.set_data(p, k, t, d)
+        data = common.sort_data(ref, sort_by, sort_order)
 
         if model.data_type() == t:
             self.dataTypeSorted.emit(t)
@@ -371,17 +571,14 @@ class BaseWorker(QtCore.QObject):
         """Slot called by the `resetQueue` signal and is responsible for
         clearing the worker's queue.
 
+        The queue is cancelled, so the work queued or started before the reset is
+        discarded. See :meth:`~bookmarks.threads.threads.WorkQueue.cancel`.
+
         """
         verify_thread_affinity()
 
         from . import threads
-
-        self.interrupt = True
-
-        q = self.queue
-        threads.THREADS[q]['queue'].clear()
-
-        self.interrupt = False
+        threads.queue(self.queue).cancel()
 
     @process
     @common.error
@@ -394,20 +591,88 @@ class BaseWorker(QtCore.QObject):
 
         """
         # Do nothing by default
-        if not ref() or self.interrupt:
+        if not ref() or self.cancelled:
             return False
         return True
 
 
+def get_db_sources(path, pp):
+    """Get the database source paths of a file or asset item.
+
+    Args:
+        path (str): The item's path.
+        pp (tuple): The item's parent path.
+
+    Returns:
+        tuple: The normalized item path, the database source of the item, and the
+        database source of the item's sequence, or `None` if the item isn't a
+        file item.
+
+    """
+    path = os.path.abspath(os.path.normpath(path)).replace('\\', '/')
+
+    # Get the sequence proxy path if the item is collapsed
+    proxy_k = None
+    if len(pp) > 4:
+        proxy_k = common.proxy_path(path)
+        proxy_k = os.path.abspath(os.path.normpath(proxy_k)).replace('\\', '/')
+        k = proxy_k if common.is_collapsed(path) else path
+    else:
+        k = path
+    return path, k, proxy_k
+
+
+def get_row(ref, db, source, table):
+    """Get a database row of an item.
+
+    The row is taken from the rows prefetched by :meth:`InfoWorker.prefetch_rows` if
+    available, otherwise, it's read from the database.
+
+    Args:
+        ref (weakref.ref): The data item.
+        db (BookmarkDB): The item's database.
+        source (str): The database source.
+        table (str): The database table.
+
+    Returns:
+        dict: The row's values.
+
+    """
+    _ref = ref()[common.DataDictRole] if ref() else None
+    rows = _ref().db_rows if _ref and _ref() else None
+    if rows and (table, source) in rows:
+        # Prefetched rows are shared by the data set's items
+        return dict(rows[(table, source)])
+    return db.get_row(source, table)
+
+
+def _drop_db_row(item, table, source):
+    """Removes a changed row from the rows prefetched for the item's data set.
+
+    Re-queued items must read the changed row from the database instead of the
+    stale prefetched row.
+
+    """
+    _ref = item[common.DataDictRole]
+    data = _ref() if _ref else None
+    if data is not None and data.db_rows:
+        data.db_rows.pop((table, source), None)
+
+
 def count_todos(asset_row_data):
     """Get the number of TODO items."""
     v = asset_row_data['notes']
     return len(v) if isinstance(v, dict) else 0
 
 
-def count_assets(path):
+def count_assets(path, token=None):
     """Get the number of asset items.
 
+    Args:
+        path (str): Path to a bookmark item.
+        token (CancelToken): An optional cancellation token. Counting stops when
+            the token is cancelled.
+
     """
     n = 0
 
@@ -416,6 +681,8 @@ def count_assets(path):
 
     with os.scandir(path) as it:
         for entry in it:
+            if token is not None and token.cancelled:
+                break
             if entry.name.startswith('.'):
                 continue
             if not entry.is_dir():
@@ -472,20 +739,7 @@ def get_ranges(arr, padding):
         str: A string representation of the given array.
 
     """
-    arr = sorted(list(set(arr)))
-    blocks = {}
-    k = 0
-    for idx, n in enumerate(arr):  # blocks
-        zfill = str(n).zfill(padding)
-
-        if k not in blocks:
-            blocks[k] = []
-        blocks[k].append(zfill)
-
-        if idx + 1 != len(arr):
-            if arr[idx + 1] != n + 1:  # break coming up
-                k += 1
-    return ','.join(['-'.join(sorted({blocks[k][0], blocks[k][-1]})) for k in blocks])
+    return common.FrameSet(arr, padding=padding).range_string()
 
 
 def update_sg_configured(pp, b, a, ref):
@@ -519,7 +773,63 @@ class InfoWorker(BaseWorker):
     """
 
     def is_valid(self, ref):
-        return False if (not ref() or self.interrupt or ref()[common.FileInfoLoaded]) else True
+        return False if (not ref() or self.cancelled or ref()[common.FileInfoLoaded]) else True
+
+    @common.error
+    @QtCore.Slot(weakref.ref)
+    @QtCore.Slot(weakref.ref)
+    def queue_model(self, data_type_ref1, data_type_ref2):
+        """Prefetches the database rows of the model's items before queueing them.
+
+        """
+        for ref in (data_type_ref1, data_type_ref2):
+            self.prefetch_rows(ref)
+        super().queue_model(data_type_ref1, data_type_ref2)
+
+    def prefetch_rows(self, ref):
+        """Reads the database rows of all items of a data set.
+
+        The rows of a task folder's or job's items are read using a few queries,
+        instead of one query per item. Items are served from the rows stored in
+        the data set's `db_rows` until it's loaded.
+
+        Args:
+            ref (weakref.ref): A data set.
+
+        """
+        if not ref() or ref().loaded or ref().db_rows is not None:
+            return
+
+        sources = {}
+        for item in list(ref().values()):
+            if self.cancelled:
+                return
+            if item[common.FileInfoLoaded]:
+                continue
+
+            pp = item[common.ParentPathRole]
+            st = item[common.PathRole]
+            # Bookmark items have a database each
+            if not pp or not st or len(pp) < 4:
+                continue
+
+            _, k, proxy_k = get_db_sources(st, pp)
+            v = sources.setdefault(tuple(pp[0:3]), set())
+            v.add(k)
+            if proxy_k:
+                v.add(proxy_k)
+
+        rows = {}
+        for args, _sources in sources.items():
+            db = database.get(*args)
+            for source, row in db.get_rows_by_source(_sources, database.AssetTable).items():
+                rows[(database.AssetTable, source)] = row
+
+            source = db.source()
+            rows[(database.BookmarkTable, source)] = db.get_row(source, database.BookmarkTable)
+
+        if ref() and not self.cancelled:
+            ref().db_rows = rows
 
     @process
     @common.error
@@ -552,6 +862,11 @@ class InfoWorker(BaseWorker):
         finally:
             if ref():
                 ref()[common.FileInfoLoaded] = True
+                # The sort keys of items of loaded data sets may have changed
+                data_ref = ref()[common.DataDictRole]
+                data = data_ref() if data_ref else None
+                if data is not None and data.loaded:
+                    data.reset_sort_cache()
 
     def _process_data(self, ref):
         """Utility method for :meth:`process_data`.
@@ -566,8 +881,8 @@ class InfoWorker(BaseWorker):
             raise RuntimeError('Failed to process item.')
 
         # Normalize and convert st to an absolute path
-        st = os.path.abspath(os.path.normpath(st)).replace('\\', '/')
-        ref()[common.PathRole] = st
+        st, k, proxy_k = get_db_sources(st, pp)
+        common.set_item_path(ref(), st)
 
         flags = ref()[common.FlagsRole]
         item_type = ref()[common.DataTypeRole]
@@ -576,26 +891,13 @@ class InfoWorker(BaseWorker):
         db = database.get(*pp[0:3])
 
         _proxy_flags = 0
-        proxy_k = None
-
-        # Get the sequence proxy path if the item is collapsed
-        if len(pp) > 4:
-            collapsed = common.is_collapsed(st)
-            proxy_k = common.proxy_path(st)
-            proxy_k = os.path.abspath(os.path.normpath(proxy_k)).replace('\\', '/')
-            k = proxy_k if collapsed else st
-        else:
-            k = st
 
-        # Now normalize and convert k to an absolute path
-        k = os.path.abspath(os.path.normpath(k)).replace('\\', '/')
-
-        asset_row_data = db.get_row(k, database.AssetTable)
-        bookmark_row_data = db.get_row(db.source(), database.BookmarkTable)
+        asset_row_data = get_row(ref, db, k, database.AssetTable)
+        bookmark_row_data = get_row(ref, db, db.source(), database.BookmarkTable)
         bookmark_row_data['description'] = common.sanitize_hashtags(asset_row_data['description'])
 
         if len(pp) > 4:
-            _proxy_flags = db.value(proxy_k, 'flags', database.AssetTable)
+            _proxy_flags = get_row(ref, db, proxy_k, database.AssetTable).get('flags')
 
         # Description
         if len(pp) > 3:
@@ -628,12 +930,14 @@ class InfoWorker(BaseWorker):
             if ref():
                 _ref = ref()[common.DataDictRole]
 
-                if _ref():
-                    if asset_row_data['sg_task_name'] and asset_row_data['sg_task_name'] not in _ref().sg_task_names:
-                        _ref().sg_task_names.append(asset_row_data['sg_task_name'])
+                # The data set is shared by the items processed in parallel
+                with _data_set_lock:
+                    if _ref():
+                        if asset_row_data['sg_task_name'] and asset_row_data['sg_task_name'] not in _ref().sg_task_names:
+                            _ref().sg_task_names.append(asset_row_data['sg_task_name'])
 
-                    if asset_row_data['sg_name'] and asset_row_data['sg_name'] not in _ref().sg_names:
-                        _ref().sg_names.append(asset_row_data['sg_name'])
+                        if asset_row_data['sg_name'] and asset_row_data['sg_name'] not in _ref().sg_names:
+                            _ref().sg_names.append(asset_row_data['sg_name'])
 
         # ShotGrid status
         if len(pp) <= 4:
@@ -673,7 +977,7 @@ class InfoWorker(BaseWorker):
             return
 
         description = get_bookmark_description(bookmark_row_data)
-        count = count_assets(source)
+        count = count_assets(source, token=self.token)
 
         if not self.is_valid(ref):
             return False
@@ -690,23 +994,19 @@ class InfoWorker(BaseWorker):
             return
 
         seq = ref()[common.SequenceRole]
-        frs = sorted(ref()[common.FramesRole], key=lambda x: int(x))
-        ref()[common.FramesRole] = frs
+        frames = common.FrameSet(ref()[common.FramesRole])
+        ref()[common.FramesRole] = frames
 
         er = ref()[common.EntryRole]
-        size = ref()[common.SortBySizeRole]
-
-        intframes = [int(f) for f in frs]
-        padding = len(frs[0])
-        rangestring = get_ranges(intframes, padding)
+        size = 0
 
         # Construct paths and normalize them
         startpath = common.normalize_path(
-            seq.group(1) + str(min(intframes)).zfill(padding) + seq.group(3) + '.' + seq.group(4))
+            seq.group(1) + frames.format(frames.first) + seq.group(3) + '.' + seq.group(4))
         endpath = common.normalize_path(
-            seq.group(1) + str(max(intframes)).zfill(padding) + seq.group(3) + '.' + seq.group(4))
+            seq.group(1) + frames.format(frames.last) + seq.group(3) + '.' + seq.group(4))
         seqpath = common.normalize_path(
-            seq.group(1) + common.SEQSTART + rangestring + common.SEQEND + seq.group(3) + '.' + seq.group(4))
+            seq.group(1) + common.SEQSTART + frames.range_string() + common.SEQEND + seq.group(3) + '.' + seq.group(4))
 
         # Compute relative path for display name
         try:
@@ -727,7 +1027,7 @@ class InfoWorker(BaseWorker):
                 _mtime = max(_mtime, stat.st_mtime)
 
             mtime = _qlast_modified(_mtime)
-            info_string += f"{len(intframes)}f;{mtime.toString('dd/MM/yyyy hh:mm')};{common.byte_to_pretty_string(size)}"
+            info_string += f"{len(frames)}f;{mtime.toString('dd/MM/yyyy hh:mm')};{common.byte_to_pretty_string(size)}"
 
         # Setting the path names
         if not self.is_valid(ref):
@@ -735,7 +1035,7 @@ class InfoWorker(BaseWorker):
 
         ref()[common.StartPathRole] = startpath
         ref()[common.EndPathRole] = endpath
-        ref()[common.PathRole] = seqpath
+        common.set_item_path(ref(), seqpath)
         #
         ref()[QtCore.Qt.DisplayRole] = seqname
         ref()[QtCore.Qt.EditRole] = seqname
@@ -777,7 +1077,7 @@ class ThumbnailWorker(BaseWorker):
     """
 
     def is_valid(self, ref):
-        return False if (not ref() or self.interrupt or ref()[common.ThumbnailLoaded] or ref()[
+        return False if (not ref() or self.cancelled or ref()[common.ThumbnailLoaded] or ref()[
             common.FlagsRole] & common.MarkedAsArchived or ref()[common.ItemTabRole] != common.FileTab) else True
 
     @process
@@ -848,13 +1148,14 @@ class ThumbnailWorker(BaseWorker):
             return True
 
         try:
-            error = bookmarks_openimageio.convert_image(
+            error = thumbnails.convert_image(
                 source,
                 destination,
-                source_color_space='',
-                target_color_space='sRGB',
-                size=int(common.Size.Thumbnail(apply_scale=False)),
+                int(common.Size.Thumbnail(apply_scale=False)),
+                token=self.token,
             )
+            if error is None:
+                return False  # The conversion was cancelled
             images.ImageCache.flush(source)
 
             if error != 1:
@@ -901,11 +1202,25 @@ class TransactionsWorker(BaseWorker):
 
         from . import threads
 
-        try:
-            args = threads.queue(self.queue).pop()
-            database.set_flag(*args)
-        except IndexError:
-            pass  # ignore index errors
+        # Commit all queued transactions of a bookmark database together
+        transactions = {}
+        while True:
+            try:
+                args = threads.queue(self.queue).pop()
+            except IndexError:
+                break
+            transactions.setdefault(tuple(args[0:3]), []).append(args)
+
+        for (server, job, root), v in transactions.items():
+            db = database.get(server, job, root)
+            with db.transaction():
+                for args in v:
+                    # A failing transaction only rolls back its own savepoint
+                    try:
+                        with db.transaction():
+                            database.set_flag(*args)
+                    except Exception as e:
+                        log.error(__name__, f'Failed to set the flag of {args[3]}:\n{e}')
 
 
 class SGWorker(BaseWorker):
@@ -972,3 +1287,113 @@ class SGWorker(BaseWorker):
             pass  # ignore index errors
         except Exception as e:
             log.error(f'Error: {e}')
+
+
+class ScanWorker(BaseWorker):
+    """This worker walks task folders and streams the found files to
+    :class:`~bookmarks.items.files.FileItemModel` in batches.
+
+    When a scan is queued with an existing snapshot, only the directories that
+    changed are scanned, and the changes are emitted by :attr:`snapshotUpdated`.
+    The worker updates a copy of the snapshot, as the original is used by the gui
+    thread.
+
+    Attributes:
+        entriesReady (QtCore.Signal -> str, list): Emitted with the scan id and a
+            batch of :class:`~bookmarks.common.listing.CachedEntry` instances. The
+            size and modification time of the files are read while walking.
+        scanFinished (QtCore.Signal -> str, object): Emitted with the scan id and the
+            task folder's :class:`~bookmarks.common.listing.TaskSnapshot` when the
+            walk finishes.
+        snapshotUpdated (QtCore.Signal -> str, list, set, object): Emitted with the
+            scan id, the added file entries, the removed file paths and the updated
+            copy of the snapshot when a snapshot has been updated.
+
+    """
+    entriesReady = QtCore.Signal(str, object)
+    scanFinished = QtCore.Signal(str, object)
+    snapshotUpdated = QtCore.Signal(str, object, object, object)
+
+    #: The maximum number of entries emitted in one batch
+    batch_size = 1000
+    #: The maximum number of seconds to wait before emitting the collected entries
+    batch_interval = 0.05
+
+    @common.error
+    def process_data(self, *args, **kwargs):
+        verify_thread_affinity()
+
+        from . import threads
+
+        q = threads.queue(self.queue)
+
+        try:
+            scan_id, path, snapshot = q.pop()
+        except IndexError:
+            self.queue_timer.stop()
+            return
+
+        self.interrupt = False
+
+        # The walk is abandoned when the scan is cancelled or a new scan is queued
+        def interrupt():
+            return self.interrupt or bool(q)
+
+        if snapshot is not None:
+            snapshot = snapshot.copy()
+            # Read the size and modification time of the added files
+            snapshot.stat_files = True
+            added, removed = snapshot.update(interrupt=interrupt)
+            if interrupt():
+                return
+            self.snapshotUpdated.emit(scan_id, added, removed, snapshot)
+            return
+
+        snapshot = common.TaskSnapshot(
+            path, max_workers=common.get_scan_threads(), stat_files=True
+        )
+
+        entries = []
+        t = time.time()
+        for entry in snapshot.walk(interrupt=interrupt):
+            entries.append(entry)
+            if len(entries) < self.batch_size and (time.time() - t) < self.batch_interval:
+                continue
+            self.entriesReady.emit(scan_id, entries)
+            entries = []
+            t = time.time()
+
+        if interrupt():
+            return
+
+        if entries:
+            self.entriesReady.emit(scan_id, entries)
+        self.scanFinished.emit(scan_id, snapshot)
+
+
+class ListingCacheWorker(BaseWorker):
+    """This worker saves task folder snapshots to the listing cache.
+
+    See :func:`~bookmarks.common.listing.save_cache`.
+
+    """
+
+    @common.error
+    def process_data(self, *args, **kwargs):
+        verify_thread_affinity()
+
+        if self.interrupt:
+            return
+
+        from . import threads
+
+        try:
+            path, snapshot = threads.queue(self.queue).pop()
+        except IndexError:
+            self.queue_timer.stop()
+            return
+
+        try:
+            common.save_cache(snapshot, path)
+        except OSError as e:
+            log.error(__name__, f'Could not save the listing cache {path}: {e}')